@@ -26,8 +26,14 @@ from datasets.services import create_datalayer, get_storage_url_and_path
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import IntegrityError
-from gis.info import get_gdal_env, info_raster
-from gis.rasters import to_planscape_streaming
+from gis.info import get_gdal_env
+from gis.rasters import (
+    IN_MEMORY_MAX_PIXELS,
+    delete_staged,
+    staging_path,
+    to_planscape_cog,
+)
+from gis.stack import RasterStack
 
 from climate_foresight.future_climate import (
     get_default_future_climate_layer,
@@ -39,8 +45,9 @@ from climate_foresight.models import (
     ClimateForesightRun,
 )
 from climate_foresight.services import (
-    clip_and_align_raster_to_grid,
-    get_reference_grid_for_run,
+    ALIGNED_BLOCK_SIZE,
+    get_cached_reference_grid,
+    iter_aligned_blocks,
 )
 
 log = logging.getLogger(__name__)
@@ -89,41 +96,17 @@ def aggregate_rasters_simple_average(
         return existing_layer
 
     with rasterio.Env(**get_gdal_env()):
-        with rasterio.open(raster_layers[0].url) as src:
-            profile = src.profile.copy()
-            nodata = src.nodata if src.nodata is not None else -9999
-
-        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
-            temp_path = tmp_file.name
-
-        profile.update(dtype=rasterio.float32, nodata=nodata)
-
-        with rasterio.open(temp_path, "w", **profile) as dst:
-            with rasterio.open(raster_layers[0].url) as src:
-                for _, window in src.block_windows(1):
-                    block_stack = []
-                    for layer in raster_layers:
-                        with rasterio.open(layer.url) as layer_src:
-                            fill_value = (
-                                layer_src.nodata
-                                if layer_src.nodata is not None
-                                else nodata
-                            )
-                            block_data = layer_src.read(
-                                1,
-                                window=window,
-                                boundless=True,
-                                fill_value=fill_value,
-                            )
-                            block_stack.append(block_data)
-
-                    block_stack = np.array(block_stack, dtype=np.float32)
-
-                    if nodata is not None and not np.isnan(nodata):
-                        block_stack = np.where(
-                            block_stack == nodata, np.nan, block_stack
-                        )
+        with RasterStack([layer.url for layer in raster_layers]) as stack:
+            profile = stack.profile
+            nodata = stack.nodata
+
+            with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
+                temp_path = tmp_file.name
 
+            profile.update(dtype=rasterio.float32, nodata=nodata)
+
+            with rasterio.open(temp_path, "w", **profile) as dst:
+                for window, block_stack in stack.blocks():
                     valid_mask = np.any(~np.isnan(block_stack), axis=0)
 
                     output_block = np.full(
@@ -146,7 +129,7 @@ def aggregate_rasters_simple_average(
         original_name=original_name,
     )
 
-    to_planscape_streaming(
+    raster_info = to_planscape_cog(
         input_file=temp_path,
         output_file=storage_path or storage_url,
     )
@@ -164,8 +147,6 @@ def aggregate_rasters_simple_average(
         )
         return existing_layer
 
-    raster_info = info_raster(storage_url)
-
     metadata = {"modules": {"climate_foresight": {"landscape_aggregation": True}}}
     dataset = Dataset.objects.get(pk=settings.CLIMATE_FORESIGHT_DATASET_ID)
 
@@ -380,9 +361,7 @@ def rollup_landscape(
         pk=settings.CLIMATE_FORESIGHT_DATASET_ID
     )
 
-    ref_transform, ref_width, ref_height, ref_nodata = get_reference_grid_for_run(
-        run_id, planning_area_geometry
-    )
+    grid = get_cached_reference_grid(run_id, planning_area_geometry)
 
     for future_layer in future_layers:
         clipped_name = (
@@ -408,34 +387,35 @@ def rollup_landscape(
         )
 
         with rasterio.Env(**get_gdal_env()):
-            with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-                temp_clipped_path = tmp.name
+            temp_clipped_path = staging_path(
+                in_memory=grid.width * grid.height <= IN_MEMORY_MAX_PIXELS
+            )
 
             try:
-                aligned_data = clip_and_align_raster_to_grid(
-                    source_url=future_layer.url,
-                    planning_area_geometry=planning_area_geometry,
-                    ref_transform=ref_transform,
-                    ref_width=ref_width,
-                    ref_height=ref_height,
-                    ref_nodata=ref_nodata,
-                )
-
                 profile = {
                     "driver": "GTiff",
                     "dtype": rasterio.float32,
-                    "width": ref_width,
-                    "height": ref_height,
+                    "width": grid.width,
+                    "height": grid.height,
                     "count": 1,
                     "crs": "EPSG:4269",
-                    "transform": ref_transform,
-                    "nodata": ref_nodata,
+                    "transform": grid.transform,
+                    "nodata": grid.nodata,
+                    "tiled": True,
+                    "blockxsize": ALIGNED_BLOCK_SIZE,
+                    "blockysize": ALIGNED_BLOCK_SIZE,
                 }
 
                 with rasterio.open(temp_clipped_path, "w", **profile) as dst:
-                    dst.write(aligned_data, 1)
+                    for window, block_data in iter_aligned_blocks(
+                        source_url=future_layer.url,
+                        grid=grid,
+                    ):
+                        dst.write(block_data, 1, window=window)
 
-                log.info(f"Aligned to reference grid shape ({ref_height}, {ref_width})")
+                log.info(
+                    f"Aligned to reference grid shape ({grid.height}, {grid.width})"
+                )
 
                 uuid = str(uuid4())
                 original_name = f"{clipped_name.replace(' ', '_')}_{uuid}.tif"
@@ -446,13 +426,11 @@ def rollup_landscape(
                     original_name=original_name,
                 )
 
-                to_planscape_streaming(
+                raster_info = to_planscape_cog(
                     input_file=temp_clipped_path,
                     output_file=storage_path or storage_url,
                 )
 
-                raster_info = info_raster(storage_url)
-
                 existing_clipped_late = DataLayer.objects.filter(
                     name=clipped_name,
                     dataset=future_layer.dataset,
@@ -464,11 +442,6 @@ def rollup_landscape(
                         f"Found existing clipped future climate layer '{clipped_name}' "
                         f"(id={existing_clipped_late.id}) right before creation. Using it instead."
                     )
-                    try:
-                        Path(temp_clipped_path).unlink(missing_ok=True)
-                    except Exception as e:
-                        log.warning(f"Failed to clean up temp file: {e}")
-
                     clipped_future_layers.append(existing_clipped_late)
                     continue
 
@@ -526,7 +499,7 @@ def rollup_landscape(
 
             finally:
                 try:
-                    Path(temp_clipped_path).unlink(missing_ok=True)
+                    delete_staged(temp_clipped_path)
                 except Exception as e:
                     log.warning(f"Failed to clean up temp file: {e}")
 
@@ -629,13 +602,11 @@ def rollup_landscape(
                     original_name=aligned_name,
                 )
 
-                to_planscape_streaming(
+                raster_info = to_planscape_cog(
                     input_file=temp_aligned_path,
                     output_file=aligned_storage_path or aligned_storage_url,
                 )
 
-                raster_info = info_raster(aligned_storage_url)
-
                 future_landscape_temp.url = aligned_storage_url
                 future_landscape_temp.info = raster_info
                 future_landscape_temp.save()
@@ -706,13 +677,11 @@ def rollup_landscape(
                     original_name=current_aligned_name,
                 )
 
-                to_planscape_streaming(
+                current_raster_info = to_planscape_cog(
                     input_file=temp_current_aligned_path,
                     output_file=current_aligned_storage_path or current_aligned_storage_url,
                 )
 
-                current_raster_info = info_raster(current_aligned_storage_url)
-
                 current_landscape.url = current_aligned_storage_url
                 current_landscape.info = current_raster_info
                 current_landscape.save()
@@ -732,13 +701,11 @@ def rollup_landscape(
                     original_name=future_aligned_name,
                 )
 
-                to_planscape_streaming(
+                future_raster_info = to_planscape_cog(
                     input_file=temp_future_aligned_path,
                     output_file=future_aligned_storage_path or future_aligned_storage_url,
                 )
 
-                future_raster_info = info_raster(future_aligned_storage_url)
-
                 future_landscape_temp.url = future_aligned_storage_url
                 future_landscape_temp.info = future_raster_info
                 future_landscape_temp.save()
@@ -15,10 +15,10 @@ from planning.models import GeoPackageStatus, PlanningArea
 
 class ClimateForesightRunManager(models.Manager):
     def list_by_user(self, user: User):
-        planning_areas = list(
-            PlanningArea.objects.list_by_user(user).values_list("pk", flat=True)
+        return self.get_queryset().filter(
+            planning_area_id__in=PlanningArea.objects.ids_by_user(user),
+            planning_area__deleted_at__isnull=True,
         )
-        return self.get_queryset().filter(planning_area_id__in=planning_areas)
 
     def list_by_planning_area(self, planning_area: PlanningArea, user: User):
         """Returns ClimateForesightRun analyses for a given planning area and user."""
@@ -1,8 +1,10 @@
 import logging
-from typing import Tuple
+from typing import Tuple, Union
 
 import numpy as np
 
+from climate_foresight.sketches import StreamingStatistics
+
 
 def s_shaped_membership(
     values: np.ndarray, lower_endpoint: float, upper_endpoint: float
@@ -147,7 +149,9 @@ def trapezoidal_membership(
 
 
 def calculate_outliers(
-    data: np.ndarray, k: float = 3.0, method: str = "MAD"
+    data: Union[np.ndarray, StreamingStatistics],
+    k: float = 3.0,
+    method: str = "MAD",
 ) -> Tuple[float, float]:
     """
     Calculate outlier bounds using statistical methods.
@@ -156,7 +160,9 @@ def calculate_outliers(
     Uses median and MAD (Median Absolute Deviation) for robust estimation.
 
     Args:
-        data: Array of values
+        data: Array of values, or the StreamingStatistics of values that
+            were accumulated block by block (median and MAD are then
+            approximations, see StreamingStatistics)
         k: Extension constant for bounds (higher = more aggressive outlier detection)
         method: Method for outlier detection ('MAD' for median absolute deviation)
 
@@ -165,20 +171,28 @@ def calculate_outliers(
     """
     log = logging.getLogger(__name__)
 
-    clean_data = data[~np.isnan(data)]
+    if isinstance(data, StreamingStatistics):
+        if data.count == 0:
+            return (0.0, 1.0)
+
+        median = data.median()
+        mad = data.median_absolute_deviation()
+        data_min = data.min
+        data_max = data.max
+    else:
+        clean_data = data[~np.isnan(data)]
 
-    if len(clean_data) == 0:
-        return (0.0, 1.0)
+        if len(clean_data) == 0:
+            return (0.0, 1.0)
 
-    median = np.median(clean_data)
-    mad = np.median(np.abs(clean_data - median))
+        median = np.median(clean_data)
+        mad = np.median(np.abs(clean_data - median))
+        data_min = np.min(clean_data)
+        data_max = np.max(clean_data)
 
     # scale factor to make MAD consistent with standard deviation for normal distribution
     mad_scaled = mad * 1.4826
 
-    data_min = np.min(clean_data)
-    data_max = np.max(clean_data)
-
     # if MAD is 0, the data has very low variance (most values are the same)
     # in this case, use the actual data range instead of outlier detection
     # otherwise we'll get datalayers full of 0s or 1s
@@ -26,6 +26,7 @@ from climate_foresight.models import (
     ClimateForesightRunStatus,
     InputDataLayerStatus,
 )
+from climate_foresight.services import invalidate_reference_grid
 from climate_foresight.tasks import (
     async_generate_climate_foresight_geopackage,
     async_mark_run_failed,
@@ -126,6 +127,10 @@ def start_climate_foresight_analysis(run_id: int) -> Dict[str, Any]:
         if created:
             log.info(f"Created PROMOTe record {promote.id}")
 
+    # the grid is detected from the input layers, which may have changed since
+    # an earlier attempt at this run
+    invalidate_reference_grid(run_id)
+
     workflow = build_analysis_workflow(
         run_id=run_id,
         normalization_layer_ids=normalization_layer_ids,
@@ -10,6 +10,7 @@ landscape conditions in 2D space.
 
 import logging
 import tempfile
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any, Dict
 from uuid import uuid4
@@ -30,8 +31,9 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.gis.geos import MultiPolygon
 from django.db import IntegrityError
-from gis.info import get_gdal_env, info_raster
-from gis.rasters import to_planscape_streaming
+from gis.info import get_gdal_env
+from gis.rasters import to_planscape_cog
+from gis.stack import RasterStack
 
 log = logging.getLogger(__name__)
 
@@ -56,14 +58,17 @@ def rescale_linear(
     Returns:
         Rescaled values
     """
-    log.info(
-        f"rescale_linear: from=[{from_min}, {from_max}], to=[{to_min}, {to_max}], "
-        f"input range=[{np.min(values)}, {np.max(values)}]"
-    )
+    # called for every block, the reductions only run when debugging
+    debug = log.isEnabledFor(logging.DEBUG)
+    if debug:
+        log.debug(
+            f"rescale_linear: from=[{from_min}, {from_max}], to=[{to_min}, {to_max}], "
+            f"input range=[{np.min(values)}, {np.max(values)}]"
+        )
 
     if from_max == from_min:
         result = np.full_like(values, (to_min + to_max) / 2, dtype=np.float32)
-        log.info(
+        log.debug(
             f"rescale_linear: from_max == from_min, returning constant {(to_min + to_max) / 2}"
         )
         return result
@@ -74,10 +79,11 @@ def rescale_linear(
     clip_max = max(to_min, to_max)
     result = np.clip(scaled, clip_min, clip_max).astype(np.float32)
 
-    log.info(
-        f"rescale_linear: output range=[{np.min(result)}, {np.max(result)}], "
-        f"mean={np.mean(result)}"
-    )
+    if debug:
+        log.debug(
+            f"rescale_linear: output range=[{np.min(result)}, {np.max(result)}], "
+            f"mean={np.mean(result)}"
+        )
 
     return result
 
@@ -107,34 +113,185 @@ def calculate_promote_strategy_score(
     Returns:
         Strategy support scores (0-100)
     """
-    log.info(
-        f"calculate_promote_strategy_score called with target=({target_x}, {target_y}), "
-        f"current range=[{np.min(current)}, {np.max(current)}], "
-        f"future range=[{np.min(future)}, {np.max(future)}]"
-    )
+    # called for every block, the reductions only run when debugging
+    debug = log.isEnabledFor(logging.DEBUG)
+    if debug:
+        log.debug(
+            f"calculate_promote_strategy_score called with target=({target_x}, {target_y}), "
+            f"current range=[{np.min(current)}, {np.max(current)}], "
+            f"future range=[{np.min(future)}, {np.max(future)}]"
+        )
 
     # euclidean distance from each cell to target corner
     distance = np.sqrt((current - target_x) ** 2 + (future - target_y) ** 2)
 
-    log.info(
-        f"Calculated distances - min: {np.min(distance)}, "
-        f"max: {np.max(distance)}, mean: {np.mean(distance)}"
-    )
+    if debug:
+        log.debug(
+            f"Calculated distances - min: {np.min(distance)}, "
+            f"max: {np.max(distance)}, mean: {np.mean(distance)}"
+        )
 
     # rescale: distance 0 → score 100, distance sqrt(20000) → score 0
     max_distance = np.sqrt(20000)  # maximum distance in 100x100 space
-    log.info(f"Max distance for rescaling: {max_distance}")
 
     score = rescale_linear(distance, 0, max_distance, 100, 0)
 
-    log.info(
-        f"Calculated scores - min: {np.min(score)}, "
-        f"max: {np.max(score)}, mean: {np.mean(score)}"
-    )
+    if debug:
+        log.debug(
+            f"Calculated scores - min: {np.min(score)}, "
+            f"max: {np.max(score)}, mean: {np.mean(score)}"
+        )
 
     return score
 
 
+# (output key, layer name, dtype, style name) of every PROMOTe output
+PROMOTE_OUTPUTS = (
+    ("monitor_datalayer", "Monitor Score", rasterio.float32, None),
+    ("protect_datalayer", "Protect Score", rasterio.float32, None),
+    ("adapt_datalayer", "Adapt Score", rasterio.float32, None),
+    ("transform_datalayer", "Transform Score", rasterio.float32, None),
+    (
+        "adapt_protect_datalayer",
+        "Adapt-Protect Score",
+        rasterio.float32,
+        "cf-adapt-protect-score",
+    ),
+    (
+        "integrated_condition_score_datalayer",
+        "Integrated Condition Score",
+        rasterio.float32,
+        "cf-integrated-condition-score",
+    ),
+    ("mpat_matrix_datalayer", "MPAT Matrix", rasterio.uint8, None),
+    ("mpat_strength_datalayer", "MPAT Strength", rasterio.uint8, "cf-mpat-matrix"),
+)
+
+# using 255 since it's far outside the valid range of 1-4 and 11-42
+PROMOTE_UINT8_NODATA = 255
+
+
+def rescale_future_values(
+    future_valid: np.ndarray,
+    future_min: float,
+    future_max: float,
+) -> np.ndarray:
+    """
+    Brings future values to the 0-100 range, guessing their original range
+    from the min/max of the whole future raster (not just `future_valid`, so
+    every block of a raster is rescaled the same way).
+    """
+    if future_min >= 0 and future_max <= 1.0:
+        return future_valid * 100.0
+    if future_min >= 0 and future_max <= 100.0:
+        return future_valid
+    if future_min >= 0 and future_max <= 255.0:
+        return rescale_linear(future_valid, 0, 255, 0, 100)
+    return rescale_linear(future_valid, future_min, future_max, 0, 100)
+
+
+def calculate_promote_outputs(
+    current_data: np.ndarray,
+    future_data: np.ndarray,
+    valid_mask: np.ndarray,
+    future_min: float,
+    future_max: float,
+    nodata: float,
+) -> Dict[str, np.ndarray]:
+    """
+    Calculates every PROMOTe output (keyed like `PROMOTE_OUTPUTS`) for a
+    window of the current and future rasters. All the operations are
+    per-pixel once the global `future_min`/`future_max` are known, so this
+    works the same for a single block as for the whole raster.
+    """
+    # initialize MPAT scores
+    monitor = np.full(current_data.shape, nodata, dtype=np.float32)
+    protect = np.full(current_data.shape, nodata, dtype=np.float32)
+    adapt = np.full(current_data.shape, nodata, dtype=np.float32)
+    transform = np.full(current_data.shape, nodata, dtype=np.float32)
+    adapt_protect_rescaled = np.full(current_data.shape, nodata, dtype=np.float32)
+    ics = np.full(current_data.shape, nodata, dtype=np.float32)
+    mpat_matrix = np.full(current_data.shape, PROMOTE_UINT8_NODATA, dtype=np.uint8)
+    mpat_strength = np.full(current_data.shape, PROMOTE_UINT8_NODATA, dtype=np.uint8)
+    outputs = {
+        "monitor_datalayer": monitor,
+        "protect_datalayer": protect,
+        "adapt_datalayer": adapt,
+        "transform_datalayer": transform,
+        "adapt_protect_datalayer": adapt_protect_rescaled,
+        "integrated_condition_score_datalayer": ics,
+        "mpat_matrix_datalayer": mpat_matrix,
+        "mpat_strength_datalayer": mpat_strength,
+    }
+    if not np.any(valid_mask):
+        return outputs
+
+    current_valid = np.clip(current_data[valid_mask].astype(np.float32), 0, 100)
+    future_valid = np.clip(
+        rescale_future_values(
+            future_data[valid_mask].astype(np.float32), future_min, future_max
+        ),
+        0,
+        100,
+    )
+
+    # Calculate strategy scores for valid pixels
+    # Monitor = good current, good future (100, 100)
+    monitor_valid = calculate_promote_strategy_score(
+        current_valid, future_valid, 100, 100
+    )
+    # Protect = good current, poor future (100, 0)
+    protect_valid = calculate_promote_strategy_score(
+        current_valid, future_valid, 100, 0
+    )
+    # Adapt = poor current, good future (0, 100)
+    adapt_valid = calculate_promote_strategy_score(current_valid, future_valid, 0, 100)
+    # Transform = poor current, poor future (0, 0)
+    transform_valid = calculate_promote_strategy_score(
+        current_valid, future_valid, 0, 0
+    )
+    monitor[valid_mask] = monitor_valid
+    protect[valid_mask] = protect_valid
+    adapt[valid_mask] = adapt_valid
+    transform[valid_mask] = transform_valid
+
+    # calculate Adapt-Protect score (max of adapt and protect) and rescale it
+    # from ~29-100 to 0-100 (taking max means minimum possible value is
+    # ~29.29, not 0)
+    adapt_protect_rescaled[valid_mask] = rescale_linear(
+        np.maximum(adapt_valid, protect_valid), 29.28932, 100, 0, 100
+    )
+
+    # stack all strategy scores
+    strategy_stack = np.stack(
+        [monitor_valid, protect_valid, adapt_valid, transform_valid], axis=0
+    )
+
+    # find strategy with max score (1=Monitor, 2=Protect, 3=Adapt, 4=Transform)
+    max_strategy = np.argmax(strategy_stack, axis=0) + 1
+    max_score = np.max(strategy_stack, axis=0)
+
+    mpat_matrix[valid_mask] = max_strategy.astype(np.uint8)
+
+    # add strength designation (weak < 60, strong >= 60)
+    mpat_strength[valid_mask] = (max_strategy * 10 + (max_score >= 60)).astype(np.uint8)
+
+    # calculate Integrated Condition Score
+    # ICS = average of current and monitor, with piecewise rescaling
+    avg = (current_valid + monitor_valid) / 2.0
+
+    # Piecewise rescaling
+    # <= 10 → 0
+    # >= 85 → 100
+    # 10-85 → linear rescale to 0-100
+    ics[valid_mask] = np.where(
+        avg <= 10,
+        0,
+        np.where(avg >= 85, 100, rescale_linear(avg, 10, 85, 0, 100)),
+    )
+    return outputs
+
+
 def run_promote_analysis(
     run_id: int,
     current_layer: DataLayer,
@@ -177,174 +334,72 @@ def run_promote_analysis(
     dataset = Dataset.objects.get(pk=settings.CLIMATE_FORESIGHT_DATASET_ID)
 
     with rasterio.Env(**get_gdal_env()):
-        with rasterio.open(current_layer.url) as current_src:
-            current_data = current_src.read(1).astype(np.float32)
-            profile = current_src.profile.copy()
-            nodata = current_src.nodata if current_src.nodata is not None else -9999
-
-        with rasterio.open(future_layer.url) as future_src:
-            future_data = future_src.read(1).astype(np.float32)
-            future_nodata = (
-                future_src.nodata if future_src.nodata is not None else -9999
-            )
-
-        if current_data.shape != future_data.shape:
-            raise ValueError(
-                f"Current and future rasters must have the same shape. "
-                f"Got current={current_data.shape}, future={future_data.shape}"
-            )
-
-        profile.update(dtype=rasterio.float32, nodata=nodata)
-
-        valid_mask = (current_data != nodata) & (future_data != future_nodata)
-
-        # initialize MPAT scores
-        monitor = np.full_like(current_data, nodata, dtype=np.float32)
-        protect = np.full_like(current_data, nodata, dtype=np.float32)
-        adapt = np.full_like(current_data, nodata, dtype=np.float32)
-        transform = np.full_like(current_data, nodata, dtype=np.float32)
-
-        current_scaled = np.full_like(current_data, nodata, dtype=np.float32)
-
-        if np.any(valid_mask):
-            current_valid = current_data[valid_mask].astype(np.float32)
-            future_valid = future_data[valid_mask].astype(np.float32)
-
-            future_min = np.min(future_valid)
-            future_max = np.max(future_valid)
-
-            # ensure future values are within 0-100 range
-            if future_min >= 0 and future_max <= 1.0:
-                future_valid = future_valid * 100.0
-            elif future_min >= 0 and future_max <= 100.0:
-                pass
-            elif future_min >= 0 and future_max <= 255.0:
-                future_valid = rescale_linear(future_valid, 0, 255, 0, 100)
-            else:
-                future_valid = rescale_linear(
-                    future_valid, future_min, future_max, 0, 100
+        with RasterStack([current_layer.url, future_layer.url]) as stack:
+            current_src, future_src = stack.datasets
+            if current_src.shape != future_src.shape:
+                raise ValueError(
+                    f"Current and future rasters must have the same shape. "
+                    f"Got current={current_src.shape}, future={future_src.shape}"
                 )
-
-            current_valid = np.clip(current_valid, 0, 100)
-            future_valid = np.clip(future_valid, 0, 100)
-
-            current_scaled[valid_mask] = current_valid
-
-            # Calculate strategy scores for valid pixels
-            # Monitor = good current, good future (100, 100)
-            monitor[valid_mask] = calculate_promote_strategy_score(
-                current_valid, future_valid, 100, 100
-            )
-
-            # Protect = good current, poor future (100, 0)
-            protect[valid_mask] = calculate_promote_strategy_score(
-                current_valid, future_valid, 100, 0
-            )
-
-            # Adapt = poor current, good future (0, 100)
-            adapt[valid_mask] = calculate_promote_strategy_score(
-                current_valid, future_valid, 0, 100
-            )
-
-            # Transform = poor current, poor future (0, 0)
-            transform[valid_mask] = calculate_promote_strategy_score(
-                current_valid, future_valid, 0, 0
-            )
-
-        log.info("Calculated MPAT strategy scores")
-
-        # calculate Adapt-Protect score (max of adapt and protect)
-        adapt_protect = np.full_like(current_data, nodata, dtype=np.float32)
-        if np.any(valid_mask):
-            adapt_protect[valid_mask] = np.maximum(
-                adapt[valid_mask], protect[valid_mask]
-            )
-
-        # rescale Adapt-Protect from ~29-100 to 0-100
-        # (taking max means minimum possible value is ~29.29, not 0)
-        adapt_protect_rescaled = np.full_like(current_data, nodata, dtype=np.float32)
-        if np.any(valid_mask):
-            ap_valid = adapt_protect[valid_mask]
-            adapt_protect_rescaled[valid_mask] = rescale_linear(
-                ap_valid, 29.28932, 100, 0, 100
-            )
-
-        # initialize MPAT matrix - using 255 since it's far outside the valid range of 1-4 and 11-42
-        uint8_nodata = 255
-        mpat_matrix = np.full(current_data.shape, uint8_nodata, dtype=np.uint8)
-        mpat_strength = np.full(current_data.shape, uint8_nodata, dtype=np.uint8)
-
-        if np.any(valid_mask):
-            # stack all strategy scores
-            strategy_stack = np.stack(
-                [
-                    monitor[valid_mask],
-                    protect[valid_mask],
-                    adapt[valid_mask],
-                    transform[valid_mask],
-                ],
-                axis=0,
-            )
-
-            # find strategy with max score (1=Monitor, 2=Protect, 3=Adapt, 4=Transform)
-            max_strategy = np.argmax(strategy_stack, axis=0) + 1
-            max_score = np.max(strategy_stack, axis=0)
-
-            mpat_matrix[valid_mask] = max_strategy.astype(np.uint8)
-
-            # add strength designation (weak < 60, strong >= 60)
-            mpat_strength[valid_mask] = (max_strategy * 10).astype(np.uint8)
-            strong_mask = valid_mask.copy()
-            strong_mask[valid_mask] = max_score >= 60
-            mpat_strength[strong_mask] += 1  # add 1 for strong
-
-        log.info("Calculated MPAT Matrix and strength")
-
-        # calculate Integrated Condition Score
-        # ICS = average of current and monitor, with piecewise rescaling
-        ics = np.full_like(current_data, nodata, dtype=np.float32)
-        if np.any(valid_mask):
-            avg = (current_scaled[valid_mask] + monitor[valid_mask]) / 2.0
-
-            # Piecewise rescaling
-            # <= 10 → 0
-            # >= 85 → 100
-            # 10-85 → linear rescale to 0-100
-            ics_valid = np.where(
-                avg <= 10,
-                0,
-                np.where(avg >= 85, 100, rescale_linear(avg, 10, 85, 0, 100)),
-            )
-            ics[valid_mask] = ics_valid
-
-        log.info("Calculated Integrated Condition Score")
-
-        profile.update(dtype=rasterio.float32, nodata=nodata)
+            profile = current_src.profile.copy()
+            nodata = stack.nodata
+
+            # first pass: the range of the future values, used to rescale them
+            future_min, future_max = np.inf, -np.inf
+            for _, block in stack.blocks():
+                valid_mask = ~np.isnan(block).any(axis=0)
+                if np.any(valid_mask):
+                    future_valid = block[1][valid_mask]
+                    future_min = min(future_min, float(future_valid.min()))
+                    future_max = max(future_max, float(future_valid.max()))
+            log.info(f"Future values range: [{future_min}, {future_max}]")
+
+            # second pass: every output, block by block, so memory is bounded
+            # by the block size instead of the raster size
+            temp_paths: Dict[str, str] = {}
+            with ExitStack() as destinations:
+                outputs_dst = {}
+                for key, _name, dtype, _style_name in PROMOTE_OUTPUTS:
+                    with tempfile.NamedTemporaryFile(
+                        suffix=".tif", delete=False
+                    ) as tmp:
+                        temp_paths[key] = tmp.name
+                    profile_copy = profile.copy()
+                    raster_nodata = (
+                        nodata if dtype == rasterio.float32 else PROMOTE_UINT8_NODATA
+                    )
+                    profile_copy.update(dtype=dtype, nodata=raster_nodata)
+                    outputs_dst[key] = destinations.enter_context(
+                        rasterio.open(temp_paths[key], "w", **profile_copy)
+                    )
+
+                for window, block in stack.blocks():
+                    valid_mask = ~np.isnan(block).any(axis=0)
+                    block_outputs = calculate_promote_outputs(
+                        current_data=block[0],
+                        future_data=block[1],
+                        valid_mask=valid_mask,
+                        future_min=future_min,
+                        future_max=future_max,
+                        nodata=nodata,
+                    )
+                    for key, data in block_outputs.items():
+                        outputs_dst[key].write(data, 1, window=window)
+
+        log.info("Calculated MPAT strategy scores, MPAT Matrix and strength and ICS")
 
         def save_raster(
-            data: np.ndarray,
+            temp_path: str,
             name: str,
-            dtype=rasterio.float32,
             style_name: str | None = None,
         ) -> DataLayer:
             """Helper to save a raster as a DataLayer.
 
             Args:
-                data: Raster data array
+                temp_path: Path of the raster, written locally
                 name: Display name for the layer
-                dtype: Raster data type
                 style_name: Optional name of the Style to assign (e.g., 'cf-mpat-matrix')
             """
-            with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-                temp_path = tmp.name
-
-            profile_copy = profile.copy()
-            raster_nodata = nodata if dtype == rasterio.float32 else uint8_nodata
-            profile_copy.update(dtype=dtype, nodata=raster_nodata)
-
-            with rasterio.open(temp_path, "w", **profile_copy) as dst:
-                dst.write(data, 1)
-
             uuid = str(uuid4())
             original_name = f"{name.replace(' ', '_')}_{uuid}.tif"
             storage_url, storage_path = get_storage_url_and_path(
@@ -353,9 +408,7 @@ def run_promote_analysis(
                 original_name=original_name,
             )
 
-            to_planscape_streaming(temp_path, storage_path or storage_url)
-
-            raster_info = info_raster(storage_url)
+            raster_info = to_planscape_cog(temp_path, storage_path or storage_url)
 
             metadata = {
                 "modules": {
@@ -450,29 +503,8 @@ def run_promote_analysis(
             return layer
 
         outputs = {
-            "monitor_datalayer": save_raster(monitor, "Monitor Score"),
-            "protect_datalayer": save_raster(protect, "Protect Score"),
-            "adapt_datalayer": save_raster(adapt, "Adapt Score"),
-            "transform_datalayer": save_raster(transform, "Transform Score"),
-            "adapt_protect_datalayer": save_raster(
-                adapt_protect_rescaled,
-                "Adapt-Protect Score",
-                style_name="cf-adapt-protect-score",
-            ),
-            "integrated_condition_score_datalayer": save_raster(
-                ics,
-                "Integrated Condition Score",
-                style_name="cf-integrated-condition-score",
-            ),
-            "mpat_matrix_datalayer": save_raster(
-                mpat_matrix, "MPAT Matrix", dtype=rasterio.uint8
-            ),
-            "mpat_strength_datalayer": save_raster(
-                mpat_strength,
-                "MPAT Strength",
-                dtype=rasterio.uint8,
-                style_name="cf-mpat-matrix",
-            ),
+            key: save_raster(temp_paths[key], name, style_name=style_name)
+            for key, name, _dtype, style_name in PROMOTE_OUTPUTS
         }
 
         log.info(f"Successfully completed PROMOTe analysis for run {run_id}")
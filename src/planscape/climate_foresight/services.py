@@ -3,8 +3,9 @@ import logging
 import shutil
 import tempfile
 import zipfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 import numpy as np
@@ -20,13 +21,24 @@ from datasets.models import (
 )
 from datasets.services import create_datalayer, get_storage_url_and_path
 from django.conf import settings
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from django.contrib.gis.geos import MultiPolygon
 from django.db import IntegrityError
-from gis.info import get_gdal_env, info_raster
-from gis.rasters import read_raster_window_downsampled, to_planscape_streaming
+from gis.info import get_gdal_env
+from gis.rasters import (
+    IN_MEMORY_MAX_PIXELS,
+    delete_staged,
+    read_raster_window_downsampled,
+    staging_path,
+    to_planscape_cog,
+)
+from gis.stack import RasterStack
 from rasterio.features import geometry_mask
-from rasterio.warp import Resampling, reproject
+from rasterio.vrt import WarpedVRT
+from rasterio.warp import Resampling
+from rasterio.windows import Window
+from rasterio.windows import transform as window_transform
 from scipy.optimize import minimize
 
 from climate_foresight.normalize import (
@@ -35,11 +47,14 @@ from climate_foresight.normalize import (
     trapezoidal_membership,
     z_shaped_membership,
 )
+from climate_foresight.sketches import StreamingStatistics
 
 log = logging.getLogger(__name__)
 
 METERS_PER_DEGREE = 111000.0
 
+ALIGNED_BLOCK_SIZE = 512
+
 
 def get_finest_resolution_for_run(run_id: int) -> Optional[float]:
     """
@@ -258,129 +273,176 @@ def get_reference_grid_for_run(
     return transform, width, height, nodata
 
 
-def clip_and_align_raster_to_grid(
-    source_url: str,
-    planning_area_geometry: MultiPolygon,
-    ref_transform: rasterio.Affine,
-    ref_width: int,
-    ref_height: int,
-    ref_nodata: float,
-    resampling: Resampling = Resampling.bilinear,
-) -> np.ndarray:
+@dataclass
+class ReferenceGrid:
     """
-    Clip a raster to a planning area and align it to a reference grid.
+    The reference grid of a Climate Foresight run (see `get_reference_grid_for_run`)
+    with its planning area rasterized on it.
 
-    This function handles the common pattern of:
-    1. Clipping a source raster to a planning area geometry
-    2. Reprojecting to a reference grid (handling extent and resolution)
-    3. Applying a geometry mask
+    The planning area mask is packed with `np.packbits` row by row, so it takes one
+    bit per pixel and any window of it can be unpacked on its own.
+    """
 
-    This ensures the output covers the full planning area extent, even if
-    the source raster doesn't fully cover the area (missing areas become nodata).
+    transform: rasterio.Affine
+    width: int
+    height: int
+    nodata: float
+    packed_mask: np.ndarray
+
+    @classmethod
+    def from_geometry(
+        cls,
+        planning_area_geometry: MultiPolygon,
+        transform: rasterio.Affine,
+        width: int,
+        height: int,
+        nodata: float,
+    ) -> "ReferenceGrid":
+        geom_geojson = json.loads(planning_area_geometry.json)
+        packed_mask = np.empty((height, (width + 7) // 8), dtype=np.uint8)
+
+        # rasterized in strips so the unpacked mask is never held in memory
+        for row_off in range(0, height, ALIGNED_BLOCK_SIZE):
+            strip = Window(0, row_off, width, min(ALIGNED_BLOCK_SIZE, height - row_off))
+            inside = geometry_mask(
+                [geom_geojson],
+                out_shape=(int(strip.height), width),
+                transform=window_transform(strip, transform),
+                invert=True,
+            )
+            rows, _ = strip.toslices()
+            packed_mask[rows] = np.packbits(inside, axis=1)
+
+        return cls(
+            transform=transform,
+            width=width,
+            height=height,
+            nodata=nodata,
+            packed_mask=packed_mask,
+        )
 
-    Args:
-        source_url: URL of the source raster to clip
-        planning_area_geometry: MultiPolygon to clip to (in EPSG:4269)
-        ref_transform: Affine transform for the reference grid
-        ref_width: Width of the reference grid in pixels
-        ref_height: Height of the reference grid in pixels
-        ref_nodata: Nodata value for the output
-        resampling: Resampling method (default: bilinear)
+    def planning_area_mask(self, window: Window) -> np.ndarray:
+        """Bool array that is True for the pixels of `window` inside the planning area."""
+        rows, _ = window.toslices()
+        col_off, width = int(window.col_off), int(window.width)
+        first_byte = col_off // 8
+        last_byte = (col_off + width + 7) // 8
+        bits = np.unpackbits(self.packed_mask[rows, first_byte:last_byte], axis=1)
+        offset = col_off - first_byte * 8
+        return bits[:, offset : offset + width].astype(bool)
+
+    def block_windows(self, block_size: int = ALIGNED_BLOCK_SIZE) -> Iterator[Window]:
+        for row_off in range(0, self.height, block_size):
+            for col_off in range(0, self.width, block_size):
+                yield Window(
+                    col_off,
+                    row_off,
+                    min(block_size, self.width - col_off),
+                    min(block_size, self.height - row_off),
+                )
 
-    Returns:
-        Aligned numpy array matching the reference grid dimensions
+
+def _reference_grid_key(run_id: int) -> str:
+    return f"climate_foresight:reference_grid:{run_id}"
+
+
+def get_cached_reference_grid(
+    run_id: int,
+    planning_area_geometry: MultiPolygon,
+) -> ReferenceGrid:
     """
-    with rasterio.open(source_url) as src:
-        log.info(
-            f"Clipping raster - url: {source_url}, "
-            f"shape: ({src.height}, {src.width}), "
-            f"dtype: {src.dtypes[0]}, "
-            f"nodata: {src.nodata}, "
-            f"crs: {src.crs}"
-        )
+    Get the reference grid and planning area mask of a Climate Foresight run.
 
-        clipped_data, valid_mask, clipped_transform = read_raster_window_downsampled(
-            src=src,
-            geometry=planning_area_geometry,
-            geometry_crs="EPSG:4269",
-            target_pixels=None,
-            resampling=rasterio.enums.Resampling.nearest,
-        )
+    They are built once per run and cached, so the normalization tasks of a run
+    don't each open every input layer to detect the resolution and rasterize the
+    planning area again.
 
-        log.info(
-            f"After initial clip - "
-            f"clipped_data shape: {clipped_data.shape}, "
-            f"valid_mask sum: {np.sum(valid_mask)}"
-        )
+    Args:
+        run_id: The ID of the ClimateForesightRun
+        planning_area_geometry: MultiPolygon in EPSG:4269 of the run's planning area
 
-        src_nodata = src.nodata if src.nodata is not None else -9999
-        src_crs = src.crs
+    Returns:
+        ReferenceGrid of the run
+    """
+    key = _reference_grid_key(run_id)
+    grid = cache.get(key)
+    if grid is not None:
+        return grid
 
-        clipped_data = clipped_data.astype(np.float32)
-        clipped_data[~valid_mask] = src_nodata
+    transform, width, height, nodata = get_reference_grid_for_run(
+        run_id, planning_area_geometry
+    )
+    grid = ReferenceGrid.from_geometry(
+        planning_area_geometry=planning_area_geometry,
+        transform=transform,
+        width=width,
+        height=height,
+        nodata=nodata,
+    )
+    cache.set(key, grid, timeout=settings.CLIMATE_FORESIGHT_GRID_TTL)
+    return grid
 
-    with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-        temp_initial_clip = tmp.name
 
-    try:
-        initial_profile = {
-            "driver": "GTiff",
-            "dtype": rasterio.float32,
-            "width": clipped_data.shape[1],
-            "height": clipped_data.shape[0],
-            "count": 1,
-            "crs": src_crs,
-            "transform": clipped_transform,
-            "nodata": src_nodata,
-        }
+def invalidate_reference_grid(run_id: int) -> None:
+    cache.delete(_reference_grid_key(run_id))
 
-        with rasterio.open(temp_initial_clip, "w", **initial_profile) as dst:
-            dst.write(clipped_data, 1)
 
-        log.info(f"Wrote initial clipped raster to: {temp_initial_clip}")
+def iter_aligned_blocks(
+    source_url: str,
+    grid: ReferenceGrid,
+    resampling: Resampling = Resampling.bilinear,
+    block_size: int = ALIGNED_BLOCK_SIZE,
+) -> Iterator[Tuple[Window, np.ndarray]]:
+    """
+    Clip a raster to a planning area and align it to a reference grid, block by block.
 
-        log.info(
-            f"Resampling to reference grid: {ref_width}x{ref_height} "
-            f"(original clipped: {clipped_data.shape[1]}x{clipped_data.shape[0]})"
-        )
+    The source is warped onto the reference grid through a WarpedVRT, so only the
+    source pixels needed for each block are read and the aligned raster never has
+    to be held in memory or written to disk. Blocks entirely outside the planning
+    area are not warped at all.
 
-        aligned_data = np.full((ref_height, ref_width), ref_nodata, dtype=np.float32)
-
-        with rasterio.open(temp_initial_clip) as clip_src:
-            reproject(
-                source=rasterio.band(clip_src, 1),
-                destination=aligned_data,
-                src_transform=clip_src.transform,
-                src_crs=clip_src.crs,
-                src_nodata=clip_src.nodata,
-                dst_transform=ref_transform,
-                dst_crs="EPSG:4269",
-                dst_nodata=ref_nodata,
-                resampling=resampling,
-            )
+    The output covers the full reference grid, even if the source raster doesn't
+    fully cover the planning area (missing areas become nodata).
 
-        geom_geojson = json.loads(planning_area_geometry.json)
-        geom_mask = geometry_mask(
-            [geom_geojson],
-            out_shape=(ref_height, ref_width),
-            transform=ref_transform,
-            invert=True,
-        )
-        aligned_data[~geom_mask] = ref_nodata
+    Args:
+        source_url: URL of the source raster to clip
+        grid: ReferenceGrid to align to, with the planning area to clip to
+        resampling: Resampling method (default: bilinear)
+        block_size: Width and height of the blocks (default: 512)
 
+    Yields:
+        Tuples of (window, data) where data is a float32 array for that window of
+        the reference grid, with pixels outside the planning area set to nodata
+    """
+    with rasterio.open(source_url) as src:
         log.info(
-            f"After alignment to reference grid - "
-            f"shape: {aligned_data.shape}, "
-            f"valid pixels: {np.sum(aligned_data != ref_nodata)}"
+            f"Aligning raster - url: {source_url}, "
+            f"shape: ({src.height}, {src.width}), "
+            f"dtype: {src.dtypes[0]}, "
+            f"nodata: {src.nodata}, "
+            f"crs: {src.crs}, "
+            f"reference grid: {grid.width}x{grid.height}"
         )
 
-        return aligned_data
-
-    finally:
-        try:
-            Path(temp_initial_clip).unlink(missing_ok=True)
-        except Exception as e:
-            log.warning(f"Failed to clean up temp file {temp_initial_clip}: {e}")
+        with WarpedVRT(
+            src,
+            crs="EPSG:4269",
+            transform=grid.transform,
+            width=grid.width,
+            height=grid.height,
+            nodata=grid.nodata,
+            dtype="float32",
+            resampling=resampling,
+        ) as vrt:
+            for window in grid.block_windows(block_size):
+                inside = grid.planning_area_mask(window)
+                if not inside.any():
+                    yield window, np.full(inside.shape, grid.nodata, np.float32)
+                    continue
+
+                data = vrt.read(1, window=window)
+                data[~inside | np.isnan(data)] = grid.nodata
+                yield window, data
 
 
 def normalize_raster_layer(
@@ -430,130 +492,97 @@ def normalize_raster_layer(
     if not input_layer.url:
         raise ValueError("Input layer must have a valid URL")
 
-    ref_transform, ref_width, ref_height, ref_nodata = get_reference_grid_for_run(
-        run_id, planning_area_geometry
-    )
-
-    with rasterio.Env(**get_gdal_env()):
-        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-            temp_clipped_path = tmp.name
-
-        aligned_data = clip_and_align_raster_to_grid(
-            source_url=input_layer.url,
-            planning_area_geometry=planning_area_geometry,
-            ref_transform=ref_transform,
-            ref_width=ref_width,
-            ref_height=ref_height,
-            ref_nodata=ref_nodata,
-            resampling=Resampling.bilinear,
-        )
-
-        if np.any(aligned_data != ref_nodata):
-            valid_data = aligned_data[aligned_data != ref_nodata]
-            log.info(
-                f"Aligned data stats - min: {np.min(valid_data)}, max: {np.max(valid_data)}"
-            )
-
-        profile = {
-            "driver": "GTiff",
-            "dtype": rasterio.float32,
-            "width": ref_width,
-            "height": ref_height,
-            "count": 1,
-            "crs": "EPSG:4269",
-            "transform": ref_transform,
-            "nodata": ref_nodata,
-        }
-
-        with rasterio.open(temp_clipped_path, "w", **profile) as dst:
-            dst.write(aligned_data, 1)
-
-        log.info(f"Wrote aligned raster to: {temp_clipped_path}")
-
-        cf_meta = input_layer.metadata.get("modules", {}).get("climate_foresight", {})
-        translation = cf_meta.get("translation", {})
-
-        function = translation.get("function")
-        if function != "trap":
-            function = "lsmf" if favor_high else "lzmf"
-
-        endpoints_method = translation.get("endpoints_method", "outliers")
-        empirical_endpoints = translation.get("empirical_endpoints")
-        outlier_k = translation.get("outlier_k", 3.0)
-
-        with rasterio.open(temp_clipped_path) as src:
-            profile = src.profile.copy()
-            nodata = src.nodata
+    grid = get_cached_reference_grid(run_id, planning_area_geometry)
+    ref_nodata = grid.nodata
+    aligned_grid = {
+        "source_url": input_layer.url,
+        "grid": grid,
+        "resampling": Resampling.bilinear,
+    }
 
-            all_valid_data = []
-            total_pixels = 0
-            valid_pixels = 0
+    cf_meta = input_layer.metadata.get("modules", {}).get("climate_foresight", {})
+    translation = cf_meta.get("translation", {})
 
-            for _, window in src.block_windows(1):
-                block_data = src.read(1, window=window)
-                total_pixels += block_data.size
+    function = translation.get("function")
+    if function != "trap":
+        function = "lsmf" if favor_high else "lzmf"
 
-                if nodata is not None:
-                    valid = block_data[block_data != nodata]
-                else:
-                    valid = block_data[~np.isnan(block_data)]
+    endpoints_method = translation.get("endpoints_method", "outliers")
+    empirical_endpoints = translation.get("empirical_endpoints")
+    outlier_k = translation.get("outlier_k", 3.0)
 
-                valid_pixels += len(valid)
+    with rasterio.Env(**get_gdal_env()):
+        if endpoints_method in ("outliers", "full_range"):
+            statistics = StreamingStatistics()
 
-                if len(valid) > 0:
-                    all_valid_data.append(valid)
+            for _, block_data in iter_aligned_blocks(**aligned_grid):
+                statistics.update(block_data[block_data != ref_nodata])
 
-            if not all_valid_data:
+            if not statistics.count:
                 log.error("No valid data found in clipped raster!")
-                all_valid_array = np.array([], dtype=np.float32)
             else:
-                all_valid_array = np.concatenate(all_valid_data).astype(np.float32)
+                log.info(
+                    f"Aligned data stats - min: {statistics.min}, max: {statistics.max}"
+                )
 
-            del all_valid_data
+        if endpoints_method == "outliers":
+            lower_endpoint, upper_endpoint = calculate_outliers(statistics, k=outlier_k)
+            endpoints = [lower_endpoint, upper_endpoint]
 
-            if endpoints_method == "outliers":
-                lower_endpoint, upper_endpoint = calculate_outliers(
-                    all_valid_array, k=outlier_k
+        elif endpoints_method == "full_range":
+            if not statistics.count:
+                raise ValueError(
+                    f"Layer {input_layer.id} has no valid data to calculate its full range"
                 )
-                endpoints = [lower_endpoint, upper_endpoint]
-
-            elif endpoints_method == "full_range":
-                endpoints = [
-                    float(np.min(all_valid_array)),
-                    float(np.max(all_valid_array)),
-                ]
-
-            elif endpoints_method == "empirical":
-                if empirical_endpoints is None:
-                    raise ValueError(
-                        f"Layer {input_layer.id} uses empirical endpoints but none are provided in metadata"
-                    )
-                endpoints = empirical_endpoints
+            endpoints = [statistics.min, statistics.max]
 
-            else:
+        elif endpoints_method == "empirical":
+            if empirical_endpoints is None:
                 raise ValueError(
-                    f"Unknown endpoints method '{endpoints_method}' for layer {input_layer.id}"
+                    f"Layer {input_layer.id} uses empirical endpoints but none are provided in metadata"
                 )
+            endpoints = empirical_endpoints
+
+        else:
+            raise ValueError(
+                f"Unknown endpoints method '{endpoints_method}' for layer {input_layer.id}"
+            )
+
+        profile = {
+            "driver": "GTiff",
+            "dtype": rasterio.float32,
+            "width": grid.width,
+            "height": grid.height,
+            "count": 1,
+            "crs": "EPSG:4269",
+            "transform": grid.transform,
+            "nodata": ref_nodata,
+            "tiled": True,
+            "blockxsize": ALIGNED_BLOCK_SIZE,
+            "blockysize": ALIGNED_BLOCK_SIZE,
+        }
 
-            del all_valid_array
+    uuid = str(uuid4())
+    dataset = Dataset.objects.get(pk=settings.CLIMATE_FORESIGHT_DATASET_ID)
+    organization = input_layer.organization
 
-            profile.update(dtype=rasterio.float32, nodata=nodata if nodata else -9999)
+    original_name = f"normalized_{uuid}.tif"
 
-            with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
-                temp_path = tmp_file.name
+    storage_url, storage_path = get_storage_url_and_path(
+        organization_id=organization.pk,
+        uuid=uuid,
+        original_name=original_name,
+    )
 
+    temp_path = staging_path(in_memory=grid.width * grid.height <= IN_MEMORY_MAX_PIXELS)
+    try:
+        with rasterio.Env(**get_gdal_env()):
             with rasterio.open(temp_path, "w", **profile) as dst:
-                for _, window in src.block_windows(1):
-                    block_data = src.read(1, window=window)
-
+                for window, block_data in iter_aligned_blocks(**aligned_grid):
                     output_block = np.full_like(
-                        block_data, nodata if nodata else -9999, dtype=np.float32
+                        block_data, ref_nodata, dtype=np.float32
                     )
-
-                    if nodata is not None:
-                        valid_mask = block_data != nodata
-                    else:
-                        valid_mask = ~np.isnan(block_data)
+                    valid_mask = block_data != ref_nodata
 
                     if np.any(valid_mask):
                         valid_values = block_data[valid_mask].astype(float)
@@ -587,24 +616,15 @@ def normalize_raster_layer(
 
                     dst.write(output_block, 1, window=window)
 
-    uuid = str(uuid4())
-    dataset = Dataset.objects.get(pk=settings.CLIMATE_FORESIGHT_DATASET_ID)
-    organization = input_layer.organization
-
-    original_name = f"normalized_{uuid}.tif"
-
-    storage_url, storage_path = get_storage_url_and_path(
-        organization_id=organization.pk,
-        uuid=uuid,
-        original_name=original_name,
-    )
-
-    to_planscape_streaming(
-        input_file=temp_path,
-        output_file=storage_path or storage_url,
-    )
-
-    raster_info = info_raster(storage_url)
+        raster_info = to_planscape_cog(
+            input_file=temp_path,
+            output_file=storage_path or storage_url,
+        )
+    finally:
+        try:
+            delete_staged(temp_path)
+        except Exception as e:
+            log.warning(f"Failed to clean up temp file: {e}")
 
     metadata = {
         "modules": {
@@ -650,12 +670,6 @@ def normalize_raster_layer(
         ).first()
 
         if existing_layer:
-            try:
-                Path(temp_path).unlink(missing_ok=True)
-                Path(temp_clipped_path).unlink(missing_ok=True)
-            except Exception as e:
-                log.warning(f"Failed to clean up temp files: {e}")
-
             return {
                 "datalayer": existing_layer,
                 "normalization_info": {
@@ -668,12 +682,6 @@ def normalize_raster_layer(
         else:
             raise
 
-    try:
-        Path(temp_path).unlink(missing_ok=True)
-        Path(temp_clipped_path).unlink(missing_ok=True)
-    except Exception as e:
-        log.warning(f"Failed to clean up temp files: {e}")
-
     return {
         "datalayer": normalized_layer,
         "normalization_info": {
@@ -880,44 +888,21 @@ def rollup_pillar(
             raise ValueError(f"Unknown weight method: {method}")
 
     with rasterio.Env(**get_gdal_env()):
-        # get profile from first layer
-        with rasterio.open(normalized_layers[0].url) as src:
-            profile = src.profile.copy()
-            nodata = src.nodata if src.nodata is not None else -9999
-
-        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
-            temp_path = tmp_file.name
-
-        profile.update(dtype=rasterio.float32, nodata=nodata)
-
-        with rasterio.open(temp_path, "w", **profile) as dst:
-            with rasterio.open(normalized_layers[0].url) as src:
-                for _, window in src.block_windows(1):
-                    block_stack = []
-                    for layer in normalized_layers:
-                        with rasterio.open(layer.url) as layer_src:
-                            fill_value = (
-                                layer_src.nodata
-                                if layer_src.nodata is not None
-                                else nodata
-                            )
-                            block_data = layer_src.read(
-                                1,
-                                window=window,
-                                boundless=True,
-                                fill_value=fill_value,
-                            )
-                            block_stack.append(block_data)
-
-                    # this is an array of blocks, read from the datalayers
-                    block_stack = np.array(block_stack, dtype=np.float32)
-
-                    # if we have nodata values, convert them to nan to make it easier to do math
-                    if nodata is not None and not np.isnan(nodata):
-                        block_stack = np.where(
-                            block_stack == nodata, np.nan, block_stack
-                        )
+        with RasterStack([layer.url for layer in normalized_layers]) as stack:
+            # get profile from first layer
+            profile = stack.profile
+            nodata = stack.nodata
+
+            with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
+                temp_path = tmp_file.name
 
+            profile.update(dtype=rasterio.float32, nodata=nodata)
+            weights_arr = np.array(weights, dtype=np.float32)[:, np.newaxis, np.newaxis]
+
+            with rasterio.open(temp_path, "w", **profile) as dst:
+                # block_stack is an array of blocks, read from the datalayers,
+                # with nodata already converted to nan to make it easier to do math
+                for window, block_stack in stack.blocks():
                     # valid mask now only needs to accout for nan
                     # valid mask is all the pixels that have ANY value, except
                     # NaN, across all blocks.
@@ -931,9 +916,6 @@ def rollup_pillar(
                     )
 
                     if np.any(valid_mask):
-                        weights_arr = np.array(weights, dtype=np.float32)[
-                            :, np.newaxis, np.newaxis
-                        ]
                         nan_mask = np.isnan(block_stack)
                         effective_weights = np.where(nan_mask, 0.0, weights_arr)
                         weight_sums = effective_weights.sum(axis=0)
@@ -958,13 +940,11 @@ def rollup_pillar(
         original_name=original_name,
     )
 
-    to_planscape_streaming(
+    raster_info = to_planscape_cog(
         input_file=temp_path,
         output_file=storage_path or storage_url,
     )
 
-    raster_info = info_raster(storage_url)
-
     metadata = {
         "modules": {
             "climate_foresight": {
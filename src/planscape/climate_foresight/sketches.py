@@ -0,0 +1,195 @@
+"""
+Streaming statistics for Climate Foresight.
+
+Lets the normalization endpoints (min/max, percentiles, MAD outliers) be
+computed block by block, without ever holding every valid pixel of a
+raster in memory. Accumulators built over different tiles can be merged,
+so the work can also be split across workers.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_SKETCH_SIZE = 4096
+
+
+def _weighted_quantiles(
+    values: np.ndarray,
+    weights: np.ndarray,
+    qs: Sequence[float],
+) -> np.ndarray:
+    """
+    Quantiles of sorted `values` where every value stands for `weights` of
+    them, with the linear interpolation of `np.quantile` (so it gives the
+    same results as numpy when every weight is 1).
+    """
+    cumulative = np.cumsum(weights)
+    positions = (cumulative[-1] - 1) * np.asarray(qs, dtype=float)
+    lower = np.floor(positions)
+    upper = np.ceil(positions)
+    lower_values = values[np.searchsorted(cumulative, lower, side="right")]
+    upper_values = values[np.searchsorted(cumulative, upper, side="right")]
+    return lower_values + (upper_values - lower_values) * (positions - lower)
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Keeps a few multiples of `k` of the values it's fed, in levels of
+    compactors where a value of level h stands for 2^h input values. Quantile
+    rank errors are around 1/k, and the sketch is exact until it has seen
+    more than `k` values. Compaction is randomized, `seed` keeps it
+    reproducible.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE, seed: int = 0):
+        self.k = k
+        self._levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # an odd item out stays behind for the next compaction
+                odd = len(items) % 2
+                promoted = items[odd:][self._rng.integers(2) :: 2]
+                self._levels[level] = items[:odd]
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], promoted]
+                )
+            level += 1
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size:
+            self._levels[0] = np.concatenate([self._levels[0], values])
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(np.empty(0))
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self._compress()
+        return self
+
+    def weighted_values(self) -> Tuple[np.ndarray, np.ndarray]:
+        """The retained values, sorted, and how many inputs each stands for."""
+        values = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [
+                np.full(len(items), 2**level, dtype=np.int64)
+                for level, items in enumerate(self._levels)
+            ]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        values, weights = self.weighted_values()
+        if not values.size:
+            return np.full(len(qs), np.nan)
+        return _weighted_quantiles(values, weights, qs)
+
+    def rank(self, value: float) -> float:
+        """Fraction of the values that are <= `value`."""
+        values, weights = self.weighted_values()
+        if not values.size:
+            return np.nan
+        below = np.searchsorted(values, value, side="right")
+        return float(weights[:below].sum() / weights.sum())
+
+    def median_absolute_deviation(self, median: Optional[float] = None) -> float:
+        values, weights = self.weighted_values()
+        if not values.size:
+            return np.nan
+        if median is None:
+            median = _weighted_quantiles(values, weights, [0.5])[0]
+        deviations = np.abs(values - median)
+        order = np.argsort(deviations, kind="stable")
+        return float(_weighted_quantiles(deviations[order], weights[order], [0.5])[0])
+
+
+class StreamingStatistics:
+    """
+    Exact count, min, max, mean and std plus approximate quantiles (through a
+    `QuantileSketch`) of a stream of values, e.g. the valid pixels of each
+    block of a raster. NaN values are ignored.
+
+    Mean and std are accumulated with Chan et al.'s pairwise update of the
+    sum of squared deviations, which unlike a plain sum of squares doesn't
+    lose precision when the std is small compared to the mean.
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE, seed: int = 0):
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.sketch = QuantileSketch(k=k, seed=seed)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray, **kwargs) -> "StreamingStatistics":
+        statistics = cls(**kwargs)
+        statistics.update(values)
+        return statistics
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        mean = float(values.mean())
+        self._combine(values.size, mean, float(((values - mean) ** 2).sum()))
+        self.sketch.update(values)
+
+    def merge(self, other: "StreamingStatistics") -> "StreamingStatistics":
+        if other.count:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._combine(other.count, other.mean, other._m2)
+            self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def sum(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation, like `np.std`."""
+        return float(np.sqrt(self._m2 / self.count)) if self.count else np.nan
+
+    def percentiles(self, ps: Sequence[float]) -> np.ndarray:
+        return self.sketch.quantiles([p / 100 for p in ps])
+
+    def median(self) -> float:
+        return float(self.sketch.quantiles([0.5])[0])
+
+    def median_absolute_deviation(self) -> float:
+        return self.sketch.median_absolute_deviation(self.median())
+
+    def percentile_of(self, value: float) -> float:
+        """Percentage of the values that are <= `value`."""
+        return self.sketch.rank(value) * 100
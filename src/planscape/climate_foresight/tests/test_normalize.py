@@ -422,6 +422,16 @@ class CalculateOutliersTest(TestCase):
         self.assertEqual(lower, 0.0)
         self.assertEqual(upper, 1.0)
 
+    def test_large_array_is_exact(self):
+        """Test that arrays above the sketch capacity use the exact median and MAD."""
+        data = np.random.default_rng(7).normal(50, 10, 100_000).astype(np.float32)
+        lower, upper = calculate_outliers(data, k=3.0)
+
+        median = np.median(data)
+        mad_scaled = np.median(np.abs(data - median)) * 1.4826
+        self.assertEqual(lower, float(max(median - 3.0 * mad_scaled, data.min())))
+        self.assertEqual(upper, float(min(median + 3.0 * mad_scaled, data.max())))
+
     def test_different_k_values(self):
         """Test that different k values affect bounds."""
         data = np.array([10, 12, 11, 13, 12, 10, 11, 12, 11, 10], dtype=np.float32)
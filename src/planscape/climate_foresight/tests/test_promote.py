@@ -4,6 +4,7 @@ Tests for climate_foresight/promote.py - PROMOTe (MPAT) analysis functions.
 Tests cover:
 - rescale_linear: Linear rescaling from one range to another
 - calculate_promote_strategy_score: Euclidean distance-based scoring in 2D space
+- calculate_promote_outputs: All PROMOTe outputs for a window of the rasters
 - Edge cases and numerical correctness
 """
 
@@ -11,7 +12,10 @@ import numpy as np
 from django.test import TestCase
 
 from climate_foresight.promote import (
+    PROMOTE_OUTPUTS,
+    PROMOTE_UINT8_NODATA,
     rescale_linear,
+    calculate_promote_outputs,
     calculate_promote_strategy_score,
 )
 
@@ -337,3 +341,62 @@ class CalculatePromoteStrategyScoreTest(TestCase):
         # Scores should be monotonically increasing along diagonal
         for i in range(4):
             self.assertLess(scores[i], scores[i + 1])
+
+
+class CalculatePromoteOutputsTest(TestCase):
+    """Tests for the PROMOTe outputs of a window of the rasters."""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.current = rng.uniform(0, 100, (40, 60)).astype(np.float32)
+        self.future = rng.uniform(0, 1, (40, 60)).astype(np.float32)
+        self.valid_mask = rng.random((40, 60)) > 0.2
+        self.future_min = float(self.future[self.valid_mask].min())
+        self.future_max = float(self.future[self.valid_mask].max())
+
+    def calculate(self, rows=slice(None), cols=slice(None)):
+        return calculate_promote_outputs(
+            current_data=self.current[rows, cols],
+            future_data=self.future[rows, cols],
+            valid_mask=self.valid_mask[rows, cols],
+            future_min=self.future_min,
+            future_max=self.future_max,
+            nodata=-9999,
+        )
+
+    def test_returns_every_output(self):
+        outputs = self.calculate()
+
+        self.assertEqual(set(outputs), {key for key, *_ in PROMOTE_OUTPUTS})
+        self.assertEqual(outputs["mpat_matrix_datalayer"].dtype, np.uint8)
+        self.assertEqual(outputs["monitor_datalayer"].dtype, np.float32)
+
+    def test_invalid_pixels_are_nodata(self):
+        outputs = self.calculate()
+
+        invalid = ~self.valid_mask
+        self.assertTrue(np.all(outputs["monitor_datalayer"][invalid] == -9999))
+        self.assertTrue(
+            np.all(outputs["mpat_strength_datalayer"][invalid] == PROMOTE_UINT8_NODATA)
+        )
+
+    def test_blocks_match_whole_raster(self):
+        """Blockwise results are the same as processing the whole raster."""
+        whole = self.calculate()
+
+        for rows, cols in (
+            (slice(0, 16), slice(0, 16)),
+            (slice(16, 40), slice(16, 60)),
+        ):
+            block = self.calculate(rows, cols)
+            for key, data in block.items():
+                np.testing.assert_array_equal(data, whole[key][rows, cols])
+
+    def test_block_without_valid_pixels(self):
+        self.valid_mask[:] = False
+
+        outputs = self.calculate()
+
+        self.assertTrue(
+            np.all(outputs["integrated_condition_score_datalayer"] == -9999)
+        )
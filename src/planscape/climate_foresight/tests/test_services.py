@@ -3,21 +3,36 @@ Tests for climate_foresight/services.py
 
 These tests cover:
 - calculate_optimized_weights: Weight optimization using Pearson correlation
+- ReferenceGrid: Reference grid with a packed planning area mask, cached per run
+- iter_aligned_blocks: Block-wise clip and alignment to a reference grid
 - Helper functions and edge cases for service layer
 
 Note: Full integration tests for calculate_layer_statistics, normalize_raster_layer,
 and rollup_pillar require raster files and are better suited for end-to-end testing.
 """
 
+import json
+
 import numpy as np
 from django.contrib.gis.geos import MultiPolygon, Polygon
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from unittest.mock import Mock, patch
 import tempfile
+from pathlib import Path
 import rasterio
+from rasterio.features import geometry_mask
 from rasterio.transform import from_bounds
-
-from climate_foresight.services import calculate_optimized_weights
+from rasterio.warp import Resampling
+from rasterio.windows import Window
+
+from climate_foresight.services import (
+    ReferenceGrid,
+    calculate_optimized_weights,
+    get_cached_reference_grid,
+    invalidate_reference_grid,
+    iter_aligned_blocks,
+)
 from datasets.models import DataLayer
 
 
@@ -383,3 +398,155 @@ class CalculateOptimizedWeightsTest(TestCase):
         # This is an edge case that might need handling in the actual code
         # For now, just verify we get weights back
         self.assertEqual(len(weights), 2)
+
+
+class IterAlignedBlocksTest(TestCase):
+    """Tests for block-wise clipping and alignment to a reference grid."""
+
+    def setUp(self):
+        # source covers the left half of the reference grid only
+        self.source = np.arange(100 * 50, dtype=np.float32).reshape(100, 50)
+        self.source[10, 10] = -9999
+
+        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp_file:
+            self.source_path = tmp_file.name
+        self.addCleanup(Path(self.source_path).unlink, missing_ok=True)
+
+        with rasterio.open(
+            self.source_path,
+            "w",
+            driver="GTiff",
+            height=100,
+            width=50,
+            count=1,
+            dtype=np.float32,
+            crs="EPSG:4269",
+            transform=from_bounds(-120, 35, -119.5, 36, 50, 100),
+            nodata=-9999,
+        ) as dst:
+            dst.write(self.source, 1)
+
+        self.planning_area = MultiPolygon(
+            [Polygon([(-120, 35), (-120, 36), (-119, 36), (-119, 35.5), (-120, 35)])]
+        )
+        self.grid = ReferenceGrid.from_geometry(
+            planning_area_geometry=self.planning_area,
+            transform=from_bounds(-120, 35, -119, 36, 100, 100),
+            width=100,
+            height=100,
+            nodata=-9999.0,
+        )
+
+    def read_aligned(self, block_size):
+        aligned = np.full((100, 100), np.nan, dtype=np.float32)
+        for window, block in iter_aligned_blocks(
+            self.source_path,
+            self.grid,
+            resampling=Resampling.nearest,
+            block_size=block_size,
+        ):
+            self.assertEqual(block.dtype, np.float32)
+            rows, cols = window.toslices()
+            aligned[rows, cols] = block
+        return aligned
+
+    def test_blocks_cover_the_reference_grid(self):
+        """Every pixel of the reference grid is yielded exactly once."""
+        aligned = self.read_aligned(block_size=32)
+
+        self.assertFalse(np.isnan(aligned).any())
+
+    def test_result_does_not_depend_on_block_size(self):
+        """Small and large blocks give the same aligned raster."""
+        np.testing.assert_array_equal(
+            self.read_aligned(block_size=16), self.read_aligned(block_size=512)
+        )
+
+    def test_clips_to_planning_area_and_source_extent(self):
+        """Pixels outside the planning area, the source or its data are nodata."""
+        aligned = self.read_aligned(block_size=32)
+
+        # inside both: the source values, column for column
+        np.testing.assert_array_equal(aligned[:50, 20:30], self.source[:50, 20:30])
+        self.assertEqual(aligned[10, 10], -9999)
+        # outside the source extent
+        self.assertTrue((aligned[:, 50:] == -9999).all())
+        # outside the planning area (lower right triangle is clipped off)
+        self.assertEqual(aligned[99, 49], -9999)
+        self.assertNotEqual(aligned[0, 49], -9999)
+
+
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "climate-foresight-grid-tests",
+    }
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ReferenceGridTest(TestCase):
+    """Tests for the reference grid and its packed planning area mask."""
+
+    def setUp(self):
+        cache.clear()
+        self.planning_area = MultiPolygon(
+            [Polygon([(-120, 35), (-120, 36), (-119, 36), (-119, 35.5), (-120, 35)])]
+        )
+        self.transform = from_bounds(-120, 35, -119, 36, 1203, 1100)
+        self.grid = ReferenceGrid.from_geometry(
+            planning_area_geometry=self.planning_area,
+            transform=self.transform,
+            width=1203,
+            height=1100,
+            nodata=-9999.0,
+        )
+
+    def test_mask_is_packed_one_bit_per_pixel(self):
+        """The packed mask takes a byte per 8 pixels of each row."""
+        self.assertEqual(self.grid.packed_mask.shape, (1100, 151))
+
+    def test_windows_of_the_mask_match_the_planning_area(self):
+        """Unpacked windows match the planning area rasterized on the whole grid."""
+        expected = geometry_mask(
+            [json.loads(self.planning_area.json)],
+            out_shape=(1100, 1203),
+            transform=self.transform,
+            invert=True,
+        )
+
+        for window in [
+            Window(0, 0, 1203, 1100),
+            Window(3, 517, 13, 29),
+            Window(1024, 1024, 179, 76),
+        ]:
+            rows, cols = window.toslices()
+            np.testing.assert_array_equal(
+                self.grid.planning_area_mask(window), expected[rows, cols]
+            )
+
+    def test_block_windows_cover_the_grid(self):
+        """Block windows tile the grid without gaps or overlaps."""
+        covered = np.zeros((1100, 1203), dtype=int)
+        for window in self.grid.block_windows(block_size=512):
+            rows, cols = window.toslices()
+            covered[rows, cols] += 1
+
+        self.assertTrue((covered == 1).all())
+
+    @patch("climate_foresight.services.get_reference_grid_for_run")
+    def test_grid_is_built_once_per_run(self, mock_get_reference_grid):
+        """The grid is cached per run until it is invalidated."""
+        mock_get_reference_grid.return_value = (self.transform, 1203, 1100, -9999.0)
+
+        first = get_cached_reference_grid(1, self.planning_area)
+        second = get_cached_reference_grid(1, self.planning_area)
+        get_cached_reference_grid(2, self.planning_area)
+
+        self.assertEqual(mock_get_reference_grid.call_count, 2)
+        np.testing.assert_array_equal(first.packed_mask, second.packed_mask)
+
+        invalidate_reference_grid(1)
+        get_cached_reference_grid(1, self.planning_area)
+
+        self.assertEqual(mock_get_reference_grid.call_count, 3)
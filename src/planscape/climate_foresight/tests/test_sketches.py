@@ -0,0 +1,122 @@
+"""
+Tests for climate_foresight/sketches.py - streaming statistics.
+
+Tests cover:
+- QuantileSketch: KLL quantile sketch (exact while small, bounded rank error after)
+- StreamingStatistics: exact moments and sketch-backed quantiles, merged across tiles
+"""
+
+import numpy as np
+from django.test import TestCase
+
+from climate_foresight.sketches import QuantileSketch, StreamingStatistics
+
+
+class QuantileSketchTest(TestCase):
+    """Tests for the KLL quantile sketch."""
+
+    def test_exact_while_smaller_than_k(self):
+        """With fewer values than k, quantiles match numpy exactly."""
+        values = np.random.default_rng(1).normal(50, 10, 1000)
+        sketch = QuantileSketch(k=2048)
+        sketch.update(values)
+
+        np.testing.assert_array_equal(
+            sketch.quantiles([0.05, 0.5, 0.95]),
+            np.quantile(values, [0.05, 0.5, 0.95]),
+        )
+        self.assertEqual(sketch.rank(50.0), np.mean(values <= 50.0))
+
+    def test_rank_error_is_bounded(self):
+        """Quantiles of a large stream have small rank errors."""
+        values = np.random.default_rng(2).lognormal(2, 1, 500_000)
+        sketch = QuantileSketch(k=1024)
+        for chunk in np.array_split(values, 50):
+            sketch.update(chunk)
+
+        qs = [0.01, 0.1, 0.5, 0.9, 0.99]
+        for q, estimate in zip(qs, sketch.quantiles(qs)):
+            self.assertAlmostEqual(np.mean(values <= estimate), q, delta=0.005)
+
+    def test_retained_values_stay_bounded(self):
+        """The sketch keeps a few multiples of k values, not the whole stream."""
+        sketch = QuantileSketch(k=256)
+        sketch.update(np.arange(1_000_000, dtype=float))
+
+        values, weights = sketch.weighted_values()
+        self.assertLess(len(values), 256 * 4)
+        self.assertEqual(weights.sum(), 1_000_000)
+
+    def test_empty_sketch(self):
+        """An empty sketch returns NaN quantiles."""
+        self.assertTrue(np.isnan(QuantileSketch().quantiles([0.5])).all())
+
+
+class StreamingStatisticsTest(TestCase):
+    """Tests for the streaming statistics accumulator."""
+
+    def setUp(self):
+        self.values = np.random.default_rng(3).uniform(-20, 80, 200_000)
+
+    def test_moments_are_exact(self):
+        """Count, min, max, mean and std match numpy."""
+        statistics = StreamingStatistics()
+        for chunk in np.array_split(self.values, 17):
+            statistics.update(chunk)
+
+        self.assertEqual(statistics.count, self.values.size)
+        self.assertEqual(statistics.min, self.values.min())
+        self.assertEqual(statistics.max, self.values.max())
+        self.assertAlmostEqual(statistics.mean, self.values.mean(), places=9)
+        self.assertAlmostEqual(statistics.std, self.values.std(), places=9)
+        self.assertAlmostEqual(statistics.sum, self.values.sum(), places=4)
+
+    def test_merging_tiles_matches_a_single_stream(self):
+        """Statistics of separate tiles merge into the statistics of the whole."""
+        tiles = [
+            StreamingStatistics.from_array(chunk, seed=seed)
+            for seed, chunk in enumerate(np.array_split(self.values, 4))
+        ]
+        merged = tiles[0]
+        for tile in tiles[1:]:
+            merged.merge(tile)
+
+        self.assertEqual(merged.count, self.values.size)
+        self.assertEqual(merged.min, self.values.min())
+        self.assertEqual(merged.max, self.values.max())
+        self.assertAlmostEqual(merged.std, self.values.std(), places=9)
+        self.assertAlmostEqual(
+            merged.median(), np.median(self.values), delta=np.ptp(self.values) * 0.01
+        )
+
+    def test_median_absolute_deviation(self):
+        """MAD is exact for small inputs and close for large ones."""
+        small = self.values[:1000]
+        median = np.median(small)
+        self.assertEqual(
+            StreamingStatistics.from_array(small).median_absolute_deviation(),
+            np.median(np.abs(small - median)),
+        )
+
+        median = np.median(self.values)
+        expected = np.median(np.abs(self.values - median))
+        self.assertAlmostEqual(
+            StreamingStatistics.from_array(self.values).median_absolute_deviation(),
+            expected,
+            delta=expected * 0.02,
+        )
+
+    def test_ignores_nan_values(self):
+        """NaN values are not counted."""
+        statistics = StreamingStatistics.from_array(np.array([1.0, np.nan, 3.0]))
+
+        self.assertEqual(statistics.count, 2)
+        self.assertEqual(statistics.mean, 2.0)
+        self.assertEqual(statistics.percentile_of(1.0), 50.0)
+
+    def test_empty(self):
+        """Empty statistics have no count and NaN std."""
+        statistics = StreamingStatistics.from_array(np.array([]))
+
+        self.assertEqual(statistics.count, 0)
+        self.assertTrue(np.isnan(statistics.std))
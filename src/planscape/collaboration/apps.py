@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+
+
+class CollaborationConfig(AppConfig):
+    name = "collaboration"
+
+    def register_role_permissions_invalidation(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from collaboration.utils import clear_role_permissions
+
+        post_save.connect(
+            clear_role_permissions,
+            sender="collaboration.Permissions",
+            dispatch_uid="collaboration.role_permissions.post_save",
+        )
+        post_delete.connect(
+            clear_role_permissions,
+            sender="collaboration.Permissions",
+            dispatch_uid="collaboration.role_permissions.post_delete",
+        )
+
+    def ready(self):
+        self.register_role_permissions_invalidation()
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("collaboration", "0010_revert_collaborator_permissions"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="userobjectrole",
+            index=models.Index(
+                fields=["collaborator", "content_type", "object_pk"],
+                name="uor_collaborator_object_idx",
+            ),
+        ),
+    ]
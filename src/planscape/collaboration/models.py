@@ -79,6 +79,13 @@ class UserObjectRole(CreatedAtMixin, UpdatedAtMixin, models.Model):
                 name="unique_collaborator",
             )
         ]
+        indexes = [
+            # answers "what is shared with this user" without a table scan
+            models.Index(
+                fields=["collaborator", "content_type", "object_pk"],
+                name="uor_collaborator_object_idx",
+            ),
+        ]
 
 
 TPermission = Type[Permissions]
@@ -2,7 +2,12 @@ from climate_foresight.models import ClimateForesightRun
 from django.contrib.auth.models import AbstractUser
 from planning.models import PlanningArea, PlanningAreaNote, Scenario
 
-from collaboration.utils import check_for_permission, is_creator
+from collaboration.utils import (
+    attach_permission_resolver,
+    detach_permission_resolver,
+    has_permission,
+    is_creator,
+)
 
 
 class CheckPermissionMixin:
@@ -29,7 +34,7 @@ class PlanningAreaPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(user.pk, planning_area, "view_planningarea")
+        return has_permission(user, planning_area, "view_planningarea")
 
     @staticmethod
     def can_add(user: AbstractUser, planning_area: PlanningArea):
@@ -37,8 +42,8 @@ class PlanningAreaPermission(CheckPermissionMixin):
 
     @staticmethod
     def can_change(user: AbstractUser, planning_area: PlanningArea):
-        return is_creator(user, planning_area) or check_for_permission(
-            user.pk, planning_area, "change_planning_area"
+        return is_creator(user, planning_area) or has_permission(
+            user, planning_area, "change_planning_area"
         )
 
     @staticmethod
@@ -50,14 +55,14 @@ class PlanningAreaPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(user.pk, planning_area, "add_scenario")
+        return has_permission(user, planning_area, "add_scenario")
 
     @staticmethod
     def can_run_climate(user: AbstractUser, planning_area: PlanningArea):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(user.pk, planning_area, "run_climate_foresight")
+        return has_permission(user, planning_area, "run_climate_foresight")
 
 
 class PlanningAreaNotePermission(CheckPermissionMixin):
@@ -65,8 +70,8 @@ class PlanningAreaNotePermission(CheckPermissionMixin):
     def can_view(user: AbstractUser, planning_area_note: PlanningAreaNote):
         if is_creator(user, planning_area_note.planning_area):
             return True
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area_note.planning_area,
             "view_planningarea",
         )
@@ -76,8 +81,8 @@ class PlanningAreaNotePermission(CheckPermissionMixin):
         planning_area: PlanningArea = planning_area_note.planning_area
         if is_creator(user, planning_area):
             return True
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area,
             "view_planningarea",
         )
@@ -108,8 +113,8 @@ class CollaboratorPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area,
             "view_collaborator",
         )
@@ -119,8 +124,8 @@ class CollaboratorPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area,
             "add_collaborator",
         )
@@ -130,8 +135,8 @@ class CollaboratorPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area,
             "change_collaborator",
         )
@@ -141,8 +146,8 @@ class CollaboratorPermission(CheckPermissionMixin):
         if is_creator(user, planning_area):
             return True
 
-        return check_for_permission(
-            user.pk,
+        return has_permission(
+            user,
             planning_area,
             "delete_collaborator",
         )
@@ -153,39 +158,35 @@ class ScenarioPermission(CheckPermissionMixin):
     def can_view(user: AbstractUser, scenario: Scenario):
         planning_creator = is_creator(user, scenario.planning_area)
         scenario_creator = is_creator(user, scenario)
-        has_permission = check_for_permission(
-            user.pk,
+        has_perm = has_permission(
+            user,
             scenario.planning_area,
             "view_scenario",
         )
 
-        return any([planning_creator, scenario_creator, has_permission])
+        return any([planning_creator, scenario_creator, has_perm])
 
     @staticmethod
     def can_add(user: AbstractUser, scenario: Scenario):
         if is_creator(user, scenario.planning_area):
             return True
 
-        return check_for_permission(user.pk, scenario.planning_area, "add_scenario")
+        return has_permission(user, scenario.planning_area, "add_scenario")
 
     @staticmethod
     def can_change(user: AbstractUser, scenario: Scenario):
         planning_creator = is_creator(user, scenario.planning_area)
         scenario_creator = is_creator(user, scenario)
-        has_permission = check_for_permission(
-            user.pk, scenario.planning_area, "change_scenario"
-        )
+        has_perm = has_permission(user, scenario.planning_area, "change_scenario")
 
-        return any([planning_creator, scenario_creator, has_permission])
+        return any([planning_creator, scenario_creator, has_perm])
 
     @staticmethod
     def can_remove(user: AbstractUser, scenario: Scenario):
         planning_creator = is_creator(user, scenario.planning_area)
-        has_permission = check_for_permission(
-            user.pk, scenario.planning_area, "remove_scenario"
-        )
+        has_perm = has_permission(user, scenario.planning_area, "remove_scenario")
 
-        return any([planning_creator, has_permission])
+        return any([planning_creator, has_perm])
 
 
 class ClimateForesightPermission(CheckPermissionMixin):
@@ -193,39 +194,53 @@ class ClimateForesightPermission(CheckPermissionMixin):
     def can_view(user: AbstractUser, run: ClimateForesightRun) -> bool:
         planning_creator = is_creator(user, run.planning_area)
         run_creator = is_creator(user, run)
-        has_permission = check_for_permission(
-            user.pk,
+        has_perm = has_permission(
+            user,
             run.planning_area,
             "view_climate_foresight",
         )
 
-        return any([planning_creator, run_creator, has_permission])
+        return any([planning_creator, run_creator, has_perm])
 
     @staticmethod
     def can_add(user: AbstractUser, run: ClimateForesightRun) -> bool:
         if is_creator(user, run.planning_area):
             return True
 
-        return check_for_permission(user.pk, run.planning_area, "run_climate_foresight")
+        return has_permission(user, run.planning_area, "run_climate_foresight")
 
     @staticmethod
     def can_change(user: AbstractUser, run: ClimateForesightRun) -> bool:
         planning_creator = is_creator(user, run.planning_area)
         run_creator = is_creator(user, run)
-        has_permission = check_for_permission(
-            user.pk,
+        has_perm = has_permission(
+            user,
             run.planning_area,
             "change_climate_foresight",
         )
 
-        return any([planning_creator, run_creator, has_permission])
+        return any([planning_creator, run_creator, has_perm])
 
     @staticmethod
     def can_remove(user: AbstractUser, run: ClimateForesightRun) -> bool:
         planning_creator = is_creator(user, run.planning_area)
         run_creator = is_creator(user, run)
-        has_permission = check_for_permission(
-            user.pk, run.planning_area, "remove_climate_foresight"
-        )
+        has_perm = has_permission(user, run.planning_area, "remove_climate_foresight")
+
+        return any([planning_creator, run_creator, has_perm])
+
+
+class PermissionResolverMixin:
+    """
+    Viewset mixin giving every request its own `PermissionResolver`, used by
+    the permission classes through `has_permission` and by serializers
+    through `get_permission_resolver`.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        attach_permission_resolver(request.user)
+        super().initial(request, *args, **kwargs)
 
-        return any([planning_creator, run_creator, has_permission])
+    def finalize_response(self, request, response, *args, **kwargs):
+        detach_permission_resolver(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -5,10 +5,19 @@ from collaboration.permissions import (
     PlanningAreaPermission,
     ScenarioPermission,
 )
-from collaboration.models import Role
+from collaboration.models import Role, UserObjectRole
+from collaboration.services import get_permissions, get_role
 from collaboration.tests.factories import UserObjectRoleFactory
+from collaboration.utils import (
+    PermissionResolver,
+    attach_permission_resolver,
+    check_for_permission,
+    detach_permission_resolver,
+    get_role_permissions,
+    has_permission,
+)
 from planning.models import PlanningArea, Scenario
-from planning.tests.factories import PlanningAreaFactory
+from planning.tests.factories import PlanningAreaFactory, UserFactory
 
 
 class PermissionsTest(TestCase):
@@ -404,3 +413,69 @@ class PlanningAreaPermisssionsTest(TestCase):
         noperms_name = "User Has no Access to Area"
         noperms_result = next((a for a in areas if a.name == noperms_name), None)
         self.assertIsNone(noperms_result)
+
+
+class PermissionResolverTest(TestCase):
+    def setUp(self):
+        self.creator = UserFactory.create()
+        self.invitee = UserFactory.create()
+        self.planning_areas = {}
+        for role in (Role.OWNER, Role.COLLABORATOR, Role.VIEWER, None):
+            planning_area = PlanningAreaFactory.create(user=self.creator)
+            if role:
+                UserObjectRoleFactory(
+                    inviter=self.creator,
+                    collaborator=self.invitee,
+                    email=self.invitee.email,
+                    role=role,
+                    associated_model=planning_area,
+                )
+            self.planning_areas[role] = planning_area
+        get_role_permissions()
+
+    def test_answers_like_check_for_permission(self):
+        resolver = PermissionResolver(self.invitee)
+        permission_names = set().union(*get_role_permissions().values())
+        for planning_area in self.planning_areas.values():
+            for permission_name in permission_names:
+                self.assertEqual(
+                    resolver.has_permission(planning_area, permission_name),
+                    check_for_permission(
+                        self.invitee.pk, planning_area, permission_name
+                    ),
+                )
+
+    def test_answers_like_get_role_and_get_permissions(self):
+        for user in (self.creator, self.invitee):
+            resolver = PermissionResolver(user)
+            for planning_area in self.planning_areas.values():
+                self.assertEqual(
+                    resolver.get_role(planning_area), get_role(user, planning_area)
+                )
+                self.assertCountEqual(
+                    resolver.get_permissions(planning_area),
+                    get_permissions(user, planning_area),
+                )
+
+    def test_load_uses_a_single_query(self):
+        resolver = PermissionResolver(self.invitee)
+        with self.assertNumQueries(1):
+            resolver.load(self.planning_areas.values())
+        with self.assertNumQueries(0):
+            for planning_area in self.planning_areas.values():
+                resolver.has_permission(planning_area, "view_planningarea")
+                resolver.get_permissions(planning_area)
+
+    def test_has_permission_uses_the_attached_resolver(self):
+        planning_area = self.planning_areas[Role.VIEWER]
+        attach_permission_resolver(self.invitee)
+        self.assertTrue(has_permission(self.invitee, planning_area, "view_scenario"))
+
+        UserObjectRole.objects.filter(object_pk=planning_area.pk).delete()
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                has_permission(self.invitee, planning_area, "view_scenario")
+            )
+
+        detach_permission_resolver(self.invitee)
+        self.assertFalse(has_permission(self.invitee, planning_area, "view_scenario"))
@@ -1,8 +1,11 @@
-from typing import Any, Union
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple, Union
 
 from climate_foresight.models import ClimateForesightRun
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Model, Q
 from planning.models import PlanningArea, PlanningAreaNote, Scenario
 
 from collaboration.models import Permissions, Role, UserObjectRole
@@ -11,10 +14,15 @@ TCreatable = Union[PlanningArea, PlanningAreaNote, Scenario, ClimateForesightRun
 
 
 def is_creator(user: AbstractUser, instance: TCreatable) -> bool:
-    if hasattr(instance, "user"):
-        return instance.user == user
+    user_pk = getattr(user, "pk", None)
+    if user_pk is None:
+        return False
+
+    # compare ids, so the related user is never fetched
+    if hasattr(instance, "user_id"):
+        return instance.user_id == user_pk
 
-    return instance.created_by == user
+    return instance.created_by_id == user_pk
 
 
 def check_for_owner_permission(user_id: int, model: Any, permission_name: str) -> bool:
@@ -48,3 +56,122 @@ def check_for_permission(user_id: int, model: Any, permission_name: str) -> bool
         return True
     except (UserObjectRole.DoesNotExist, Permissions.DoesNotExist):
         return False
+
+
+@lru_cache(maxsize=None)
+def get_role_permissions() -> Dict[str, FrozenSet[str]]:
+    """
+    Permissions of every role. They only change through migrations, so they
+    are loaded once per process; saving or deleting a `Permissions` row
+    clears the cache (see `CollaborationConfig`).
+    """
+    role_permissions: Dict[str, Set[str]] = defaultdict(set)
+    for role, permission in Permissions.objects.values_list("role", "permission"):
+        role_permissions[role].add(permission)
+    return {
+        role: frozenset(permissions) for role, permissions in role_permissions.items()
+    }
+
+
+def clear_role_permissions(**kwargs) -> None:
+    get_role_permissions.cache_clear()
+
+
+class PermissionResolver:
+    """
+    Answers the permission checks of `user` during a request.
+
+    The roles of the user are loaded for many objects in a single query with
+    `load`, or one object at a time the first time it is checked, and are
+    kept for the lifetime of the resolver, so it must not outlive the
+    request it was created for.
+    """
+
+    def __init__(self, user: AbstractUser):
+        self.user = user
+        self._roles: Dict[Tuple[int, int], Optional[str]] = {}
+
+    def _key(self, instance: Model) -> Tuple[int, int]:
+        return ContentType.objects.get_for_model(instance).pk, instance.pk
+
+    def load(self, instances: Iterable[Model]) -> None:
+        keys = {self._key(instance) for instance in instances} - self._roles.keys()
+        if not keys:
+            return
+        for key in keys:
+            self._roles[key] = None
+        if getattr(self.user, "pk", None) is None:
+            return
+
+        object_pks: Dict[int, List[int]] = defaultdict(list)
+        for content_type_id, object_pk in keys:
+            object_pks[content_type_id].append(object_pk)
+        objects = Q()
+        for content_type_id, pks in object_pks.items():
+            objects |= Q(content_type_id=content_type_id, object_pk__in=pks)
+
+        object_roles = (
+            UserObjectRole.objects.filter(objects, collaborator_id=self.user.pk)
+            .order_by("-pk")
+            .values_list("content_type_id", "object_pk", "role")
+        )
+        # the oldest role wins when there are several for an object
+        for content_type_id, object_pk, role in object_roles:
+            self._roles[(content_type_id, object_pk)] = role
+
+    def role(self, instance: Model) -> Optional[str]:
+        """Collaboration role of the user on `instance`, if invited."""
+        key = self._key(instance)
+        if key not in self._roles:
+            self.load([instance])
+        return self._roles[key]
+
+    def has_permission(self, instance: Model, permission_name: str) -> bool:
+        """Same answer as `check_for_permission`, without queries once loaded."""
+        role = self.role(instance)
+        if role is None:
+            return False
+        return permission_name in get_role_permissions().get(role, frozenset())
+
+    def get_role(self, instance: Model) -> Union[str, bool]:
+        """Same answer as `collaboration.services.get_role`."""
+        if isinstance(instance, PlanningArea) and is_creator(self.user, instance):
+            return "Creator"
+        return self.role(instance) or False
+
+    def get_permissions(self, instance: Model) -> List[str]:
+        """Same answer as `collaboration.services.get_permissions`."""
+        role = self.get_role(instance)
+        if not role:
+            return []
+        if role == "Creator":
+            role = Role.OWNER
+        return sorted(get_role_permissions().get(role, frozenset()))
+
+
+def attach_permission_resolver(user: AbstractUser) -> PermissionResolver:
+    """
+    Gives `user` a new `PermissionResolver`, used by `has_permission` until
+    it is detached.
+    """
+    resolver = PermissionResolver(user)
+    user._permission_resolver = resolver
+    return resolver
+
+
+def detach_permission_resolver(user: AbstractUser) -> None:
+    user.__dict__.pop("_permission_resolver", None)
+
+
+def get_permission_resolver(user: AbstractUser) -> Optional[PermissionResolver]:
+    return getattr(user, "_permission_resolver", None)
+
+
+def has_permission(user: AbstractUser, model: Any, permission_name: str) -> bool:
+    """
+    `check_for_permission` through the resolver attached to `user`, if any.
+    """
+    resolver = get_permission_resolver(user)
+    if resolver is None:
+        return check_for_permission(getattr(user, "pk", None), model, permission_name)
+    return resolver.has_permission(model, permission_name)
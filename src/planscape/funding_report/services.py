@@ -1,9 +1,12 @@
 import json
 import logging
 import re
-import tempfile
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 from uuid import uuid4
@@ -24,17 +27,22 @@ from django.contrib.auth import get_user_model
 from django.contrib.gis.db.models import Union as UnionOp
 from django.contrib.gis.geos import GEOSGeometry
 from fiona.crs import from_epsg
-from gis.core import fetch_geometry_type, get_layer_info, with_vsi_prefix
+from gis.core import fetch_geometry_type, with_vsi_prefix
+from gis.coverage import coverage_fraction
 from gis.geometry import maybe_transform
 from gis.info import get_gdal_env
-from gis.io import detect_mimetype
-from gis.rasters import to_cog_streaming
+from gis.rasters import clip_to_cog
 from planning.models import GeoPackageStatus, ProjectArea, Scenario
 from planning.services import get_acreage, map_property_for_numeric_export
 from pyproj import Geod, Transformer
-from rasterio.features import geometry_mask
+from rasterio.crs import CRS
+from rasterio.enums import MergeAlg
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask, geometry_window, rasterize
 from rasterio.mask import mask
-from shapely.geometry import Polygon, shape
+from rasterio.transform import Affine
+from rasterio.windows import Window
+from rasterio.windows import union as union_windows
 from utils.geometry import to_multi
 
 from funding_report.models import (
@@ -270,33 +278,71 @@ def _datalayer_path(datalayer: DataLayer) -> str:
     return with_vsi_prefix(datalayer.url)
 
 
-def _pixel_area_acres(
-    transform,
-    row: int,
-    to_lonlat: Transformer | None,
-) -> float:
+_GEOD = Geod(ellps="WGS84")
+
+
+@lru_cache(maxsize=256)
+def _row_pixel_areas_acres(transform: Affine, crs_wkt: str, height: int) -> np.ndarray:
     """
-    Geodesic ground area (in acres) of one raster pixel in row `row`. Pixel
-    corners are read straight from the raster's own transform - whatever its
-    native resolution actually is - then converted to lon/lat (if not already
+    Geodesic ground area (in acres) of one raster pixel in each of the
+    `height` rows of a raster (or window) with `transform`. Pixel corners
+    are read straight from the raster's own transform - whatever its native
+    resolution actually is - then converted to lon/lat (if not already
     geographic) so the area reflects true ground distance. This matters for
     CRSs like EPSG:3857 (Web Mercator), which is conformal but not
     equal-area: its scale factor grows with latitude, so treating its
     "meters" as ground meters silently inflates area away from the equator.
+
+    All corners are transformed with one vectorized call and the vector is
+    memoized per (transform, CRS, height). It is called with the transform
+    of the whole raster (see `_row_areas_acres`), so every project area,
+    metric and year that reads a window of the same raster reuses it.
     """
-    corners = [
-        transform * (0, row),
-        transform * (1, row),
-        transform * (1, row + 1),
-        transform * (0, row + 1),
-    ]
-    if to_lonlat is not None:
-        corners = [to_lonlat.transform(x, y) for x, y in corners]
-    lons = [corner[0] for corner in corners]
-    lats = [corner[1] for corner in corners]
-    geod = Geod(ellps="WGS84")
-    area_sq_meters, _perimeter = geod.polygon_area_perimeter(lons, lats)
-    return abs(area_sq_meters) / settings.CONVERSION_SQM_ACRES
+    cols = np.broadcast_to(np.array([0.0, 1.0, 1.0, 0.0]), (height, 4))
+    rows = np.arange(height, dtype=float)[:, None] + np.array([0.0, 0.0, 1.0, 1.0])
+    xs, ys = transform * (cols, rows)
+    crs = CRS.from_wkt(crs_wkt)
+    if not crs.is_geographic:
+        to_lonlat = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+        xs, ys = to_lonlat.transform(xs, ys)
+    areas = np.fromiter(
+        (
+            abs(_GEOD.polygon_area_perimeter(lons, lats)[0])
+            for lons, lats in zip(xs, ys)
+        ),
+        dtype=float,
+        count=height,
+    )
+    areas /= settings.CONVERSION_SQM_ACRES
+    areas.setflags(write=False)
+    return areas
+
+
+def _row_areas_acres(
+    src: rasterio.DatasetReader,
+    transform: Affine,
+    height: int,
+) -> np.ndarray:
+    """
+    Pixel areas of the `height` rows of the window of `src` with `transform`,
+    sliced from the row areas of the whole raster. Falls back to the window
+    itself when it isn't a row-aligned window inside the raster.
+    """
+    crs_wkt = src.crs.to_wkt()
+    full = src.transform
+    row_off = (transform.f - full.f) / full.e
+    start = int(round(row_off))
+    if (
+        full.b == 0
+        and full.d == 0
+        and (transform.a, transform.b, transform.d, transform.e)
+        == (full.a, full.b, full.d, full.e)
+        and abs(row_off - start) < 1e-6
+        and 0 <= start
+        and start + height <= src.height
+    ):
+        return _row_pixel_areas_acres(full, crs_wkt, src.height)[start : start + height]
+    return _row_pixel_areas_acres(transform, crs_wkt, height)
 
 
 def _selected_pixel_area_acres(
@@ -306,16 +352,8 @@ def _selected_pixel_area_acres(
 ) -> float:
     if not selected_pixels.any():
         return 0.0
-    to_lonlat = (
-        None
-        if src.crs and src.crs.is_geographic
-        else Transformer.from_crs(src.crs, "EPSG:4326", always_xy=True)
-    )
-    rows, counts = np.unique(np.where(selected_pixels)[0], return_counts=True)
-    return sum(
-        int(count) * _pixel_area_acres(transform, int(row), to_lonlat)
-        for row, count in zip(rows, counts)
-    )
+    row_areas = _row_areas_acres(src, transform, selected_pixels.shape[0])
+    return float(np.dot(np.count_nonzero(selected_pixels, axis=1), row_areas))
 
 
 def _row_weighted_biomass_total(
@@ -326,37 +364,28 @@ def _row_weighted_biomass_total(
 ) -> float:
     """
     Sums `values` over `selected` pixels, weighting each row's contribution
-    by that row's true geodesic pixel area (see `_pixel_area_acres`) instead
-    of a nominal per-pixel acreage constant - the same approach used for
-    treatment pixel areas via `_selected_pixel_area_acres`, but weighting by
-    each row's summed value rather than its pixel count.
+    by that row's true geodesic pixel area (see `_row_pixel_areas_acres`)
+    instead of a nominal per-pixel acreage constant - the same approach used
+    for treatment pixel areas via `_selected_pixel_area_acres`, but weighting
+    by each row's summed value rather than its pixel count.
     """
     if not selected.any():
         return 0.0
-    to_lonlat = (
-        None
-        if src.crs and src.crs.is_geographic
-        else Transformer.from_crs(src.crs, "EPSG:4326", always_xy=True)
-    )
-    total = 0.0
-    for row in np.unique(np.where(selected)[0]):
-        row = int(row)
-        row_sum = float(values[row][selected[row]].sum())
-        total += row_sum * _pixel_area_acres(transform, row, to_lonlat)
-    return total
+    row_areas = _row_areas_acres(src, transform, selected.shape[0])
+    row_sums = np.where(selected, values, 0.0).sum(axis=1)
+    return float(np.dot(row_sums, row_areas))
 
 
 def _fractional_pixel_contributions(
     pixels: np.ma.MaskedArray,
-    touched_by_geometry: np.ndarray,
+    coverage: np.ndarray,
     src: rasterio.DatasetReader,
     transform,
-    project_geometry: Polygon,
 ) -> Dict[Optional[int], float]:
     """
-    Area-weighted acres per raster value for every pixel touched by
-    `project_geometry`, keyed by the pixel's integer value (or None for a
-    touched pixel with no raster data - i.e. "no treatment").
+    Area-weighted acres per raster value for every pixel covered by the
+    project geometry, keyed by the pixel's integer value (or None for a
+    covered pixel with no raster data - i.e. "no treatment").
 
     Whole-pixel inclusion (count each touched pixel's full area) only
     approximates true polygon area when pixels are small relative to the
@@ -364,42 +393,29 @@ def _fractional_pixel_contributions(
     exceeds the size of a project area, a single pixel that only clips a
     small corner of the polygon would otherwise still contribute its full
     area - this instead weights each pixel's contribution by the actual
-    fraction of it that overlaps the polygon.
+    fraction of it that overlaps the polygon (`coverage`, see
+    `gis.coverage.coverage_fraction`).
     """
     contributions: Dict[Optional[int], float] = defaultdict(float)
-    if not touched_by_geometry.any():
+    covered = coverage > 0
+    if not covered.any():
         return contributions
 
-    to_lonlat = (
-        None
-        if src.crs and src.crs.is_geographic
-        else Transformer.from_crs(src.crs, "EPSG:4326", always_xy=True)
-    )
+    row_areas = _row_areas_acres(src, transform, pixels.shape[0])
+    acres = coverage.astype(float) * row_areas[:, None]
     data_mask = np.ma.getmaskarray(pixels)
-    raw_values = pixels.filled(0)
-    pixel_area_cache: Dict[int, float] = {}
-
-    for row, col in zip(*np.where(touched_by_geometry)):
-        row, col = int(row), int(col)
-        pixel_polygon = Polygon(
-            [
-                transform * (col, row),
-                transform * (col + 1, row),
-                transform * (col + 1, row + 1),
-                transform * (col, row + 1),
-            ]
-        )
-        if pixel_polygon.area <= 0:
-            continue
-        fraction = pixel_polygon.intersection(project_geometry).area / pixel_polygon.area
-        if fraction <= 0:
-            continue
 
-        if row not in pixel_area_cache:
-            pixel_area_cache[row] = _pixel_area_acres(transform, row, to_lonlat)
+    no_data = covered & data_mask
+    if no_data.any():
+        contributions[None] += float(acres[no_data].sum())
 
-        key = None if data_mask[row, col] else int(raw_values[row, col])
-        contributions[key] += pixel_area_cache[row] * fraction
+    with_data = covered & ~data_mask
+    values, inverse = np.unique(
+        pixels.data[with_data].astype(np.int64), return_inverse=True
+    )
+    totals = np.bincount(inverse, weights=acres[with_data], minlength=values.size)
+    for value, total in zip(values, totals):
+        contributions[int(value)] += float(total)
 
     return contributions
 
@@ -557,6 +573,475 @@ def calculate_project_area_delta(
     }
 
 
+def _project_area_error(
+    project_area: ProjectArea,
+    metric: str,
+    year: int,
+    error: str,
+) -> Dict[str, Any]:
+    return {
+        "error": error,
+        "project_id": project_area.pk,
+        "proj_id": (project_area.data or {}).get("proj_id"),
+        "variable": metric,
+        "year": year,
+    }
+
+
+def _rasterize_project_areas(
+    geometries: List[Dict[str, Any]],
+    out_shape: Tuple[int, int],
+    transform,
+) -> np.ndarray | List[np.ndarray]:
+    """
+    Burns every project area geometry into a single label array, where pixel
+    value `i` (1-based) means the pixel center falls inside `geometries[i - 1]`
+    and 0 means it falls in none of them. Pixels are selected exactly like
+    `rasterio.mask.mask` does for a single geometry (pixel centers, not
+    all touched). If project areas overlap on any pixel a label array can't
+    represent them, so one boolean mask per geometry is returned instead.
+    """
+    coverage = rasterize(
+        ((geometry, 1) for geometry in geometries),
+        out_shape=out_shape,
+        transform=transform,
+        fill=0,
+        dtype="uint16",
+        merge_alg=MergeAlg.add,
+    )
+    if coverage.max(initial=0) <= 1:
+        return rasterize(
+            ((geometry, label) for label, geometry in enumerate(geometries, start=1)),
+            out_shape=out_shape,
+            transform=transform,
+            fill=0,
+            dtype="int32",
+        )
+    return [
+        geometry_mask(
+            [geometry],
+            out_shape=out_shape,
+            transform=transform,
+            invert=True,
+        )
+        for geometry in geometries
+    ]
+
+
+def _sum_by_project_area(
+    project_area_pixels: np.ndarray | List[np.ndarray],
+    selected: np.ndarray,
+    weights: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Group-by sum of `weights` (or pixel counts, if no weights are given) over
+    the `selected` pixels of every project area returned by
+    `_rasterize_project_areas`, in the same order as the geometries.
+    """
+    if isinstance(project_area_pixels, np.ndarray):
+        return np.bincount(
+            project_area_pixels[selected],
+            weights=None if weights is None else weights[selected],
+            minlength=int(project_area_pixels.max(initial=0)) + 1,
+        )[1:].astype(float)
+    return np.array(
+        [
+            float(
+                np.count_nonzero(selected & pixels)
+                if weights is None
+                else weights[selected & pixels].sum()
+            )
+            for pixels in project_area_pixels
+        ]
+    )
+
+
+def _calculate_project_areas_delta_one_by_one(
+    project_areas: List[ProjectArea],
+    metric: str,
+    year: int,
+    datalayer_lookup: Dict[Tuple[str, int, bool], DataLayer],
+    intervals: List[Tuple[float, float]],
+) -> List[Dict[str, Any]]:
+    if metric != FundingReportMetric.TOTAL_FLAME_SEVERITY:
+        intervals = intervals[:1]
+    results = []
+    for project_area in project_areas:
+        for from_ft, to_ft in intervals:
+            try:
+                results.append(
+                    calculate_project_area_delta(
+                        project_area=project_area,
+                        metric=metric,
+                        year=year,
+                        datalayer_lookup=datalayer_lookup,
+                        from_ft=from_ft,
+                        to_ft=to_ft,
+                    )
+                )
+            except ValueError as exc:
+                results.append(
+                    _project_area_error(project_area, metric, year, str(exc))
+                )
+    return results
+
+
+def calculate_project_areas_delta(
+    project_areas: List[ProjectArea],
+    metric: str,
+    year: int,
+    datalayer_lookup: Dict[Tuple[str, int, bool], DataLayer] | None = None,
+    intervals: Iterable[Tuple[float, float]] | None = None,
+) -> List[Dict[str, Any]]:
+    """
+    Calculates the same results `calculate_project_area_delta` does for
+    every project area in `project_areas` (and, for TOTAL_FLAME_SEVERITY,
+    every flame length interval), but reads the baseline and value rasters
+    once over the union window of all project areas and aggregates them with
+    vectorized group-by reductions over a project area label array.
+
+    Project areas that don't overlap the rasters are returned as error
+    entries, the same ones `async_calculate_funding_report_delta` reports.
+    """
+    datalayer_lookup = datalayer_lookup or build_datalayer_lookup()
+    baseline_layer = _get_datalayer(datalayer_lookup, metric, year, baseline=True)
+    value_layer = _get_datalayer(datalayer_lookup, metric, year, baseline=False)
+    intervals = list(
+        intervals
+        or (
+            (
+                FLAME_LENGTH_REDUCTION_DEFAULT_FROM_FT,
+                FLAME_LENGTH_REDUCTION_DEFAULT_TO_FT,
+            ),
+        )
+    )
+
+    results: List[Dict[str, Any]] = []
+    with rasterio.open(_datalayer_path(baseline_layer)) as baseline_src:
+        with rasterio.open(_datalayer_path(value_layer)) as value_src:
+            if baseline_src.crs != value_src.crs:
+                raise ValueError(
+                    "Funding report baseline and value rasters must share the same CRS."
+                )
+            raster_srid = baseline_src.crs.to_epsg()
+            if raster_srid is None:
+                raise ValueError(
+                    f"Raster CRS {baseline_src.crs} does not resolve to an EPSG SRID."
+                )
+            if (
+                baseline_src.transform != value_src.transform
+                or baseline_src.shape != value_src.shape
+            ):
+                # the union window can only be shared by aligned rasters
+                return _calculate_project_areas_delta_one_by_one(
+                    project_areas=project_areas,
+                    metric=metric,
+                    year=year,
+                    datalayer_lookup=datalayer_lookup,
+                    intervals=intervals,
+                )
+
+            overlapping: List[ProjectArea] = []
+            geometries: List[Dict[str, Any]] = []
+            for project_area in project_areas:
+                geometry = json.loads(
+                    maybe_transform(project_area.geometry, raster_srid).geojson
+                )
+                try:
+                    geometry_window(baseline_src, [geometry])
+                except WindowError:
+                    results.append(
+                        _project_area_error(
+                            project_area,
+                            metric,
+                            year,
+                            "Input shapes do not overlap raster.",
+                        )
+                    )
+                    continue
+                overlapping.append(project_area)
+                geometries.append(geometry)
+
+            if not overlapping:
+                return results
+
+            window = geometry_window(baseline_src, geometries)
+            transform = baseline_src.window_transform(window)
+            baseline_pixels = baseline_src.read(1, window=window, masked=True)
+            value_pixels = value_src.read(1, window=window, masked=True)
+
+        project_area_pixels = _rasterize_project_areas(
+            geometries, baseline_pixels.shape, transform
+        )
+        valid_mask = _valid_pixel_mask(baseline_pixels, value_pixels)
+
+        if metric == FundingReportMetric.TOTAL_FLAME_SEVERITY:
+            row_acres = _row_areas_acres(
+                baseline_src, transform, baseline_pixels.shape[0]
+            )
+            pixel_acres = np.broadcast_to(row_acres[:, None], baseline_pixels.shape)
+            baseline_values = baseline_pixels.filled(np.nan)
+            value_values = value_pixels.filled(np.nan)
+            project_area_acres = [
+                get_acreage(project_area.geometry) for project_area in overlapping
+            ]
+            for from_ft, to_ft in intervals:
+                reduced_acres = _sum_by_project_area(
+                    project_area_pixels,
+                    valid_mask & (baseline_values >= from_ft) & (value_values <= to_ft),
+                    pixel_acres,
+                )
+                for project_area, total_acres, reduced in zip(
+                    overlapping, project_area_acres, reduced_acres
+                ):
+                    results.append(
+                        {
+                            "variable": metric,
+                            "project_id": project_area.pk,
+                            "proj_id": (project_area.data or {}).get("proj_id"),
+                            "year": year,
+                            "value": float(reduced),
+                            "baseline": total_acres,
+                            "delta": (
+                                reduced / total_acres * 100 if total_acres else 0.0
+                            ),
+                            "interval": {"from": from_ft, "to": to_ft},
+                        }
+                    )
+            return results
+
+        counts = _sum_by_project_area(project_area_pixels, valid_mask)
+        baseline_sums = _sum_by_project_area(
+            project_area_pixels, valid_mask, baseline_pixels.data.astype(float)
+        )
+        value_sums = _sum_by_project_area(
+            project_area_pixels, valid_mask, value_pixels.data.astype(float)
+        )
+        for project_area, count, baseline_sum, value_sum in zip(
+            overlapping, counts, baseline_sums, value_sums
+        ):
+            aggregates = (
+                {
+                    "value": float(value_sum),
+                    "baseline": float(baseline_sum),
+                    "delta": calculate_percent_delta(
+                        float(value_sum), float(baseline_sum)
+                    ),
+                }
+                if count
+                else {"value": None, "baseline": None, "delta": None}
+            )
+            results.append(
+                {
+                    "variable": metric,
+                    "project_id": project_area.pk,
+                    "proj_id": (project_area.data or {}).get("proj_id"),
+                    "year": year,
+                    **aggregates,
+                }
+            )
+    return results
+
+
+@dataclass
+class ProjectAreaRasterWindow:
+    """
+    The pixels of one raster under one project area - the window
+    `rasterio.mask.mask(..., crop=True)` would read - sliced out of the
+    raster's union window read by `sweep_project_areas`.
+    """
+
+    src: rasterio.DatasetReader
+    geometry: Dict[str, Any]
+    pixels: np.ma.MaskedArray
+    transform: Affine
+
+    def masked(self, all_touched: bool = False) -> np.ma.MaskedArray:
+        """Pixels masked like `rasterio.mask.mask(..., filled=False)` does."""
+        outside = geometry_mask(
+            [self.geometry],
+            out_shape=self.pixels.shape,
+            transform=self.transform,
+            all_touched=all_touched,
+        )
+        return np.ma.array(
+            self.pixels.data, mask=np.ma.getmaskarray(self.pixels) | outside
+        )
+
+
+class ProjectAreaAccumulator:
+    """
+    A per-metric reduction fed by `sweep_project_areas`. `roles` name the
+    rasters it needs, `add` is called once per project area with the windows
+    of those rasters (None where the project area doesn't overlap a raster)
+    and `result` returns the metric's report entry.
+    """
+
+    kind: str = ""
+    roles: Tuple[str, ...] = ()
+
+    def add(
+        self,
+        project_area: ProjectArea,
+        windows: Dict[str, Optional[ProjectAreaRasterWindow]],
+    ) -> None:
+        raise NotImplementedError
+
+    def result(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+def _project_area_window(
+    src: rasterio.DatasetReader, geometry: Dict[str, Any]
+) -> Optional[Window]:
+    try:
+        return geometry_window(src, [geometry])
+    except WindowError:
+        return None
+
+
+def _read_union_window(
+    src: rasterio.DatasetReader,
+    windows: List[Optional[Window]],
+) -> Tuple[Optional[Window], Optional[np.ma.MaskedArray]]:
+    overlapping = [window for window in windows if window is not None]
+    if not overlapping:
+        return None, None
+    window = union_windows(*overlapping)
+    return window, src.read(1, window=window, masked=True)
+
+
+def sweep_project_areas(
+    project_areas: List[ProjectArea],
+    layers: Dict[str, DataLayer],
+    accumulators: List[ProjectAreaAccumulator],
+    max_workers: Optional[int] = None,
+    isolate_failures: bool = False,
+) -> Dict[str, Exception]:
+    """
+    Visits every project area once, handing each accumulator the windows of
+    the rasters (`layers`, keyed by role) it needs.
+
+    Every raster is read exactly once, over the union window of all project
+    areas, and the reads of different rasters run concurrently in a thread
+    pool (each dataset is only ever used by one thread), so the remote reads
+    of a report scale with the number of rasters instead of rasters x
+    project areas x metrics.
+
+    By default the first error is raised. With `isolate_failures`, a raster
+    that can't be opened or read only fails the accumulators that need its
+    role, an accumulator that raises stops being fed, and the errors are
+    returned keyed by the failed accumulators' kind.
+    """
+    role_failures: Dict[str, Exception] = {}
+    failures: Dict[str, Exception] = {}
+
+    def _fail(failed: Dict[str, Exception], key: str, exc: Exception) -> None:
+        if not isolate_failures:
+            raise
+        log.exception("Project area sweep failed for %s.", key)
+        failed[key] = exc
+
+    roles = {role for accumulator in accumulators for role in accumulator.roles}
+    with ExitStack() as stack:
+        sources: Dict[str, rasterio.DatasetReader] = {}
+        geometries: Dict[str, List[Dict[str, Any]]] = {}
+        windows: Dict[str, List[Optional[Window]]] = {}
+        for role in roles:
+            try:
+                src = stack.enter_context(rasterio.open(_datalayer_path(layers[role])))
+                raster_srid = src.crs.to_epsg() if src.crs else None
+                if raster_srid is None:
+                    raise ValueError(
+                        f"Raster CRS {src.crs} does not resolve to an EPSG SRID."
+                    )
+                geometries[role] = [
+                    json.loads(
+                        maybe_transform(project_area.geometry, raster_srid).geojson
+                    )
+                    for project_area in project_areas
+                ]
+                windows[role] = [
+                    _project_area_window(src, geometry) for geometry in geometries[role]
+                ]
+                sources[role] = src
+            except Exception as exc:
+                _fail(role_failures, role, exc)
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(sources) or 1) as pool:
+            futures = {
+                role: pool.submit(_read_union_window, sources[role], windows[role])
+                for role in sources
+            }
+            union = {}
+            for role, future in futures.items():
+                try:
+                    union[role] = future.result()
+                except Exception as exc:
+                    _fail(role_failures, role, exc)
+
+        active: List[ProjectAreaAccumulator] = []
+        for accumulator in accumulators:
+            failed_roles = [role for role in accumulator.roles if role in role_failures]
+            if failed_roles:
+                failures[accumulator.kind] = role_failures[failed_roles[0]]
+            else:
+                active.append(accumulator)
+
+        for index, project_area in enumerate(project_areas):
+            project_area_windows: Dict[str, Optional[ProjectAreaRasterWindow]] = {}
+            for role in union:
+                src = sources[role]
+                window = windows[role][index]
+                union_window, union_pixels = union[role]
+                if window is None:
+                    project_area_windows[role] = None
+                    continue
+                row = int(window.row_off - union_window.row_off)
+                col = int(window.col_off - union_window.col_off)
+                project_area_windows[role] = ProjectAreaRasterWindow(
+                    src=src,
+                    geometry=geometries[role][index],
+                    pixels=union_pixels[
+                        row : row + int(window.height),
+                        col : col + int(window.width),
+                    ],
+                    transform=src.window_transform(window),
+                )
+            for accumulator in list(active):
+                try:
+                    accumulator.add(
+                        project_area,
+                        {
+                            role: project_area_windows[role]
+                            for role in accumulator.roles
+                        },
+                    )
+                except Exception as exc:
+                    _fail(failures, accumulator.kind, exc)
+                    active.remove(accumulator)
+    return failures
+
+
+def _aet_improved_acres(
+    delta_pixels: np.ma.MaskedArray,
+    percentage: float,
+    src: rasterio.DatasetReader,
+    transform,
+) -> float:
+    delta_pixels = np.ma.array(delta_pixels, dtype=float)
+    pixel_mask = np.ma.getmaskarray(delta_pixels)
+    delta_values = delta_pixels.filled(np.nan)
+    selected_pixels = (
+        ~pixel_mask & np.isfinite(delta_values) & (delta_values >= percentage)
+    )
+    return _selected_pixel_area_acres(
+        selected_pixels=selected_pixels,
+        src=src,
+        transform=transform,
+    )
+
+
 def calculate_project_area_aet_improvement(
     project_area: ProjectArea,
     percentage: float,
@@ -577,75 +1062,90 @@ def calculate_project_area_aet_improvement(
         # project area does not overlap the AET delta raster
         return 0.0
 
-    delta_pixels = np.ma.array(delta_data[0], dtype=float)
-    pixel_mask = np.ma.getmaskarray(delta_pixels)
-    delta_values = delta_pixels.filled(np.nan)
-    selected_pixels = (
-        ~pixel_mask & np.isfinite(delta_values) & (delta_values >= percentage)
-    )
-    return _selected_pixel_area_acres(
-        selected_pixels=selected_pixels,
+    return _aet_improved_acres(
+        delta_pixels=delta_data[0],
+        percentage=percentage,
         src=delta_src,
         transform=delta_transform,
     )
 
 
+class AETImprovementAccumulator(ProjectAreaAccumulator):
+    kind = "aet_improvement"
+    roles = (AET_PERCENTUAL_ROLE,)
+
+    def __init__(self, percentage: float, planning_area_acres: float):
+        self.percentage = percentage
+        self.planning_area_acres = planning_area_acres
+        self.project_area_results: List[Dict[str, Any]] = []
+
+    def add(self, project_area, windows):
+        window = windows[AET_PERCENTUAL_ROLE]
+        total_acres = get_acreage(project_area.geometry)
+        improved_acres = (
+            _aet_improved_acres(
+                delta_pixels=window.masked(),
+                percentage=self.percentage,
+                src=window.src,
+                transform=window.transform,
+            )
+            # project area does not overlap the AET delta raster
+            if window is not None
+            else 0.0
+        )
+        self.project_area_results.append(
+            {
+                "project_id": project_area.pk,
+                "improved_acres": improved_acres,
+                "total_acres": total_acres,
+                "improved_area_percent": (
+                    improved_acres / total_acres * 100 if total_acres else 0.0
+                ),
+            }
+        )
+
+    def result(self):
+        total_project_area_acres = sum(
+            result["total_acres"] for result in self.project_area_results
+        )
+        improved_acres = sum(
+            result["improved_acres"] for result in self.project_area_results
+        )
+        improved_area_percent = (
+            improved_acres / self.planning_area_acres * 100
+            if self.planning_area_acres
+            else 0.0
+        )
+        return {
+            "percentage": self.percentage,
+            "improved_acres": improved_acres,
+            "total_project_area_acres": total_project_area_acres,
+            "planning_area_acres": self.planning_area_acres,
+            "improved_area_percent": improved_area_percent,
+            "project_areas": self.project_area_results,
+        }
+
+
 def calculate_aet_improvement(
     report: FundingOpportunityReport, percentage: float
 ) -> Dict[str, Any]:
     report = FundingOpportunityReport.objects.select_related(
         "scenario", "scenario__planning_area"
     ).get(pk=report.pk)
-    project_areas = list(report.scenario.project_areas.all())
-    planning_area_acres = get_acreage(report.scenario.planning_area.geometry)
     percentual_layer = get_aet_percentual_datalayer()
     if percentual_layer is None:
         raise ValueError("Missing funding report AET percentual datalayer.")
 
-    with rasterio.open(_datalayer_path(percentual_layer)) as delta_src:
-        raster_srid = delta_src.crs.to_epsg() if delta_src.crs else None
-        if raster_srid is None:
-            raise ValueError(
-                f"Raster CRS {delta_src.crs} does not resolve to an EPSG SRID."
-            )
-
-        project_area_results = []
-        for project_area in project_areas:
-            total_acres = get_acreage(project_area.geometry)
-            improved_acres = calculate_project_area_aet_improvement(
-                project_area=project_area,
-                percentage=percentage,
-                delta_src=delta_src,
-                raster_srid=raster_srid,
-            )
-            improved_area_percent = (
-                improved_acres / total_acres * 100 if total_acres else 0.0
-            )
-            project_area_results.append(
-                {
-                    "project_id": project_area.pk,
-                    "improved_acres": improved_acres,
-                    "total_acres": total_acres,
-                    "improved_area_percent": improved_area_percent,
-                }
-            )
-
-    total_project_area_acres = sum(
-        result["total_acres"] for result in project_area_results
+    accumulator = AETImprovementAccumulator(
+        percentage=percentage,
+        planning_area_acres=get_acreage(report.scenario.planning_area.geometry),
     )
-    improved_acres = sum(result["improved_acres"] for result in project_area_results)
-    improved_area_percent = (
-        improved_acres / planning_area_acres * 100 if planning_area_acres else 0.0
+    sweep_project_areas(
+        project_areas=list(report.scenario.project_areas.all()),
+        layers={AET_PERCENTUAL_ROLE: percentual_layer},
+        accumulators=[accumulator],
     )
-
-    return {
-        "percentage": percentage,
-        "improved_acres": improved_acres,
-        "total_project_area_acres": total_project_area_acres,
-        "planning_area_acres": planning_area_acres,
-        "improved_area_percent": improved_area_percent,
-        "project_areas": project_area_results,
-    }
+    return accumulator.result()
 
 
 def merge_aet_improvement_into_results(
@@ -679,57 +1179,41 @@ def _clip_metadata(source_metadata: dict | None, role: str) -> dict:
     return metadata
 
 
-def generate_treatment_clip_datalayer(report: FundingOpportunityReport) -> DataLayer:
+def _generate_clip_datalayer(
+    report: FundingOpportunityReport,
+    source: DataLayer,
+    name: str,
+    original_name: str,
+    role: str,
+) -> DataLayer:
     from datasets.tasks import datalayer_uploaded
 
-    source = get_treatment_datalayer()
-    if source is None:
-        raise ValueError("Missing funding report treatment datalayer.")
-
     report = FundingOpportunityReport.objects.select_related("scenario").get(
         pk=report.pk
     )
     scenario = report.scenario
     geometry = get_project_areas_union(scenario)
 
-    with rasterio.open(_datalayer_path(source)) as src:
+    source_path = _datalayer_path(source)
+    with rasterio.open(source_path) as src:
         raster_srid = src.crs.to_epsg() if src.crs else None
         if raster_srid is None:
             raise ValueError(f"Raster CRS {src.crs} does not resolve to an EPSG SRID.")
-        clip_geometry = json.loads(maybe_transform(geometry, raster_srid).geojson)
-        data, transform = mask(src, [clip_geometry], crop=True)
-
-        profile = src.profile.copy()
-        profile.update(
-            {
-                "height": data.shape[1],
-                "width": data.shape[2],
-                "transform": transform,
-            }
-        )
 
-        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-            clipped_path = tmp.name
-        with rasterio.open(clipped_path, "w", **profile) as dst:
-            dst.write(data)
-
-    try:
-        organization = source.organization
-        uuid_value = str(uuid4())
-        original_name = f"funding_report_treatments_scenario_{scenario.pk}.tif"
-        storage_url, storage_path = get_storage_url_and_path(
-            organization_id=organization.pk,
-            uuid=uuid_value,
-            original_name=original_name,
-            mimetype="image/tiff",
-        )
-        to_cog_streaming(input_file=clipped_path, output_file=storage_path or storage_url)
-    finally:
-        Path(clipped_path).unlink(missing_ok=True)
-
-    vsi_output = with_vsi_prefix(storage_url)
-    layer_type, layer_info = get_layer_info(input_file=vsi_output)
-    mimetype = detect_mimetype(input_file=vsi_output) or "image/tiff"
+    organization = source.organization
+    uuid_value = str(uuid4())
+    storage_url, storage_path = get_storage_url_and_path(
+        organization_id=organization.pk,
+        uuid=uuid_value,
+        original_name=original_name,
+        mimetype="image/tiff",
+    )
+    layer_info = clip_to_cog(
+        input_file=source_path,
+        geometry=json.loads(maybe_transform(geometry, raster_srid).geojson),
+        output_file=storage_path or storage_url,
+    )
+    layer_type = DataLayerType.RASTER
     geometry_type = fetch_geometry_type(layer_type=layer_type, info=layer_info)
 
     style_associations = [
@@ -740,7 +1224,7 @@ def generate_treatment_clip_datalayer(report: FundingOpportunityReport) -> DataL
     user_model = get_user_model()
     created_by = user_model.objects.get(email=settings.DEFAULT_ADMIN_EMAIL)
 
-    name = f"Funding Report Treatments - Scenario {scenario.pk}"
+    name = f"{name} - Scenario {scenario.pk}"
     DataLayer.dead_or_alive.filter(dataset=source.dataset, name=name).delete()
 
     datalayer = DataLayer.objects.create(
@@ -758,8 +1242,8 @@ def generate_treatment_clip_datalayer(report: FundingOpportunityReport) -> DataL
         geometry_type=geometry_type,
         geometry=geometry_from_info(layer_info, datalayer_type=layer_type),
         info=layer_info,
-        mimetype=mimetype,
-        metadata=_clip_metadata(source.metadata, TREATMENT_CLIP_ROLE),
+        mimetype="image/tiff",
+        metadata=_clip_metadata(source.metadata, role),
         map_service_type=source.map_service_type,
         status=DataLayerStatus.PENDING,
     )
@@ -778,103 +1262,75 @@ def generate_treatment_clip_datalayer(report: FundingOpportunityReport) -> DataL
     return datalayer
 
 
-def generate_aet_clip_datalayer(report: FundingOpportunityReport) -> DataLayer:
-    from datasets.tasks import datalayer_uploaded
-
-    source = get_aet_percentual_datalayer()
+def generate_treatment_clip_datalayer(report: FundingOpportunityReport) -> DataLayer:
+    source = get_treatment_datalayer()
     if source is None:
-        raise ValueError("Missing funding report AET percentual datalayer.")
+        raise ValueError("Missing funding report treatment datalayer.")
 
-    report = FundingOpportunityReport.objects.select_related("scenario").get(
-        pk=report.pk
+    return _generate_clip_datalayer(
+        report=report,
+        source=source,
+        name="Funding Report Treatments",
+        original_name=f"funding_report_treatments_scenario_{report.scenario_id}.tif",
+        role=TREATMENT_CLIP_ROLE,
     )
-    scenario = report.scenario
-    geometry = get_project_areas_union(scenario)
 
-    with rasterio.open(_datalayer_path(source)) as src:
-        raster_srid = src.crs.to_epsg() if src.crs else None
-        if raster_srid is None:
-            raise ValueError(f"Raster CRS {src.crs} does not resolve to an EPSG SRID.")
-        clip_geometry = json.loads(maybe_transform(geometry, raster_srid).geojson)
-        data, transform = mask(src, [clip_geometry], crop=True)
 
-        profile = src.profile.copy()
-        profile.update(
-            {
-                "height": data.shape[1],
-                "width": data.shape[2],
-                "transform": transform,
-            }
-        )
+def generate_aet_clip_datalayer(report: FundingOpportunityReport) -> DataLayer:
+    source = get_aet_percentual_datalayer()
+    if source is None:
+        raise ValueError("Missing funding report AET percentual datalayer.")
 
-        with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
-            clipped_path = tmp.name
-        with rasterio.open(clipped_path, "w", **profile) as dst:
-            dst.write(data)
+    return _generate_clip_datalayer(
+        report=report,
+        source=source,
+        name="Funding Report AET Percentual",
+        original_name=(
+            f"funding_report_aet_percentual_scenario_{report.scenario_id}.tif"
+        ),
+        role=AET_PERCENTUAL_CLIP_ROLE,
+    )
 
-    try:
-        organization = source.organization
-        uuid_value = str(uuid4())
-        original_name = f"funding_report_aet_percentual_scenario_{scenario.pk}.tif"
-        storage_url, storage_path = get_storage_url_and_path(
-            organization_id=organization.pk,
-            uuid=uuid_value,
-            original_name=original_name,
-            mimetype="image/tiff",
-        )
-        to_cog_streaming(input_file=clipped_path, output_file=storage_path or storage_url)
-    finally:
-        Path(clipped_path).unlink(missing_ok=True)
 
-    vsi_output = with_vsi_prefix(storage_url)
-    layer_type, layer_info = get_layer_info(input_file=vsi_output)
-    mimetype = detect_mimetype(input_file=vsi_output) or "image/tiff"
-    geometry_type = fetch_geometry_type(layer_type=layer_type, info=layer_info)
+class TreatmentAreasAccumulator(ProjectAreaAccumulator):
+    kind = "treatment_areas"
+    roles = (TREATMENT_ROLE,)
 
-    style_associations = [
-        (association.style_id, association.default)
-        for association in source.rel_styles.all()
-    ]
+    def __init__(self):
+        self.projects: Dict[int, Dict[str, float]] = {}
+        self.total: Dict[str, float] = defaultdict(float)
 
-    user_model = get_user_model()
-    created_by = user_model.objects.get(email=settings.DEFAULT_ADMIN_EMAIL)
+    def add(self, project_area, windows):
+        window = windows[TREATMENT_ROLE]
+        if window is None:
+            self.projects[project_area.pk] = {}
+            return
 
-    name = f"Funding Report AET Percentual - Scenario {scenario.pk}"
-    DataLayer.dead_or_alive.filter(dataset=source.dataset, name=name).delete()
+        pixels = window.masked(all_touched=True)
+        contributions = _fractional_pixel_contributions(
+            pixels=pixels,
+            coverage=coverage_fraction(window.geometry, pixels.shape, window.transform),
+            src=window.src,
+            transform=window.transform,
+        )
 
-    datalayer = DataLayer.objects.create(
-        name=name,
-        uuid=uuid_value,
-        dataset=source.dataset,
-        category=source.category,
-        organization=organization,
-        workspace=source.workspace,
-        created_by=created_by,
-        original_name=original_name,
-        url=storage_url,
-        type=layer_type,
-        storage_type=StorageTypeChoices.DATABASE,
-        geometry_type=geometry_type,
-        geometry=geometry_from_info(layer_info, datalayer_type=layer_type),
-        info=layer_info,
-        mimetype=mimetype,
-        metadata=_clip_metadata(source.metadata, AET_PERCENTUAL_CLIP_ROLE),
-        map_service_type=source.map_service_type,
-        status=DataLayerStatus.PENDING,
-    )
-    DataLayerHasStyle.objects.bulk_create(
-        [
-            DataLayerHasStyle(
-                datalayer=datalayer,
-                style_id=style_id,
-                default=default,
+        project_result: Dict[str, float] = {}
+        for value, acres in contributions.items():
+            label = (
+                TREATMENT_NO_TREATMENT_LABEL
+                if value is None
+                else TREATMENT_PIXEL_VALUE_LABELS.get(value, str(value))
             )
-            for style_id, default in style_associations
-        ]
-    )
+            project_result[label] = project_result.get(label, 0.0) + acres
+            self.total[label] += acres
 
-    datalayer_uploaded.delay(datalayer.pk, status=DataLayerStatus.READY)
-    return datalayer
+        self.projects[project_area.pk] = project_result
+
+    def result(self):
+        return {
+            "projects": self.projects,
+            "total": dict(self.total),
+        }
 
 
 def calculate_treatment_pixel_areas(report: FundingOpportunityReport) -> Dict[str, Any]:
@@ -885,61 +1341,13 @@ def calculate_treatment_pixel_areas(report: FundingOpportunityReport) -> Dict[st
     report = FundingOpportunityReport.objects.select_related("scenario").get(
         pk=report.pk
     )
-    project_areas = list(report.scenario.project_areas.all())
-
-    projects: Dict[int, Dict[str, float]] = {}
-    total: Dict[str, float] = defaultdict(float)
-
-    with rasterio.open(_datalayer_path(source)) as src:
-        raster_srid = src.crs.to_epsg() if src.crs else None
-        if raster_srid is None:
-            raise ValueError(f"Raster CRS {src.crs} does not resolve to an EPSG SRID.")
-
-        for project_area in project_areas:
-            geometry = json.loads(
-                maybe_transform(project_area.geometry, raster_srid).geojson
-            )
-            try:
-                data, transform = mask(
-                    src, [geometry], crop=True, filled=False, all_touched=True
-                )
-            except ValueError:
-                projects[project_area.pk] = {}
-                continue
-
-            pixels = data[0]
-            touched_by_geometry = ~geometry_mask(
-                [geometry],
-                out_shape=pixels.shape,
-                transform=transform,
-                invert=False,
-                all_touched=True,
-            )
-
-            contributions = _fractional_pixel_contributions(
-                pixels=pixels,
-                touched_by_geometry=touched_by_geometry,
-                src=src,
-                transform=transform,
-                project_geometry=shape(geometry),
-            )
-
-            project_result: Dict[str, float] = {}
-            for value, acres in contributions.items():
-                label = (
-                    TREATMENT_NO_TREATMENT_LABEL
-                    if value is None
-                    else TREATMENT_PIXEL_VALUE_LABELS.get(value, str(value))
-                )
-                project_result[label] = project_result.get(label, 0.0) + acres
-                total[label] += acres
-
-            projects[project_area.pk] = project_result
-
-    return {
-        "projects": projects,
-        "total": dict(total),
-    }
+    accumulator = TreatmentAreasAccumulator()
+    sweep_project_areas(
+        project_areas=list(report.scenario.project_areas.all()),
+        layers={TREATMENT_ROLE: source},
+        accumulators=[accumulator],
+    )
+    return accumulator.result()
 
 
 def build_funding_report_results(
@@ -1146,16 +1554,25 @@ def get_biomass_datalayer(role: str) -> DataLayer:
     return datalayers[0]
 
 
-def _extract_biomass_volumes(
-    geometry: Dict[str, Any],
-    merch_src: rasterio.DatasetReader,
-    non_merch_src: rasterio.DatasetReader,
-    wood_type_src: rasterio.DatasetReader,
+def _empty_biomass_volumes() -> Dict[str, float]:
+    empty: Dict[str, float] = {}
+    for name in _BIOMASS_WOOD_TYPES.values():
+        empty[f"merchantable_{name}_bf"] = 0.0
+        empty[f"non_merchantable_{name}_cuft"] = 0.0
+    return empty
+
+
+def _biomass_volumes(
+    merch_pixels: np.ma.MaskedArray,
+    non_merch_pixels: np.ma.MaskedArray,
+    wood_type_pixels: np.ma.MaskedArray,
+    src: rasterio.DatasetReader,
+    transform,
 ) -> Dict[str, float]:
     """
     Computes merch/non-merch wood volume totals per wood type for one
-    project area geometry. Keys: merchantable_{softwood,hardwood,mixed}_bf
-    and non_merchantable_{softwood,hardwood,mixed}_cuft.
+    project area. Keys: merchantable_{softwood,hardwood,mixed}_bf and
+    non_merchantable_{softwood,hardwood,mixed}_cuft.
 
     Raster pixels store per-acre rates (merch in bf/ac, non-merch in
     cuft/ac), so each pixel's value is weighted by that pixel's true
@@ -1163,21 +1580,9 @@ def _extract_biomass_volumes(
     total - the same geodesic-area approach used for treatment pixel areas,
     rather than a nominal per-pixel acreage constant.
     """
-    empty: Dict[str, float] = {}
-    for name in _BIOMASS_WOOD_TYPES.values():
-        empty[f"merchantable_{name}_bf"] = 0.0
-        empty[f"non_merchantable_{name}_cuft"] = 0.0
-
-    try:
-        merch_data, transform = mask(merch_src, [geometry], crop=True, filled=False)
-        non_merch_data, _ = mask(non_merch_src, [geometry], crop=True, filled=False)
-        wt_data, _ = mask(wood_type_src, [geometry], crop=True, filled=False)
-    except ValueError:
-        return empty
-
-    merch_arr = np.ma.array(merch_data[0], dtype=float)
-    non_merch_arr = np.ma.array(non_merch_data[0], dtype=float)
-    wt_arr = np.ma.array(wt_data[0])
+    merch_arr = np.ma.array(merch_pixels, dtype=float)
+    non_merch_arr = np.ma.array(non_merch_pixels, dtype=float)
+    wt_arr = np.ma.array(wood_type_pixels)
 
     wt_nodata = np.ma.getmaskarray(wt_arr)
     wt_raw = wt_arr.filled(0)
@@ -1192,68 +1597,152 @@ def _extract_biomass_volumes(
     for wt_value, wt_name in _BIOMASS_WOOD_TYPES.items():
         wt_match = ~wt_nodata & (wt_raw == wt_value)
         result[f"merchantable_{wt_name}_bf"] = _row_weighted_biomass_total(
-            wt_match & merch_ok, merch_vals, merch_src, transform
+            wt_match & merch_ok, merch_vals, src, transform
         )
         result[f"non_merchantable_{wt_name}_cuft"] = _row_weighted_biomass_total(
-            wt_match & nm_ok, nm_vals, merch_src, transform
+            wt_match & nm_ok, nm_vals, src, transform
         )
 
     return result
 
 
+class BiomassVolumesAccumulator(ProjectAreaAccumulator):
+    kind = "biomass_volumes"
+    roles = (
+        BiomassRole.MERCHANTABLE.value,
+        BiomassRole.NON_MERCHANTABLE.value,
+        BiomassRole.WOOD_TYPE.value,
+    )
+
+    def __init__(self):
+        self.summary = _empty_biomass_volumes()
+        self.project_area_results: List[Dict[str, Any]] = []
+
+    def add(self, project_area, windows):
+        merch = windows[BiomassRole.MERCHANTABLE.value]
+        non_merch = windows[BiomassRole.NON_MERCHANTABLE.value]
+        wood_type = windows[BiomassRole.WOOD_TYPE.value]
+        if merch is None or non_merch is None or wood_type is None:
+            volumes = _empty_biomass_volumes()
+        else:
+            volumes = _biomass_volumes(
+                merch_pixels=merch.masked(),
+                non_merch_pixels=non_merch.masked(),
+                wood_type_pixels=wood_type.masked(),
+                src=merch.src,
+                transform=merch.transform,
+            )
+
+        self.project_area_results.append(
+            {
+                "project_id": project_area.pk,
+                "proj_id": (project_area.data or {}).get("proj_id"),
+                **volumes,
+            }
+        )
+        for key in self.summary:
+            self.summary[key] += volumes.get(key, 0.0)
+
+    def result(self):
+        return {
+            "summary": self.summary,
+            "project_areas": self.project_area_results,
+        }
+
+
+def get_biomass_datalayers() -> Dict[str, DataLayer]:
+    return {
+        role.value: get_biomass_datalayer(role)
+        for role in (
+            BiomassRole.MERCHANTABLE,
+            BiomassRole.NON_MERCHANTABLE,
+            BiomassRole.WOOD_TYPE,
+        )
+    }
+
+
 def calculate_biomass_volumes(report: FundingOpportunityReport) -> Dict[str, Any]:
     report = FundingOpportunityReport.objects.select_related("scenario").get(
         pk=report.pk
     )
-    project_areas = list(report.scenario.project_areas.all())
+    accumulator = BiomassVolumesAccumulator()
+    sweep_project_areas(
+        project_areas=list(report.scenario.project_areas.all()),
+        layers=get_biomass_datalayers(),
+        accumulators=[accumulator],
+    )
+    return accumulator.result()
 
-    merch_layer = get_biomass_datalayer(BiomassRole.MERCHANTABLE)
-    non_merch_layer = get_biomass_datalayer(BiomassRole.NON_MERCHANTABLE)
-    wt_layer = get_biomass_datalayer(BiomassRole.WOOD_TYPE)
 
-    with (
-        rasterio.open(_datalayer_path(merch_layer)) as merch_src,
-        rasterio.open(_datalayer_path(non_merch_layer)) as non_merch_src,
-        rasterio.open(_datalayer_path(wt_layer)) as wt_src,
-    ):
-        raster_srid = merch_src.crs.to_epsg() if merch_src.crs else None
-        if raster_srid is None:
-            raise ValueError(
-                f"Biomass raster CRS {merch_src.crs} does not resolve to an EPSG SRID."
-            )
+def calculate_project_area_metrics(
+    report: FundingOpportunityReport,
+    percentage: float,
+) -> List[Dict[str, Any]]:
+    """
+    Calculates treatment areas, AET improvement and biomass volumes - the
+    results of `calculate_treatment_pixel_areas`, `calculate_aet_improvement`
+    and `calculate_biomass_volumes` - with a single `sweep_project_areas`.
+
+    Returns one entry per metric, tagged with its "kind", or an "error"
+    entry for metrics whose datalayers are missing or fail to be read or
+    reduced - a failing metric doesn't fail the others. Treatment areas are
+    skipped when no treatment datalayer is configured.
+    """
+    report = FundingOpportunityReport.objects.select_related(
+        "scenario", "scenario__planning_area"
+    ).get(pk=report.pk)
+    results: List[Dict[str, Any]] = []
+    layers: Dict[str, DataLayer] = {}
+    accumulators: List[ProjectAreaAccumulator] = []
 
-        accumulated: Dict[str, float] = {
-            f"merchantable_{wt_name}_bf": 0.0
-            for wt_name in _BIOMASS_WOOD_TYPES.values()
-        } | {
-            f"non_merchantable_{wt_name}_cuft": 0.0
-            for wt_name in _BIOMASS_WOOD_TYPES.values()
-        }
+    treatment_layer = get_treatment_datalayer()
+    if treatment_layer is not None:
+        layers[TREATMENT_ROLE] = treatment_layer
+        accumulators.append(TreatmentAreasAccumulator())
 
-        project_area_results = []
-        for project_area in project_areas:
-            geometry = json.loads(
-                maybe_transform(project_area.geometry, raster_srid).geojson
-            )
-            volumes = _extract_biomass_volumes(
-                geometry, merch_src, non_merch_src, wt_src
+    percentual_layer = get_aet_percentual_datalayer()
+    if percentual_layer is None:
+        results.append(
+            {
+                "kind": AETImprovementAccumulator.kind,
+                "error": "Missing funding report AET percentual datalayer.",
+            }
+        )
+    else:
+        try:
+            accumulators.append(
+                AETImprovementAccumulator(
+                    percentage=percentage,
+                    planning_area_acres=get_acreage(
+                        report.scenario.planning_area.geometry
+                    ),
+                )
             )
+            layers[AET_PERCENTUAL_ROLE] = percentual_layer
+        except Exception as exc:
+            log.exception("Failed to set up AET improvement for report %s.", report.pk)
+            results.append({"kind": AETImprovementAccumulator.kind, "error": str(exc)})
 
-            project_area_results.append(
-                {
-                    "project_id": project_area.pk,
-                    "proj_id": (project_area.data or {}).get("proj_id"),
-                    **volumes,
-                }
+    try:
+        layers.update(get_biomass_datalayers())
+        accumulators.append(BiomassVolumesAccumulator())
+    except ValueError as exc:
+        results.append({"kind": BiomassVolumesAccumulator.kind, "error": str(exc)})
+
+    failures = sweep_project_areas(
+        project_areas=list(report.scenario.project_areas.all()),
+        layers=layers,
+        accumulators=accumulators,
+        isolate_failures=True,
+    )
+    for accumulator in accumulators:
+        if accumulator.kind in failures:
+            results.append(
+                {"kind": accumulator.kind, "error": str(failures[accumulator.kind])}
             )
-
-            for key in accumulated:
-                accumulated[key] += volumes.get(key, 0.0)
-
-    return {
-        "summary": accumulated,
-        "project_areas": project_area_results,
-    }
+        else:
+            results.append({"kind": accumulator.kind, **accumulator.result()})
+    return results
 
 
 _INVALID_COLUMN_CHARS = re.compile(r"[^0-9a-zA-Z_]+")
@@ -2,8 +2,10 @@ import logging
 import smtplib
 from collections import Counter
 from datetime import timedelta
+from typing import Iterator
 
 from celery import chord
+from core.flags import feature_enabled
 from datasets.models import DataLayer
 from django.conf import settings
 from django.core.mail import send_mail
@@ -32,6 +34,8 @@ from funding_report.services import (
     calculate_aet_improvement,
     calculate_biomass_volumes,
     calculate_project_area_delta,
+    calculate_project_area_metrics,
+    calculate_project_areas_delta,
     calculate_treatment_pixel_areas,
     export_funding_report_to_geopackage,
     generate_aet_clip_datalayer,
@@ -46,6 +50,9 @@ log = logging.getLogger(__name__)
 
 STALE_RUNNING_TIMEOUT = timedelta(minutes=30)
 
+# kinds of task results that bundle several results in a "results" list
+BATCHED_RESULT_KINDS = ("deltas", "project_area_metrics")
+
 
 @app.task(
     bind=True,
@@ -161,6 +168,41 @@ def async_calculate_funding_report_delta(
         }
 
 
+@app.task()
+def async_calculate_funding_report_deltas(
+    project_area_ids: list[int],
+    baseline_layer_id: int,
+    value_layer_id: int,
+    year: int,
+    metric: str,
+    intervals: list[tuple[float, float]],
+) -> dict:
+    """
+    Calculates the funding report delta of every project area (and flame
+    length interval) for one metric and year, reading each raster once.
+    """
+    datalayer_lookup = {
+        (metric, year, True): DataLayer.objects.get(pk=baseline_layer_id),
+        (metric, year, False): DataLayer.objects.get(pk=value_layer_id),
+    }
+    try:
+        results = calculate_project_areas_delta(
+            project_areas=list(ProjectArea.objects.filter(pk__in=project_area_ids)),
+            metric=metric,
+            year=year,
+            datalayer_lookup=datalayer_lookup,
+            intervals=[(from_ft, to_ft) for from_ft, to_ft in intervals],
+        )
+    except Exception as exc:
+        log.exception(
+            "Failed to calculate funding report deltas for metric %s, year %s.",
+            metric,
+            year,
+        )
+        return {"error": str(exc), "variable": metric, "year": year}
+    return {"kind": "deltas", "results": results}
+
+
 @app.task()
 def async_generate_treatment_datalayer(
     funding_opportunity_report_id: int,
@@ -330,6 +372,26 @@ def async_calculate_biomass_volumes(
         return {"kind": "biomass_volumes", "error": str(exc)}
 
 
+@app.task()
+def async_calculate_project_area_metrics(
+    funding_opportunity_report_id: int,
+    percentage: float = AET_IMPROVEMENT_DEFAULT_PERCENTAGE,
+) -> dict:
+    try:
+        report = FundingOpportunityReport.objects.get(pk=funding_opportunity_report_id)
+        results = calculate_project_area_metrics(report=report, percentage=percentage)
+    except Exception as exc:
+        log.exception(
+            "Failed to calculate project area metrics for funding report %s.",
+            funding_opportunity_report_id,
+        )
+        kinds = ["aet_improvement", "biomass_volumes"]
+        if get_treatment_datalayer() is not None:
+            kinds.insert(0, "treatment_areas")
+        results = [{"kind": kind, "error": str(exc)} for kind in kinds]
+    return {"kind": "project_area_metrics", "results": results}
+
+
 @app.task()
 def async_generate_funding_report_geopackage(
     funding_opportunity_report_id: int,
@@ -346,6 +408,14 @@ def async_generate_funding_report_geopackage(
         )
 
 
+def _flatten_results(project_results: list[dict | None]) -> Iterator[dict | None]:
+    for result in project_results:
+        if result is not None and result.get("kind") in BATCHED_RESULT_KINDS:
+            yield from result["results"]
+        else:
+            yield result
+
+
 @app.task()
 def async_finalize_funding_report_results(
     project_results: list[dict | None],
@@ -360,7 +430,7 @@ def async_finalize_funding_report_results(
     aet_improvement = None
     biomass_volumes = None
 
-    for result in project_results:
+    for result in _flatten_results(project_results):
         if result is None:
             continue
         kind = result.get("kind")
@@ -487,6 +557,18 @@ def run_funding_opportunity_report(funding_opportunity_report_id: int) -> None:
                         ),
                     )
                 )
+                if feature_enabled("FUNDING_REPORT_SINGLE_READ"):
+                    tasks.append(
+                        async_calculate_funding_report_deltas.si(
+                            project_area_ids=project_area_ids,
+                            baseline_layer_id=baseline_layer.pk,
+                            value_layer_id=value_layer.pk,
+                            year=year,
+                            metric=metric.value,
+                            intervals=list(intervals),
+                        )
+                    )
+                    continue
                 for from_ft, to_ft in intervals:
                     tasks.extend(
                         async_calculate_funding_report_delta.si(
@@ -506,25 +588,32 @@ def run_funding_opportunity_report(funding_opportunity_report_id: int) -> None:
             )
         )
         tasks.append(
-            async_calculate_treatment_areas.si(
+            async_generate_aet_datalayer.si(
                 funding_opportunity_report_id=funding_opportunity_report_id,
             )
         )
-        tasks.append(
-            async_calculate_aet_improvement.si(
-                funding_opportunity_report_id=funding_opportunity_report_id,
+        if feature_enabled("FUNDING_REPORT_RASTER_SWEEP"):
+            tasks.append(
+                async_calculate_project_area_metrics.si(
+                    funding_opportunity_report_id=funding_opportunity_report_id,
+                )
             )
-        )
-        tasks.append(
-            async_generate_aet_datalayer.si(
-                funding_opportunity_report_id=funding_opportunity_report_id,
+        else:
+            tasks.append(
+                async_calculate_treatment_areas.si(
+                    funding_opportunity_report_id=funding_opportunity_report_id,
+                )
             )
-        )
-        tasks.append(
-            async_calculate_biomass_volumes.si(
-                funding_opportunity_report_id=funding_opportunity_report_id,
+            tasks.append(
+                async_calculate_aet_improvement.si(
+                    funding_opportunity_report_id=funding_opportunity_report_id,
+                )
+            )
+            tasks.append(
+                async_calculate_biomass_volumes.si(
+                    funding_opportunity_report_id=funding_opportunity_report_id,
+                )
             )
-        )
         callback = async_finalize_funding_report_results.s(
             funding_opportunity_report_id=funding_opportunity_report_id,
         ).on_error(
@@ -18,6 +18,7 @@ from planning.tests.factories import (
 from pyproj import Geod, Transformer
 from rasterio.mask import mask
 from rasterio.transform import from_origin
+from rasterio.windows import Window
 
 from funding_report.models import (
     FUNDING_REPORT_YEARS,
@@ -32,6 +33,7 @@ from funding_report.models import (
 )
 from funding_report.services import (
     _filter_by_project_id,
+    _row_areas_acres,
     aggregate_delta_pixels,
     build_datalayer_lookup,
     build_flame_length_reduction_results,
@@ -43,7 +45,9 @@ from funding_report.services import (
     calculate_funding_report_flame_length_reduction,
     calculate_pixel_deltas,
     calculate_project_area_aet_improvement,
+    calculate_project_area_metrics,
     calculate_project_area_delta,
+    calculate_project_areas_delta,
     calculate_treatment_pixel_areas,
     flatten_report_metrics,
     get_aet_delta_datalayer,
@@ -432,6 +436,48 @@ class FundingReportRasterCalculationTest(TestCase):
         self.assertAlmostEqual(result["value"], expected["value"], places=4)
         self.assertAlmostEqual(result["delta"], expected["delta"], places=4)
 
+    def test_calculate_project_areas_delta_matches_single_project_area_delta(self):
+        self.create_datalayer(
+            FundingReportMetric.ABOVEGROUND_TOTAL, 2026, baseline=True
+        )
+        self.create_datalayer(
+            FundingReportMetric.ABOVEGROUND_TOTAL, 2026, baseline=False
+        )
+        bounds = self.geometry.extent
+        half = (bounds[0] + bounds[2]) / 2
+        west = ProjectAreaFactory.create(
+            scenario=self.scenario,
+            geometry=MultiPolygon(
+                Polygon.from_bbox((bounds[0], bounds[1], half, bounds[3])),
+                srid=self.geometry.srid,
+            ),
+        )
+        outside = ProjectAreaFactory.create(
+            scenario=self.scenario,
+            geometry=MultiPolygon(
+                Polygon.from_bbox((0, 0, 0.001, 0.001)), srid=self.geometry.srid
+            ),
+        )
+
+        results = calculate_project_areas_delta(
+            project_areas=[self.project_area, west, outside],
+            metric=FundingReportMetric.ABOVEGROUND_TOTAL.value,
+            year=2026,
+        )
+
+        by_project = {result["project_id"]: result for result in results}
+        self.assertIn("error", by_project[outside.pk])
+        for project_area in (self.project_area, west):
+            expected = calculate_project_area_delta(
+                project_area=project_area,
+                metric=FundingReportMetric.ABOVEGROUND_TOTAL.value,
+                year=2026,
+            )
+            for field in ("value", "baseline", "delta"):
+                self.assertAlmostEqual(
+                    by_project[project_area.pk][field], expected[field], places=4
+                )
+
     def test_build_results_flame_severity_summary_aggregates_value_baseline_and_percent(
         self,
     ):
@@ -808,6 +854,43 @@ class TreatmentLayerHasValidDataTest(TestCase):
         self.assertFalse(treatment_layer_has_valid_data(self.scenario))
 
 
+class RowAreasAcresTest(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.raster_path = Path(tmp_dir.name) / "rows.tif"
+        write_flame_length_raster(self.raster_path, np.zeros((2, 2), dtype=np.float32))
+
+    def test_row_areas_match_geodesic_pixel_area(self):
+        with rasterio.open(self.raster_path) as src:
+            row_areas = _row_areas_acres(src, src.transform, src.height)
+
+        self.assertEqual(row_areas.shape, (2,))
+        for row in range(2):
+            self.assertAlmostEqual(
+                row_areas[row],
+                geodesic_pixel_area_acres(self.raster_path, row=row),
+                places=9,
+            )
+
+    def test_row_areas_are_memoized_per_transform_and_crs(self):
+        with rasterio.open(self.raster_path) as src:
+            first = _row_areas_acres(src, src.transform, src.height)
+            second = _row_areas_acres(src, src.transform, src.height)
+
+        self.assertTrue(np.shares_memory(first, second))
+        self.assertFalse(first.flags.writeable)
+
+    def test_windows_share_the_raster_row_areas(self):
+        with rasterio.open(self.raster_path) as src:
+            row_areas = _row_areas_acres(src, src.transform, src.height)
+            window = Window(1, 1, 1, 1)
+            window_areas = _row_areas_acres(src, src.window_transform(window), 1)
+
+        self.assertTrue(np.shares_memory(row_areas, window_areas))
+        self.assertEqual(window_areas.tolist(), row_areas[1:].tolist())
+
+
 class BuildFlameLengthReductionResultsTest(TestCase):
     def test_buckets_results_by_interval_key(self):
         results = build_flame_length_reduction_results(
@@ -1109,6 +1192,33 @@ class FlameLengthReductionCalculationTest(TestCase):
         self.assertEqual(result["interval"], {"from": 8.0, "to": 4.0})
         self.assertAlmostEqual(result["value"], expected_reduced_acres, places=6)
 
+    def test_calculate_project_areas_delta_flame_severity_calculates_every_interval(
+        self,
+    ):
+        intervals = [(7.0, 4.0), (2.0, 3.0)]
+
+        results = calculate_project_areas_delta(
+            project_areas=[self.project_area],
+            metric=FundingReportMetric.TOTAL_FLAME_SEVERITY.value,
+            year=2026,
+            datalayer_lookup=self.datalayer_lookup,
+            intervals=intervals,
+        )
+
+        self.assertEqual(len(results), len(intervals))
+        for result, (from_ft, to_ft) in zip(results, intervals):
+            expected = calculate_project_area_delta(
+                project_area=self.project_area,
+                metric=FundingReportMetric.TOTAL_FLAME_SEVERITY.value,
+                year=2026,
+                datalayer_lookup=self.datalayer_lookup,
+                from_ft=from_ft,
+                to_ft=to_ft,
+            )
+            self.assertEqual(result["interval"], expected["interval"])
+            for field in ("value", "baseline", "delta"):
+                self.assertAlmostEqual(result[field], expected[field], places=6)
+
     def test_calculate_funding_report_flame_length_reduction_returns_summary_and_projects(
         self,
     ):
@@ -1304,6 +1414,91 @@ class BiomassVolumesCalculationTest(TestCase):
                 summary[key], 0.0, msg=f"{key} should be 0 for non-overlapping area"
             )
 
+    def test_calculate_project_area_metrics_matches_individual_calculations(self):
+        self._create_all_biomass_datalayers()
+        DataLayerFactory.create(
+            name="Treatment",
+            type=DataLayerType.RASTER,
+            url=str(self.wt_path),
+            metadata={
+                "modules": {
+                    "funding_report": {
+                        "variable": TREATMENT_VARIABLE,
+                        "role": TREATMENT_ROLE,
+                    }
+                }
+            },
+        )
+        DataLayerFactory.create(
+            name="AET percentual",
+            type=DataLayerType.RASTER,
+            url=str(self.non_merch_path),
+            metadata={
+                "modules": {"funding_report": {"variable": "AET", "role": "percentual"}}
+            },
+        )
+
+        results = {
+            result.pop("kind"): result
+            for result in calculate_project_area_metrics(self.report, percentage=60)
+        }
+
+        self.assertEqual(
+            set(results), {"treatment_areas", "aet_improvement", "biomass_volumes"}
+        )
+        self.assertEqual(
+            results["treatment_areas"], calculate_treatment_pixel_areas(self.report)
+        )
+        self.assertEqual(
+            results["aet_improvement"],
+            calculate_aet_improvement(self.report, percentage=60),
+        )
+        self.assertEqual(
+            results["biomass_volumes"], calculate_biomass_volumes(self.report)
+        )
+
+    def test_calculate_project_area_metrics_reports_missing_datalayers(self):
+        self._create_all_biomass_datalayers()
+
+        results = calculate_project_area_metrics(self.report, percentage=60)
+
+        self.assertEqual(
+            [result["kind"] for result in results],
+            ["aet_improvement", "biomass_volumes"],
+        )
+        self.assertIn("error", results[0])
+        self.assertEqual(
+            results[1]["summary"], calculate_biomass_volumes(self.report)["summary"]
+        )
+
+
+    def test_calculate_project_area_metrics_isolates_failing_datalayers(self):
+        self._create_all_biomass_datalayers()
+        DataLayerFactory.create(
+            name="Treatment",
+            type=DataLayerType.RASTER,
+            url=str(self.wt_path.parent / "missing.tif"),
+            metadata={
+                "modules": {
+                    "funding_report": {
+                        "variable": TREATMENT_VARIABLE,
+                        "role": TREATMENT_ROLE,
+                    }
+                }
+            },
+        )
+
+        results = calculate_project_area_metrics(self.report, percentage=60)
+
+        self.assertEqual(
+            [result["kind"] for result in results],
+            ["aet_improvement", "treatment_areas", "biomass_volumes"],
+        )
+        self.assertIn("error", results[1])
+        self.assertEqual(
+            results[2]["summary"], calculate_biomass_volumes(self.report)["summary"]
+        )
+
 
 class FundingReportLayersOfInterestTest(TestCase):
     def create_funding_report_datalayer(self, metric, year, baseline):
@@ -26,6 +26,8 @@ from funding_report.models import (
 from funding_report.tasks import (
     STALE_RUNNING_TIMEOUT,
     async_calculate_funding_report_delta,
+    async_calculate_funding_report_deltas,
+    async_calculate_project_area_metrics,
     async_finalize_funding_report_results,
     async_generate_aet_datalayer,
     async_send_email_funding_report_finished,
@@ -448,6 +450,182 @@ class FundingOpportunityReportTaskTest(TestCase):
             + 5,
         )
 
+    @override_settings(FEATURE_FLAGS="FUNDING_REPORT_SINGLE_READ")
+    @mock.patch("funding_report.tasks.chord")
+    def test_run_task_builds_one_delta_task_per_metric_and_year(self, chord_mock):
+        self.create_all_datalayers()
+
+        run_funding_opportunity_report(self.report.pk)
+
+        tasks = chord_mock.call_args.args[0]
+        self.assertEqual(
+            len(tasks), len(FundingReportMetric) * len(FUNDING_REPORT_YEARS) + 5
+        )
+        flame_tasks = [
+            task
+            for task in tasks
+            if task.kwargs.get("metric")
+            == FundingReportMetric.TOTAL_FLAME_SEVERITY.value
+        ]
+        for task in flame_tasks:
+            self.assertEqual(task.kwargs["project_area_ids"], [self.project_area.pk])
+            self.assertEqual(
+                task.kwargs["intervals"], list(FLAME_LENGTH_REDUCTION_INTERVALS)
+            )
+
+    @override_settings(FEATURE_FLAGS="FUNDING_REPORT_RASTER_SWEEP")
+    @mock.patch("funding_report.tasks.chord")
+    def test_run_task_builds_one_project_area_metrics_task(self, chord_mock):
+        self.create_all_datalayers()
+
+        run_funding_opportunity_report(self.report.pk)
+
+        tasks = chord_mock.call_args.args[0]
+        task_names = [task.task for task in tasks]
+        self.assertIn(
+            "funding_report.tasks.async_calculate_project_area_metrics", task_names
+        )
+        self.assertNotIn(
+            "funding_report.tasks.async_calculate_biomass_volumes", task_names
+        )
+        self.assertEqual(
+            len(tasks),
+            1 * (len(FundingReportMetric) - 1) * len(FUNDING_REPORT_YEARS)
+            + 1 * len(FUNDING_REPORT_YEARS) * len(FLAME_LENGTH_REDUCTION_INTERVALS)
+            + 3,
+        )
+
+    @mock.patch("funding_report.tasks.get_treatment_datalayer")
+    @mock.patch("funding_report.tasks.calculate_project_area_metrics")
+    def test_project_area_metrics_task_returns_error_marker_per_kind_on_failure(
+        self, calculate_mock, treatment_datalayer_mock
+    ):
+        calculate_mock.side_effect = ValueError("boom")
+        treatment_datalayer_mock.return_value = mock.Mock()
+
+        result = async_calculate_project_area_metrics(self.report.pk)
+
+        self.assertEqual(result["kind"], "project_area_metrics")
+        self.assertEqual(
+            [entry["kind"] for entry in result["results"]],
+            ["treatment_areas", "aet_improvement", "biomass_volumes"],
+        )
+        for entry in result["results"]:
+            self.assertEqual(entry["error"], "boom")
+
+    @mock.patch("funding_report.tasks.get_treatment_datalayer", return_value=None)
+    @mock.patch("funding_report.tasks.calculate_project_area_metrics")
+    def test_project_area_metrics_task_skips_treatment_error_without_datalayer(
+        self, calculate_mock, treatment_datalayer_mock
+    ):
+        calculate_mock.side_effect = ValueError("boom")
+
+        result = async_calculate_project_area_metrics(self.report.pk)
+
+        self.assertEqual(
+            [entry["kind"] for entry in result["results"]],
+            ["aet_improvement", "biomass_volumes"],
+        )
+
+    @mock.patch("funding_report.tasks.async_generate_funding_report_geopackage.delay")
+    @mock.patch("funding_report.tasks.async_send_email_funding_report_finished.delay")
+    def test_finalize_task_unpacks_project_area_metrics(
+        self,
+        email_task_mock,
+        geopackage_task_mock,
+    ):
+        async_finalize_funding_report_results(
+            project_results=[
+                {
+                    "kind": "project_area_metrics",
+                    "results": [
+                        {
+                            "kind": "treatment_areas",
+                            "projects": {str(self.project_area.pk): {"None": 1.0}},
+                            "total": {"None": 1.0},
+                        },
+                        {"kind": "biomass_volumes", "error": "missing"},
+                    ],
+                },
+            ],
+            funding_opportunity_report_id=self.report.pk,
+        )
+
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, FundingOpportunityReportStatus.SUCCESS)
+        self.assertEqual(self.report.results["treatment_areas"]["total"], {"None": 1.0})
+        self.assertEqual(
+            self.report.results["treatment_errors"],
+            [{"kind": "biomass_volumes", "error": "missing"}],
+        )
+
+    @mock.patch("funding_report.tasks.calculate_project_areas_delta")
+    def test_deltas_task_returns_results(self, calculate_mock):
+        baseline_layer = self.create_datalayer(
+            FundingReportMetric.ABOVEGROUND_TOTAL, 2026, baseline=True
+        )
+        value_layer = self.create_datalayer(
+            FundingReportMetric.ABOVEGROUND_TOTAL, 2026, baseline=False
+        )
+        calculate_mock.return_value = [{"project_id": self.project_area.pk}]
+
+        result = async_calculate_funding_report_deltas(
+            project_area_ids=[self.project_area.pk],
+            baseline_layer_id=baseline_layer.pk,
+            value_layer_id=value_layer.pk,
+            year=2026,
+            metric=FundingReportMetric.ABOVEGROUND_TOTAL.value,
+            intervals=[[7.0, 4.0]],
+        )
+
+        self.assertEqual(
+            result,
+            {"kind": "deltas", "results": [{"project_id": self.project_area.pk}]},
+        )
+        self.assertEqual(calculate_mock.call_args.kwargs["intervals"], [(7.0, 4.0)])
+
+    @mock.patch("funding_report.tasks.async_generate_funding_report_geopackage.delay")
+    @mock.patch("funding_report.tasks.async_send_email_funding_report_finished.delay")
+    def test_finalize_task_splits_deltas_results_and_errors(
+        self,
+        email_task_mock,
+        geopackage_task_mock,
+    ):
+        error = {
+            "error": "Input shapes do not overlap raster.",
+            "project_id": self.project_area.pk,
+            "proj_id": None,
+            "variable": FundingReportMetric.ABOVEGROUND_TOTAL.value,
+            "year": 2031,
+        }
+        async_finalize_funding_report_results(
+            project_results=[
+                {
+                    "kind": "deltas",
+                    "results": [
+                        {
+                            "variable": FundingReportMetric.ABOVEGROUND_TOTAL,
+                            "project_id": self.project_area.pk,
+                            "year": 2026,
+                            "value": 10,
+                            "baseline": 8,
+                            "delta": 1.2,
+                        },
+                        error,
+                    ],
+                },
+            ],
+            funding_opportunity_report_id=self.report.pk,
+        )
+
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, FundingOpportunityReportStatus.FAILED)
+        self.assertEqual(self.report.results["errors"], [error])
+        self.assertEqual(
+            len(self.report.results["projects"][FundingReportMetric.ABOVEGROUND_TOTAL]),
+            1,
+        )
+
     @mock.patch("funding_report.tasks.chord")
     def test_run_task_dispatches_three_intervals_for_flame_severity(self, chord_mock):
         self.create_all_datalayers()
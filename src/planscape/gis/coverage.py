@@ -0,0 +1,125 @@
+from typing import Any, Dict, Tuple, Union
+
+import numpy as np
+import shapely
+from rasterio.features import rasterize
+from rasterio.transform import Affine
+from shapely.geometry import shape
+from shapely.geometry.base import BaseGeometry
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    """Grows `mask` by one pixel in every direction (3x3 neighborhood)."""
+    padded = np.pad(mask, 1)
+    height, width = mask.shape
+    dilated = np.zeros_like(mask)
+    for row_offset in range(3):
+        for col_offset in range(3):
+            dilated |= padded[
+                row_offset : row_offset + height,
+                col_offset : col_offset + width,
+            ]
+    return dilated
+
+
+def _clipped_fractions(
+    geometry: BaseGeometry,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    transform: Affine,
+) -> np.ndarray:
+    """
+    Exact fraction of each (row, col) pixel covered by `geometry`. On
+    north-up grids the geometry is first clipped to each row strip, so every
+    pixel is intersected with a small piece of the geometry instead of the
+    whole thing, and all the pixels of a row go in one vectorized call.
+    """
+    pixel_area = abs(transform.determinant)
+    fractions = np.zeros(rows.size, dtype=float)
+    if transform.b == 0 and transform.d == 0:
+        x0, y0 = transform * (cols, rows)
+        x1, y1 = transform * (cols + 1, rows + 1)
+        xmin, xmax = np.minimum(x0, x1), np.maximum(x0, x1)
+        ymin, ymax = np.minimum(y0, y1), np.maximum(y0, y1)
+        order = np.argsort(rows, kind="stable")
+        splits = np.flatnonzero(np.diff(rows[order])) + 1
+        for indices in np.split(order, splits):
+            strip = shapely.intersection(
+                geometry,
+                shapely.box(
+                    xmin[indices].min(),
+                    ymin[indices[0]],
+                    xmax[indices].max(),
+                    ymax[indices[0]],
+                ),
+            )
+            if strip.is_empty:
+                continue
+            pixels = shapely.box(
+                xmin[indices], ymin[indices], xmax[indices], ymax[indices]
+            )
+            fractions[indices] = shapely.area(shapely.intersection(pixels, strip))
+    else:
+        # rotated grids: pixels are parallelograms, not row strips
+        corners = np.stack(
+            [
+                np.column_stack(transform * (cols + col_offset, rows + row_offset))
+                for col_offset, row_offset in ((0, 0), (1, 0), (1, 1), (0, 1), (0, 0))
+            ],
+            axis=1,
+        )
+        shapely.prepare(geometry)
+        fractions = shapely.area(
+            shapely.intersection(shapely.polygons(corners), geometry)
+        )
+    return np.clip(fractions / pixel_area, 0.0, 1.0)
+
+
+def coverage_fraction(
+    geometry: Union[BaseGeometry, Dict[str, Any]],
+    out_shape: Tuple[int, int],
+    transform: Affine,
+) -> np.ndarray:
+    """
+    Returns a float32 array with the fraction (0.0 to 1.0) of every pixel of
+    the `out_shape` grid described by `transform` that is covered by
+    `geometry` (a shapely geometry or a GeoJSON-like mapping, in the grid's
+    CRS).
+
+    Pixels strictly inside the geometry are set to 1.0 by GDAL's scanline
+    rasterizer, and only the pixels crossed by the geometry boundary (plus
+    a one pixel safety margin) are clipped exactly, so the cost grows with
+    the perimeter of the geometry instead of its area.
+    """
+    coverage = np.zeros(out_shape, dtype=np.float32)
+    if not isinstance(geometry, BaseGeometry):
+        geometry = shape(geometry)
+    if geometry.is_empty or 0 in out_shape:
+        return coverage
+
+    touched = rasterize(
+        [geometry],
+        out_shape=out_shape,
+        transform=transform,
+        fill=0,
+        default_value=1,
+        all_touched=True,
+        dtype="uint8",
+    ).astype(bool)
+    boundary = _dilate(
+        rasterize(
+            [geometry.boundary],
+            out_shape=out_shape,
+            transform=transform,
+            fill=0,
+            default_value=1,
+            all_touched=True,
+            dtype="uint8",
+        ).astype(bool)
+    )
+    coverage[touched & ~boundary] = 1.0
+
+    rows, cols = np.nonzero(boundary)
+    if rows.size:
+        coverage[rows, cols] = _clipped_fractions(geometry, rows, cols, transform)
+    return coverage
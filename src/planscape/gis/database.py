@@ -1,4 +1,4 @@
-from django.contrib.gis.db.models import GeometryField
+from django.contrib.gis.db.models import Extent, GeometryField
 from django.db.models import Func
 
 
@@ -17,3 +17,21 @@ class SimplifyPreserveTopology(Func):
             srid = getattr(getattr(expression, "output_field", None), "srid", None)
             output_field = GeometryField(srid=srid)
         super().__init__(expression, tolerance, output_field=output_field, **extra)
+
+
+class ExtentGeometry(Func):
+    """
+    Wraps PostGIS ST_Extent(geom)::geometry, the bounding box of a set of
+    geometries as a polygon. Unlike Django's `Extent` aggregate, whose box is
+    only converted to a tuple when it's the outermost expression, it can be
+    used in a `Subquery` annotation; read the bounds with `.extent`.
+    """
+
+    template = "%(expressions)s::geometry"
+
+    def __init__(self, expression, output_field=None, **extra):
+        super().__init__(
+            Extent(expression),
+            output_field=output_field or GeometryField(),
+            **extra,
+        )
@@ -92,51 +92,60 @@ def info_raster(input_file: str) -> Dict[str, Any]:
     """
     with rasterio.Env(**get_gdal_env()):
         with rasterio.open(input_file) as src:
-            info = dict(src.profile)
-            info["shape"] = (info["height"], info["width"])
-            info["bounds"] = src.bounds
-
-            if src.crs:
-                epsg = src.crs.to_epsg()
-                if epsg:
-                    info["crs"] = f"EPSG:{epsg}"
-                else:
-                    info["crs"] = src.crs.to_string()
+            return info_dataset(src)
+
+
+def info_dataset(src: rasterio.DatasetReader) -> Dict[str, Any]:
+    """
+    Same as `info_raster`, for a dataset that is already open - e.g. a COG
+    staged locally before it is uploaded, so its info doesn't have to be
+    probed again from the storage bucket.
+    """
+    info = dict(src.profile)
+    info["shape"] = (info["height"], info["width"])
+    info["bounds"] = src.bounds
+
+    if src.crs:
+        epsg = src.crs.to_epsg()
+        if epsg:
+            info["crs"] = f"EPSG:{epsg}"
+        else:
+            info["crs"] = src.crs.to_string()
+    else:
+        info["crs"] = None
+
+    info["res"] = src.res
+    info["colorinterp"] = [ci.name for ci in src.colorinterp]
+    info["units"] = [units or None for units in src.units]
+    info["descriptions"] = src.descriptions
+    info["indexes"] = src.indexes
+    info["mask_flags"] = [
+        [flag.name for flag in flags] for flags in src.mask_flag_enums
+    ]
+
+    if src.crs:
+        info["lnglat"] = src.lnglat()
+
+    gcps, gcps_crs = src.gcps
+
+    if gcps:
+        info["gcps"] = {"points": [p.asdict() for p in gcps]}
+        if gcps_crs:
+            epsg = gcps_crs.to_epsg()
+            if epsg:
+                info["gcps"]["crs"] = f"EPSG:{epsg}"
             else:
-                info["crs"] = None
-
-            info["res"] = src.res
-            info["colorinterp"] = [ci.name for ci in src.colorinterp]
-            info["units"] = [units or None for units in src.units]
-            info["descriptions"] = src.descriptions
-            info["indexes"] = src.indexes
-            info["mask_flags"] = [
-                [flag.name for flag in flags] for flags in src.mask_flag_enums
-            ]
-
-            if src.crs:
-                info["lnglat"] = src.lnglat()
-
-            gcps, gcps_crs = src.gcps
-
-            if gcps:
-                info["gcps"] = {"points": [p.asdict() for p in gcps]}
-                if gcps_crs:
-                    epsg = gcps_crs.to_epsg()
-                    if epsg:
-                        info["gcps"]["crs"] = f"EPSG:{epsg}"
-                    else:
-                        info["gcps"]["crs"] = src.crs.to_string()
-                else:
-                    info["gcps"]["crs"] = None
-
-                info["gcps"]["transform"] = from_gcps(gcps)
-
-            stats = [asdict(so) for so in src.stats()]
-            info["stats"] = stats
-            info["checksum"] = [src.checksum(i) for i in src.indexes]
-
-            return _sanitize_non_finite(json.loads(json.dumps(info)))
+                info["gcps"]["crs"] = src.crs.to_string()
+        else:
+            info["gcps"]["crs"] = None
+
+        info["gcps"]["transform"] = from_gcps(gcps)
+
+    stats = [asdict(so) for so in src.stats()]
+    info["stats"] = stats
+    info["checksum"] = [src.checksum(i) for i in src.indexes]
+
+    return _sanitize_non_finite(json.loads(json.dumps(info)))
 
 
 def info_vector_layer(input_file: str, layer: Optional[str] = None) -> Dict[str, Any]:
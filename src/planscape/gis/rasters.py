@@ -1,7 +1,9 @@
 import logging
 import tempfile
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
+from uuid import uuid4
 
 import numpy as np
 import rasterio
@@ -9,7 +11,10 @@ from core.gcs import is_gcs_file
 from core.s3 import is_s3_file
 from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
-from rasterio.features import geometry_mask
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask, geometry_window
+from rasterio.shutil import copyfiles
+from rasterio.shutil import delete as delete_dataset
 from rasterio.transform import Affine
 from rasterio.warp import (
     Resampling,
@@ -17,18 +22,23 @@ from rasterio.warp import (
     reproject,
     transform_geom,
 )
+from rasterio.windows import Window
 from rio_cogeo.cogeo import cog_translate, cog_validate
 from rio_cogeo.profiles import cog_profiles
 from shapely.geometry import mapping, shape
 from shapely.geometry.base import BaseGeometry
 
 from gis.core import get_layer_info, get_random_output_file, with_vsi_prefix
-from gis.info import get_gdal_env, resolve_num_threads
+from gis.info import get_gdal_env, info_dataset, resolve_num_threads
 from gis.quadtree import build_raster_tree, union_data_area
 
 log = logging.getLogger(__name__)
 Number = Union[int, float]
 
+# rasters up to this many pixels (~64MB of float32) are staged in GDAL's
+# in-memory filesystem instead of local temp files
+IN_MEMORY_MAX_PIXELS = 4096 * 4096
+
 
 def get_profile(
     input_profile: Dict[str, Any],
@@ -336,6 +346,184 @@ def to_planscape_streaming(input_file: str, output_file: str) -> str:
     return output_file
 
 
+def staging_path(in_memory: bool) -> str:
+    if in_memory:
+        return f"/vsimem/{uuid4()}.tif"
+    with tempfile.NamedTemporaryFile(suffix=".tif", delete=False) as tmp:
+        return tmp.name
+
+
+def delete_staged(path: str) -> None:
+    if path.startswith("/vsimem/"):
+        delete_dataset(path)
+    else:
+        Path(path).unlink(missing_ok=True)
+
+
+def write_cog(
+    input_file: str,
+    output_file: str,
+    cog_profile: str = "deflate",
+    in_memory: bool = False,
+) -> Dict[str, Any]:
+    """
+    Converts `input_file` to a COG and copies it to `output_file` (local path
+    or cloud URL), returning the `info_raster` info of the COG.
+
+    The COG is staged in memory (or in a local temp file, for large rasters)
+    and the info is read from the staged copy, so the uploaded object never
+    has to be opened again just to describe it.
+    """
+    output_profile = cog_profiles.get(cog_profile)
+    output_profile.update(dict(BIGTIFF="IF_SAFER"))
+    config = get_gdal_env()
+
+    staged_file = staging_path(in_memory)
+    try:
+        cog_translate(
+            input_file,
+            staged_file,
+            output_profile,
+            config=config,
+            in_memory=in_memory,
+            quiet=True,
+            web_optimized=False,
+            overview_resampling="nearest",
+            use_cog_driver=True,
+        )
+        with rasterio.Env(**config):
+            with rasterio.open(staged_file) as cog_src:
+                info = info_dataset(cog_src)
+            copyfiles(staged_file, with_vsi_prefix(output_file))
+    finally:
+        delete_staged(staged_file)
+
+    log.info(f"COG written to {output_file}")
+    return info
+
+
+def _write_clip_block(
+    src: rasterio.DatasetReader,
+    dst: rasterio.io.DatasetWriter,
+    geometry: Dict[str, Any],
+    src_window: Window,
+    dst_window: Window,
+    fill: Number,
+) -> None:
+    data = src.read(window=src_window, masked=True)
+    outside = geometry_mask(
+        [geometry],
+        out_shape=data.shape[1:],
+        transform=src.window_transform(src_window),
+    )
+    data.mask = np.ma.getmaskarray(data) | outside
+    dst.write(data.filled(fill), window=dst_window)
+
+
+def clip_to_cog(
+    input_file: str,
+    geometry: Dict[str, Any],
+    output_file: str,
+    cog_profile: str = "deflate",
+    in_memory_max_pixels: int = IN_MEMORY_MAX_PIXELS,
+) -> Dict[str, Any]:
+    """
+    Clips `input_file` to `geometry` (GeoJSON in the raster CRS) like
+    `rasterio.mask.mask(..., crop=True)` does and writes the clip as a COG to
+    `output_file`, returning its layer info (see `write_cog`).
+
+    Small clips are read in one go and staged in memory; larger ones are
+    copied block by block into a local tiled GTiff, so the whole clip never
+    has to fit in memory.
+    """
+    with rasterio.Env(**get_gdal_env()):
+        with rasterio.open(with_vsi_prefix(input_file)) as src:
+            try:
+                window = geometry_window(src, [geometry])
+            except WindowError:
+                raise ValueError("Input shapes do not overlap raster.")
+
+            height, width = int(window.height), int(window.width)
+            transform = src.window_transform(window)
+            in_memory = height * width * src.count <= in_memory_max_pixels
+            profile = src.profile.copy()
+            profile.update(
+                {
+                    "driver": "GTiff",
+                    "height": height,
+                    "width": width,
+                    "transform": transform,
+                    "tiled": True,
+                    "blockxsize": 512,
+                    "blockysize": 512,
+                }
+            )
+            fill = src.nodata if src.nodata is not None else 0
+
+            clipped_file = staging_path(in_memory)
+            try:
+                with rasterio.open(clipped_file, "w", **profile) as dst:
+                    blocks = (
+                        [Window(0, 0, width, height)]
+                        if in_memory
+                        else [block for _, block in dst.block_windows(1)]
+                    )
+                    for block in blocks:
+                        _write_clip_block(
+                            src=src,
+                            dst=dst,
+                            geometry=geometry,
+                            src_window=Window(
+                                window.col_off + block.col_off,
+                                window.row_off + block.row_off,
+                                block.width,
+                                block.height,
+                            ),
+                            dst_window=block,
+                            fill=fill,
+                        )
+                return write_cog(
+                    input_file=clipped_file,
+                    output_file=output_file,
+                    cog_profile=cog_profile,
+                    in_memory=in_memory,
+                )
+            finally:
+                delete_staged(clipped_file)
+
+
+def to_planscape_cog(input_file: str, output_file: str) -> Dict[str, Any]:
+    """
+    Same as `to_planscape_streaming` for rasters we generate locally (never
+    COGs already): warps `input_file` to the Planscape CRS when needed and
+    writes it as a COG to `output_file`, returning its layer info (see
+    `write_cog`).
+    """
+    with rasterio.Env(**get_gdal_env()):
+        with rasterio.open(input_file) as src:
+            srid = src.crs.to_epsg() if src.crs else None
+            in_memory = src.width * src.height * src.count <= IN_MEMORY_MAX_PIXELS
+    if srid is None:
+        raise ValueError(
+            "Cannot convert to planscape format if raster file does not have CRS information."
+        )
+
+    with ExitStack() as stack:
+        if srid != settings.RASTER_CRS:
+            warped_file = staging_path(in_memory)
+            stack.callback(delete_staged, warped_file)
+            input_file = warp(
+                input_file=input_file,
+                output_file=warped_file,
+                crs=f"EPSG:{settings.RASTER_CRS}",
+            )
+        return write_cog(
+            input_file=input_file,
+            output_file=output_file,
+            in_memory=in_memory,
+        )
+
+
 def get_estimated_mask(
     raster_path: str,
     output_srid: int = 4269,
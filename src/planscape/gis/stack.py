@@ -0,0 +1,147 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+Number = Union[int, float]
+
+
+class RasterStack:
+    """
+    N aligned rasters opened once and read block by block as a single
+    `(N, h, w)` float32 array, following the block layout of the first
+    raster.
+
+    Nodata pixels (and pixels outside a raster's extent) are converted to
+    NaN in place. With `prefetch`, the next block is read in a thread pool
+    (one read per raster, so a dataset is never used by two threads at the
+    same time) while the caller processes the current one.
+
+    Example:
+        >>> with RasterStack([layer.url for layer in layers]) as stack:
+        >>>     for window, block in stack.blocks():
+        >>>         dst.write(np.nanmean(block, axis=0), 1, window=window)
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        nodata: Number = -9999,
+        prefetch: bool = True,
+        max_workers: Optional[int] = None,
+    ):
+        if not paths:
+            raise ValueError("RasterStack needs at least one raster.")
+        self.paths = list(paths)
+        self.default_nodata = nodata
+        self.prefetch = prefetch
+        self.max_workers = max_workers
+        self.datasets: List[rasterio.DatasetReader] = []
+        self._exit_stack = ExitStack()
+
+    def __enter__(self) -> "RasterStack":
+        try:
+            self.datasets = [
+                self._exit_stack.enter_context(rasterio.open(path))
+                for path in self.paths
+            ]
+        except Exception:
+            self._exit_stack.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._exit_stack.close()
+        self.datasets = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def profile(self) -> Dict[str, Any]:
+        return self.datasets[0].profile.copy()
+
+    @property
+    def nodata(self) -> Number:
+        """Nodata of the first raster, or the default when it has none."""
+        nodata = self.datasets[0].nodata
+        return nodata if nodata is not None else self.default_nodata
+
+    def block_windows(self) -> List[Window]:
+        return [window for _, window in self.datasets[0].block_windows(1)]
+
+    def _read_into(
+        self,
+        src: rasterio.DatasetReader,
+        window: Window,
+        out: np.ndarray,
+    ) -> None:
+        nodata = src.nodata if src.nodata is not None else self.default_nodata
+        fits = (
+            window.col_off >= 0
+            and window.row_off >= 0
+            and window.col_off + window.width <= src.width
+            and window.row_off + window.height <= src.height
+        )
+        if fits:
+            src.read(1, window=window, out=out)
+        else:
+            # boundless reads go through a VRT, only pay for it at the edges
+            src.read(1, window=window, out=out, boundless=True, fill_value=nodata)
+        if not np.isnan(nodata):
+            out[out == nodata] = np.nan
+
+    def read(self, window: Window, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Reads `window` of every raster into `out` (allocated if missing)."""
+        shape = (len(self.datasets), int(window.height), int(window.width))
+        if out is None:
+            out = np.empty(shape, dtype=np.float32)
+        for src, band in zip(self.datasets, out):
+            self._read_into(src, window, band)
+        return out
+
+    def blocks(self) -> Iterator[Tuple[Window, np.ndarray]]:
+        """
+        Yields `(window, block)` for every block of the stack. `block` is a
+        view into a preallocated buffer that is reused, so it's only valid
+        until the next block is requested.
+        """
+        windows = self.block_windows()
+        if not windows:
+            return
+        height = max(int(window.height) for window in windows)
+        width = max(int(window.width) for window in windows)
+        buffers = [
+            np.empty((len(self.datasets), height, width), dtype=np.float32)
+            for _ in range(2 if self.prefetch else 1)
+        ]
+
+        def view(index: int) -> np.ndarray:
+            window = windows[index]
+            buffer = buffers[index % len(buffers)]
+            return buffer[:, : int(window.height), : int(window.width)]
+
+        if not self.prefetch:
+            for index, window in enumerate(windows):
+                yield window, self.read(window, out=view(index))
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers or len(self.datasets)
+        ) as pool:
+
+            def submit(index: int) -> List[Future]:
+                return [
+                    pool.submit(self._read_into, src, windows[index], band)
+                    for src, band in zip(self.datasets, view(index))
+                ]
+
+            pending = submit(0)
+            for index, window in enumerate(windows):
+                for future in pending:
+                    future.result()
+                pending = submit(index + 1) if index + 1 < len(windows) else []
+                yield window, view(index)
@@ -0,0 +1,71 @@
+import numpy as np
+from django.test import SimpleTestCase
+from rasterio.transform import Affine, from_origin
+from shapely.geometry import Point, box, mapping
+
+from gis.coverage import coverage_fraction
+
+
+def brute_force_coverage(geometry, out_shape, transform):
+    coverage = np.zeros(out_shape)
+    for row in range(out_shape[0]):
+        for col in range(out_shape[1]):
+            x0, y0 = transform * (col, row)
+            x1, y1 = transform * (col + 1, row + 1)
+            pixel = box(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+            coverage[row, col] = pixel.intersection(geometry).area / pixel.area
+    return coverage
+
+
+class CoverageFractionTest(SimpleTestCase):
+    def setUp(self):
+        self.transform = from_origin(0, 20, 1, 1)
+        self.shape = (20, 20)
+
+    def test_returns_float32_weights(self):
+        coverage = coverage_fraction(box(2, 2, 5, 5), self.shape, self.transform)
+
+        self.assertEqual(coverage.dtype, np.float32)
+        self.assertEqual(coverage.shape, self.shape)
+
+    def test_pixel_aligned_box_is_fully_covered(self):
+        coverage = coverage_fraction(box(2, 2, 5, 5), self.shape, self.transform)
+
+        self.assertEqual(coverage.sum(), 9)
+        self.assertTrue(np.all(coverage[15:18, 2:5] == 1.0))
+
+    def test_partial_pixels_match_exact_intersection(self):
+        geometry = Point(10, 10).buffer(6.3).difference(Point(10, 10).buffer(2.2))
+
+        coverage = coverage_fraction(geometry, self.shape, self.transform)
+
+        np.testing.assert_allclose(
+            coverage,
+            brute_force_coverage(geometry, self.shape, self.transform),
+            atol=1e-6,
+        )
+        self.assertAlmostEqual(float(coverage.sum()), geometry.area, places=3)
+
+    def test_accepts_geojson_mappings(self):
+        geometry = box(0.5, 19.5, 1.5, 20)
+
+        coverage = coverage_fraction(mapping(geometry), self.shape, self.transform)
+
+        self.assertAlmostEqual(float(coverage[0, 0]), 0.25)
+        self.assertAlmostEqual(float(coverage[0, 1]), 0.25)
+        self.assertEqual(float(coverage.sum()), 0.5)
+
+    def test_rotated_transform_conserves_area(self):
+        transform = self.transform * Affine.rotation(10)
+        geometry = Point(8, 12).buffer(4)
+
+        coverage = coverage_fraction(geometry, self.shape, transform)
+
+        self.assertAlmostEqual(
+            float(coverage.sum()) * abs(transform.determinant), geometry.area, places=3
+        )
+
+    def test_geometry_outside_grid_returns_zeros(self):
+        coverage = coverage_fraction(box(50, 50, 60, 60), self.shape, self.transform)
+
+        self.assertFalse(coverage.any())
@@ -6,10 +6,14 @@ import numpy as np
 import rasterio
 from django.test import SimpleTestCase
 from fiona.transform import transform_geom
-from rasterio.transform import Affine
+from rasterio.mask import mask
+from rasterio.transform import Affine, from_origin
+from rio_cogeo.cogeo import cog_validate
+from shapely.geometry import Point, box, mapping
 from typing import Any, Dict
 
-from gis.rasters import get_profile, warp
+from gis.info import info_raster
+from gis.rasters import clip_to_cog, get_profile, to_planscape_cog, warp
 
 
 def get_geojson_test_features():
@@ -117,3 +121,89 @@ class WarpNodataPropagationTest(SimpleTestCase):
             # untagged 0 that would be indistinguishable from real data.
             self.assertEqual(data[0, 0], -9999.0)
             self.assertEqual(data[data.shape[0] // 2, data.shape[1] // 2], 7.0)
+
+
+def write_random_raster(path: Path, crs: str = "EPSG:3857", transform=None) -> None:
+    rng = np.random.default_rng(42)
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=600,
+        width=700,
+        count=1,
+        dtype=np.float32,
+        crs=crs,
+        transform=transform or from_origin(0, 18000, 30, 30),
+        nodata=-9999.0,
+        tiled=True,
+        blockxsize=256,
+        blockysize=256,
+    ) as dst:
+        dst.write(rng.uniform(0, 100, (600, 700)).astype(np.float32), 1)
+
+
+class ClipToCogTest(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+        self.input_path = self.tmp_dir / "input.tif"
+        write_random_raster(self.input_path)
+        self.geometry = mapping(
+            Point(9000, 9000).buffer(6000).union(Point(16000, 3000).buffer(1500))
+        )
+
+    def assert_matches_mask(self, in_memory_max_pixels: int) -> None:
+        output_path = self.tmp_dir / "output.tif"
+
+        info = clip_to_cog(
+            input_file=str(self.input_path),
+            geometry=self.geometry,
+            output_file=str(output_path),
+            in_memory_max_pixels=in_memory_max_pixels,
+        )
+
+        with rasterio.open(self.input_path) as src:
+            expected, expected_transform = mask(src, [self.geometry], crop=True)
+        with rasterio.open(output_path) as dst:
+            np.testing.assert_array_equal(dst.read(), expected)
+            self.assertEqual(dst.transform, expected_transform)
+        self.assertEqual(info, info_raster(str(output_path)))
+        is_valid, _errors, _warnings = cog_validate(str(output_path), quiet=True)
+        self.assertTrue(is_valid)
+
+    def test_small_clip_staged_in_memory_matches_mask(self):
+        self.assert_matches_mask(in_memory_max_pixels=10_000_000)
+
+    def test_large_clip_written_blockwise_matches_mask(self):
+        self.assert_matches_mask(in_memory_max_pixels=1_000)
+
+    def test_geometry_outside_raster_raises(self):
+        with self.assertRaises(ValueError):
+            clip_to_cog(
+                input_file=str(self.input_path),
+                geometry=mapping(box(50000, 50000, 60000, 60000)),
+                output_file=str(self.tmp_dir / "output.tif"),
+            )
+
+
+class ToPlanscapeCogTest(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+
+    def test_warps_and_returns_info_of_written_cog(self):
+        input_path = self.tmp_dir / "input.tif"
+        output_path = self.tmp_dir / "output.tif"
+        write_random_raster(
+            input_path,
+            crs="EPSG:4326",
+            transform=from_origin(-120, 40, 0.0003, 0.0003),
+        )
+
+        info = to_planscape_cog(str(input_path), str(output_path))
+
+        self.assertEqual(info["crs"], "EPSG:3857")
+        self.assertEqual(info, info_raster(str(output_path)))
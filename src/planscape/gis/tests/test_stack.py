@@ -0,0 +1,100 @@
+import tempfile
+from pathlib import Path
+from typing import Optional
+from unittest import mock
+
+import numpy as np
+import rasterio
+from django.test import SimpleTestCase
+from rasterio.transform import from_origin
+
+from gis.stack import RasterStack
+
+
+def write_raster(
+    path: Path,
+    data: np.ndarray,
+    nodata: Optional[float] = -9999.0,
+    blocksize: int = 16,
+) -> str:
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        height=data.shape[0],
+        width=data.shape[1],
+        count=1,
+        dtype=data.dtype,
+        crs="EPSG:3857",
+        transform=from_origin(0, 1000, 10, 10),
+        nodata=nodata,
+        tiled=True,
+        blockxsize=blocksize,
+        blockysize=blocksize,
+    ) as dst:
+        dst.write(data, 1)
+    return str(path)
+
+
+class RasterStackTest(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+        rng = np.random.default_rng(7)
+        self.first = rng.uniform(0, 100, (40, 50)).astype(np.float32)
+        self.first[3, 4] = -9999.0
+        self.second = rng.integers(0, 100, (40, 50)).astype(np.int16)
+        self.second[5, 6] = -1
+        self.paths = [
+            write_raster(self.tmp_dir / "first.tif", self.first),
+            write_raster(self.tmp_dir / "second.tif", self.second, nodata=-1),
+        ]
+
+    def assert_reads_every_block(self, prefetch: bool) -> None:
+        result = np.zeros((2, 40, 50), dtype=np.float32)
+
+        with RasterStack(self.paths, prefetch=prefetch) as stack:
+            for window, block in stack.blocks():
+                self.assertEqual(block.dtype, np.float32)
+                rows, cols = window.toslices()
+                result[:, rows, cols] = block
+
+        expected = np.stack([self.first, self.second.astype(np.float32)])
+        expected[0, 3, 4] = np.nan
+        expected[1, 5, 6] = np.nan
+        np.testing.assert_array_equal(result, expected)
+
+    def test_blocks_with_prefetch(self):
+        self.assert_reads_every_block(prefetch=True)
+
+    def test_blocks_without_prefetch(self):
+        self.assert_reads_every_block(prefetch=False)
+
+    def test_opens_each_dataset_once(self):
+        with mock.patch("gis.stack.rasterio.open", wraps=rasterio.open) as open_mock:
+            with RasterStack(self.paths) as stack:
+                blocks = sum(1 for _ in stack.blocks())
+
+        self.assertGreater(blocks, 1)
+        self.assertEqual(open_mock.call_count, len(self.paths))
+
+    def test_profile_and_nodata_come_from_first_raster(self):
+        with RasterStack(self.paths) as stack:
+            self.assertEqual(stack.nodata, -9999.0)
+            self.assertEqual(stack.profile["width"], 50)
+
+    def test_nodata_defaults_when_first_raster_has_none(self):
+        path = write_raster(self.tmp_dir / "no_nodata.tif", self.first, nodata=None)
+
+        with RasterStack([path], nodata=-1) as stack:
+            self.assertEqual(stack.nodata, -1)
+
+    def test_pixels_outside_a_smaller_raster_are_nan(self):
+        smaller = write_raster(self.tmp_dir / "smaller.tif", self.first[:20, :20])
+
+        with RasterStack([self.paths[0], smaller]) as stack:
+            block = stack.read(rasterio.windows.Window(0, 0, 50, 40))
+
+        self.assertTrue(np.isnan(block[1, 20:, :]).all())
+        np.testing.assert_array_equal(block[1, 10:20, 10:20], self.first[10:20, 10:20])
@@ -0,0 +1,118 @@
+import math
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+
+from impacts.models import (
+    AVAILABLE_YEARS,
+    ProjectAreaTreatmentResult,
+    TreatmentPlan,
+    TreatmentResult,
+)
+from impacts.services import (
+    calculate_impacts,
+    calculate_impacts_for_treatment_plan,
+    calculate_impacts_for_untreated_stands,
+    get_calculation_matrix,
+    get_calculation_matrix_wo_action,
+)
+
+RESULT_FIELDS = ("value", "baseline", "delta", "action", "forested_rate")
+PROJECT_AREA_RESULT_FIELDS = ("value", "baseline", "delta", "stand_count")
+
+
+def snapshot(treatment_plan: TreatmentPlan):
+    results = {
+        (r["stand_id"], r["variable"], r["year"], r["aggregation"]): r
+        for r in TreatmentResult.objects.filter(treatment_plan=treatment_plan).values(
+            "stand_id", "variable", "year", "aggregation", *RESULT_FIELDS
+        )
+    }
+    project_area_results = {
+        (r["project_area_id"], r["variable"], r["year"], r["action"]): r
+        for r in ProjectAreaTreatmentResult.objects.filter(
+            treatment_plan=treatment_plan
+        ).values(
+            "project_area_id", "variable", "year", "action", *PROJECT_AREA_RESULT_FIELDS
+        )
+    }
+    return results, project_area_results
+
+
+def delete_results(treatment_plan: TreatmentPlan) -> None:
+    TreatmentResult.objects.filter(treatment_plan=treatment_plan).delete()
+    ProjectAreaTreatmentResult.objects.filter(treatment_plan=treatment_plan).delete()
+
+
+def count_mismatches(expected, actual, fields) -> int:
+    mismatches = len(expected.keys() ^ actual.keys())
+    for key in expected.keys() & actual.keys():
+        for field in fields:
+            old, new = expected[key][field], actual[key][field]
+            if isinstance(old, float) and isinstance(new, float):
+                mismatches += not math.isclose(old, new, rel_tol=1e-9, abs_tol=1e-12)
+            else:
+                mismatches += old != new
+    return mismatches
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the per variable/action/year impacts calculation (what the "
+        "chord of tasks runs) against the fused calculation for a treatment "
+        "plan and checks that both produce the same results. Every change is "
+        "rolled back at the end."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("treatment_plan", type=int, help="Treatment Plan ID.")
+
+    def handle(self, *args, **options):
+        try:
+            treatment_plan = TreatmentPlan.objects.select_related("scenario").get(
+                pk=options["treatment_plan"]
+            )
+        except TreatmentPlan.DoesNotExist:
+            raise CommandError("Treatment Plan does not exist.")
+
+        with transaction.atomic():
+            # calculates the missing stand metrics so both runs start warm
+            start = time.perf_counter()
+            calculate_impacts_for_treatment_plan(treatment_plan)
+            warmup_elapsed = time.perf_counter() - start
+            delete_results(treatment_plan)
+
+            matrix = get_calculation_matrix(treatment_plan, years=AVAILABLE_YEARS)
+            untreated_matrix = get_calculation_matrix_wo_action(years=AVAILABLE_YEARS)
+            start = time.perf_counter()
+            for variable, action, year in matrix:
+                calculate_impacts(treatment_plan, variable, action, year)
+            for variable, year in untreated_matrix:
+                calculate_impacts_for_untreated_stands(treatment_plan, variable, year)
+            chord_elapsed = time.perf_counter() - start
+            expected, expected_project_areas = snapshot(treatment_plan)
+            delete_results(treatment_plan)
+
+            start = time.perf_counter()
+            calculate_impacts_for_treatment_plan(treatment_plan)
+            fused_elapsed = time.perf_counter() - start
+            actual, actual_project_areas = snapshot(treatment_plan)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{len(matrix) + len(untreated_matrix)} chord tasks, "
+            f"{len(expected)} treatment results, "
+            f"{len(expected_project_areas)} project area results"
+        )
+        self.stdout.write(f"warm-up (metrics): {warmup_elapsed:.2f}s")
+        self.stdout.write(f"chord (sequential): {chord_elapsed:.2f}s")
+        self.stdout.write(f"fused:              {fused_elapsed:.2f}s")
+        self.stdout.write(f"speedup:            {chord_elapsed / fused_elapsed:.1f}x")
+        self.stdout.write(
+            "mismatched values: "
+            f"{count_mismatches(expected, actual, RESULT_FIELDS)} treatment results, "
+            f"{count_mismatches(expected_project_areas, actual_project_areas, PROJECT_AREA_RESULT_FIELDS)} "
+            "project area results"
+        )
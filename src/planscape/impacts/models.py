@@ -15,7 +15,7 @@ from django.contrib.gis.db import models
 from django.contrib.gis.db.models import Union as UnionOp
 from django.db.models import QuerySet
 from django_stubs_ext.db.models import TypedModelMeta
-from planning.models import ProjectArea, Scenario
+from planning.models import PlanningArea, ProjectArea, Scenario
 from stands.models import Stand, StandSizeChoices
 from typing_extensions import Self
 
@@ -34,11 +34,11 @@ class TreatmentPlanManager(AliveObjectsManager):
     def list_by_user(self, user: Optional[User]):
         if not user:
             return self.get_queryset().none()
-        # this will become super slow when the database get's bigger
-        scenarios = Scenario.objects.list_by_user(user=user).values_list(
-            "id", flat=True
+        return self.get_queryset().filter(
+            scenario__planning_area_id__in=PlanningArea.objects.ids_by_user(user),
+            scenario__deleted_at__isnull=True,
+            scenario__planning_area__deleted_at__isnull=True,
         )
-        return self.get_queryset().filter(scenario_id__in=scenarios)
 
 
 class TreatmentPlan(
@@ -89,7 +89,9 @@ class TreatmentPlan(
         )["geometry"]
         if not geometry:
             return Stand.objects.none()
-        return Stand.objects.within_polygon(geometry, self.get_stand_size())
+        return self.scenario.planning_area.get_stands_within(
+            geometry, self.get_stand_size()
+        )
 
     class Meta(TypedModelMeta):
         verbose_name = "Treatment Plan"
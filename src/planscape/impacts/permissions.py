@@ -2,7 +2,7 @@ from collaboration.models import Role
 from collaboration.permissions import CheckPermissionMixin
 from collaboration.utils import (
     check_for_owner_permission,
-    check_for_permission,
+    has_permission,
     is_creator,
 )
 from django.contrib.auth.models import AbstractUser
@@ -54,16 +54,14 @@ class TreatmentPlanPermission(CheckPermissionMixin):
         if is_creator(user, tx_plan.scenario.planning_area):
             return True
 
-        return check_for_permission(
-            user.id, tx_plan.scenario.planning_area, "view_tx_plan"
-        )
+        return has_permission(user, tx_plan.scenario.planning_area, "view_tx_plan")
 
     @staticmethod
     def can_add(user: AbstractUser, scenario: Scenario):
         if is_creator(user, scenario.planning_area):
             return True
 
-        return check_for_permission(user.id, scenario.planning_area, "add_tx_plan")
+        return has_permission(user, scenario.planning_area, "add_tx_plan")
 
     @staticmethod
     def can_change(user: AbstractUser, tx_plan: TreatmentPlan):
@@ -73,9 +71,7 @@ class TreatmentPlanPermission(CheckPermissionMixin):
         ):
             return True
 
-        return check_for_permission(
-            user.id, tx_plan.scenario.planning_area, "edit_tx_plan"
-        )
+        return has_permission(user, tx_plan.scenario.planning_area, "edit_tx_plan")
 
     @staticmethod
     def can_remove(user: AbstractUser, tx_plan: TreatmentPlan) -> bool:
@@ -85,15 +81,15 @@ class TreatmentPlanPermission(CheckPermissionMixin):
         if tx_plan.created_by.pk == user.pk:
             return True
 
-        return check_for_permission(
-            user.id,
+        return has_permission(
+            user,
             tx_plan.scenario.planning_area,
             "remove_tx_plan",
         )
 
     @staticmethod
     def can_clone(user: AbstractUser, tx_plan: TreatmentPlan) -> bool:
-        return is_creator(user, tx_plan.scenario.planning_area) or check_for_permission(
+        return is_creator(user, tx_plan.scenario.planning_area) or has_permission(
             user,
             tx_plan.scenario.planning_area,
             "clone_tx_plan",
@@ -224,14 +220,14 @@ class TreatmentPlanNotePermission(CheckPermissionMixin):
         planning_area = treatment_plan_note.treatment_plan.scenario.planning_area
         if is_creator(user, planning_area):
             return True
-        return check_for_permission(user.id, planning_area, "view_planningarea")
+        return has_permission(user, planning_area, "view_planningarea")
 
     @staticmethod
     def can_add(user: AbstractUser, treatment_plan: TreatmentPlan):
         planning_area = treatment_plan.scenario.planning_area
         if is_creator(user, planning_area):
             return True
-        return check_for_permission(user.id, planning_area, "view_planningarea")
+        return has_permission(user, planning_area, "view_planningarea")
 
     @staticmethod
     def can_remove(user: AbstractUser, treatment_plan_note: TreatmentPlanNote):
@@ -1,11 +1,13 @@
 import itertools
 import json
 import logging
+import math
 from collections import defaultdict
 from pathlib import Path
 from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple, Union
 
 import fiona
+import numpy as np
 import rasterio
 from actstream import action as actstream_action
 from core.flags import feature_enabled
@@ -371,22 +373,22 @@ def to_project_area_result(
     year: int,
     result: Dict[str, Any],
 ) -> ProjectAreaTreatmentResult:
-    instance, created = ProjectAreaTreatmentResult.objects.update_or_create(
+    """Transforms a project area delta into an unsaved
+    ProjectAreaTreatmentResult, see `bulk_upsert_project_area_results`.
+    """
+    return ProjectAreaTreatmentResult(
         treatment_plan=treatment_plan,
         project_area_id=result.get("project_area_id"),
         variable=variable,
         year=year,
         aggregation=result.get("aggregation"),
         action=result.get("action"),
-        defaults={
-            "value": result.get("value"),
-            "baseline": result.get("baseline"),
-            "delta": result.get("delta"),
-            "type": TreatmentResultType.DIRECT,
-            "stand_count": result.get("stand_count"),
-        },
+        value=result.get("value"),
+        baseline=result.get("baseline"),
+        delta=result.get("delta"),
+        type=TreatmentResultType.DIRECT,
+        stand_count=result.get("stand_count"),
     )
-    return instance
 
 
 def to_treatment_result(
@@ -396,9 +398,9 @@ def to_treatment_result(
     result: Dict[str, Any],
 ) -> TreatmentResult:
     """Transforms the result/output of rasterstats (a zonal statistic record)
-    into a TreamentResult
+    into an unsaved TreamentResult, see `bulk_upsert_treatment_results`.
     """
-    instance, created = TreatmentResult.objects.update_or_create(
+    return TreatmentResult(
         treatment_plan_id=treatment_plan.id,
         stand_id=result.get("stand_id"),
         variable=variable,
@@ -406,15 +408,99 @@ def to_treatment_result(
             result.get("aggregation") if result else ImpactVariableAggregation.MEAN
         ),
         year=year,
-        defaults={
-            "value": result.get("value"),
-            "baseline": result.get("baseline"),
-            "delta": result.get("delta"),
-            "action": result.get("action"),
-            "forested_rate": result.get("forested_rate"),
-        },
+        value=result.get("value"),
+        baseline=result.get("baseline"),
+        delta=result.get("delta"),
+        action=result.get("action"),
+        forested_rate=result.get("forested_rate"),
+    )
+
+
+TREATMENT_RESULTS_BATCH_SIZE = 5_000
+
+
+def bulk_upsert_treatment_results(
+    results: Iterable[TreatmentResult],
+    batch_size: int = TREATMENT_RESULTS_BATCH_SIZE,
+) -> int:
+    """Writes treatment results with INSERT ... ON CONFLICT DO UPDATE on
+    (treatment_plan, stand, variable, year, aggregation). Like
+    `update_or_create`, `type` and `created_at` are only set on insert.
+    Returns the number of rows written.
+    """
+    total = 0
+    results = iter(results)
+    while batch := list(itertools.islice(results, batch_size)):
+        TreatmentResult.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=[
+                "treatment_plan",
+                "stand",
+                "variable",
+                "year",
+                "aggregation",
+            ],
+            update_fields=["value", "baseline", "delta", "action", "forested_rate"],
+        )
+        total += len(batch)
+    return total
+
+
+def bulk_upsert_project_area_results(
+    results: Iterable[ProjectAreaTreatmentResult],
+    batch_size: int = TREATMENT_RESULTS_BATCH_SIZE,
+) -> int:
+    """Writes project area results with INSERT ... ON CONFLICT DO UPDATE on
+    (treatment_plan, project_area, variable, aggregation, year, action).
+    Like `update_or_create`, `created_at` is only set on insert. Returns the
+    number of rows written.
+    """
+    total = 0
+    results = iter(results)
+    while batch := list(itertools.islice(results, batch_size)):
+        ProjectAreaTreatmentResult.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=[
+                "treatment_plan",
+                "project_area",
+                "variable",
+                "aggregation",
+                "year",
+                "action",
+            ],
+            update_fields=["value", "baseline", "delta", "type", "stand_count"],
+        )
+        total += len(batch)
+    return total
+
+
+def calculate_missing_stand_metrics(
+    stand_ids: Collection[int],
+    datalayer: DataLayer,
+) -> None:
+    """Calculates the metrics of `datalayer` for the stands in `stand_ids`
+    that don't have them yet."""
+    missing_stand_ids = get_missing_stand_ids_for_datalayer_from_stand_list(
+        stand_ids=stand_ids, datalayer=datalayer
     )
-    return instance
+    if len(missing_stand_ids) <= 0:
+        return
+
+    if feature_enabled("API_ZONAL_STATS"):
+        batch_size = settings.STAND_METRICS_PAGE_SIZE
+        for i in range(0, len(missing_stand_ids), batch_size):
+            batch_stand_ids = list(missing_stand_ids)[i : i + batch_size]
+            missing_stands = Stand.objects.filter(id__in=batch_stand_ids)
+            calculate_stand_zonal_stats_api(stands=missing_stands, datalayer=datalayer)
+    else:
+        missing_stands = Stand.objects.filter(id__in=missing_stand_ids)
+        with rasterio.Env(get_storage_session()):
+            calculate_stand_zonal_stats(
+                stands=missing_stands,
+                datalayer=datalayer,
+            )
 
 
 def calculate_impacts(
@@ -442,25 +528,7 @@ def calculate_impacts(
         year=year,
     )
 
-    missing_stand_ids = get_missing_stand_ids_for_datalayer_from_stand_list(
-        stand_ids=stand_ids, datalayer=baseline_layer
-    )
-    if len(missing_stand_ids) > 0:
-        if feature_enabled("API_ZONAL_STATS"):
-            batch_size = settings.STAND_METRICS_PAGE_SIZE
-            for i in range(0, len(missing_stand_ids), batch_size):
-                batch_stand_ids = list(missing_stand_ids)[i : i + batch_size]
-                missing_stands = Stand.objects.filter(id__in=batch_stand_ids)
-                calculate_stand_zonal_stats_api(
-                    stands=missing_stands, datalayer=baseline_layer
-                )
-        else:
-            missing_stands = Stand.objects.filter(id__in=missing_stand_ids)
-            with rasterio.Env(get_storage_session()):
-                calculate_stand_zonal_stats(
-                    stands=missing_stands,
-                    datalayer=baseline_layer,
-                )
+    calculate_missing_stand_metrics(stand_ids=stand_ids, datalayer=baseline_layer)
     baseline_metrics = StandMetric.objects.filter(
         stand_id__in=stand_ids,
         datalayer=baseline_layer,
@@ -472,25 +540,7 @@ def calculate_impacts(
         year=year,
     )
 
-    missing_stand_ids = get_missing_stand_ids_for_datalayer_from_stand_list(
-        stand_ids=stand_ids, datalayer=action_layer
-    )
-    if len(missing_stand_ids) > 0:
-        if feature_enabled("API_ZONAL_STATS"):
-            batch_size = settings.STAND_METRICS_PAGE_SIZE
-            for i in range(0, len(missing_stand_ids), batch_size):
-                batch_stand_ids = list(missing_stand_ids)[i : i + batch_size]
-                missing_stands = Stand.objects.filter(id__in=batch_stand_ids)
-                calculate_stand_zonal_stats_api(
-                    stands=missing_stands, datalayer=action_layer
-                )
-        else:
-            missing_stands = Stand.objects.filter(id__in=missing_stand_ids)
-            with rasterio.Env(get_storage_session()):
-                calculate_stand_zonal_stats(
-                    stands=missing_stands,
-                    datalayer=action_layer,
-                )
+    calculate_missing_stand_metrics(stand_ids=stand_ids, datalayer=action_layer)
     action_metrics = StandMetric.objects.filter(
         stand_id__in=stand_ids,
         datalayer=action_layer,
@@ -530,6 +580,7 @@ def calculate_impacts(
             project_area_deltas,
         )
     )
+    bulk_upsert_project_area_results(project_area_results)
 
     treatment_results = list(
         map(
@@ -542,6 +593,7 @@ def calculate_impacts(
             deltas_list,
         )
     )
+    bulk_upsert_treatment_results(treatment_results)
 
     return (treatment_results, project_area_results)
 
@@ -613,25 +665,9 @@ def calculate_impacts_for_untreated_stands(
         action=None,
         year=year,
     )
-    missing_stand_ids = get_missing_stand_ids_for_datalayer_from_stand_list(
+    calculate_missing_stand_metrics(
         stand_ids=list(untreated_stand_ids), datalayer=baseline_layer
     )
-    if len(missing_stand_ids) > 0:
-        if feature_enabled("API_ZONAL_STATS"):
-            batch_size = settings.STAND_METRICS_PAGE_SIZE
-            for i in range(0, len(missing_stand_ids), batch_size):
-                batch_stand_ids = list(missing_stand_ids)[i : i + batch_size]
-                missing_stands = Stand.objects.filter(id__in=batch_stand_ids)
-                calculate_stand_zonal_stats_api(
-                    stands=missing_stands, datalayer=baseline_layer
-                )
-        else:
-            missing_stands = Stand.objects.filter(id__in=missing_stand_ids)
-            with rasterio.Env(get_storage_session()):
-                calculate_stand_zonal_stats(
-                    stands=missing_stands,
-                    datalayer=baseline_layer,
-                )
     baseline_metrics = StandMetric.objects.filter(
         stand_id__in=untreated_stand_ids,
         datalayer=baseline_layer,
@@ -662,10 +698,241 @@ def calculate_impacts_for_untreated_stands(
             deltas_list,
         )
     )
+    bulk_upsert_treatment_results(treatment_results)
 
     return treatment_results
 
 
+def _to_optional(values: np.ndarray) -> List[Optional[float]]:
+    return [None if math.isnan(value) else value for value in values.tolist()]
+
+
+def get_stand_metric_arrays(
+    datalayer: DataLayer,
+    stand_ids: np.ndarray,
+    attribute: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns, for the sorted `stand_ids`, whether a metric of `datalayer`
+    exists, its `attribute` value (NaN when null) and its count (0 when
+    null).
+    """
+    exists = np.zeros(len(stand_ids), dtype=bool)
+    values = np.full(len(stand_ids), np.nan)
+    counts = np.zeros(len(stand_ids), dtype=np.int64)
+    metrics = list(
+        StandMetric.objects.filter(
+            datalayer=datalayer,
+            stand_id__in=stand_ids.tolist(),
+        ).values_list("stand_id", attribute, "count")
+    )
+    if not metrics:
+        return exists, values, counts
+
+    metric_stand_ids, metric_values, metric_counts = zip(*metrics)
+    positions = np.searchsorted(stand_ids, np.array(metric_stand_ids))
+    exists[positions] = True
+    values[positions] = np.array(metric_values, dtype=np.float64)
+    counts[positions] = np.array(
+        [count or 0 for count in metric_counts], dtype=np.int64
+    )
+    return exists, values, counts
+
+
+def calculate_deltas(values: np.ndarray, baselines: np.ndarray) -> np.ndarray:
+    """Vectorized `calculate_delta`, NaN standing for None."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deltas = (values - baselines) / baselines
+    non_forested = np.isnan(baselines) | (values == 0) | (baselines == 0)
+    deltas[non_forested] = 0
+    deltas[np.isnan(values) & np.isnan(baselines)] = np.nan
+    return deltas
+
+
+def get_forested_rates(counts: np.ndarray, stand_size: StandSizeChoices) -> np.ndarray:
+    """Vectorized `get_forested_rate`. Rates only depend on the pixel count,
+    so each distinct count is truncated once."""
+    unique_counts, inverse = np.unique(counts, return_inverse=True)
+    pixels = float(pixels_from_size(stand_size))
+    rates = np.array(
+        [
+            truncate_result(value=float(count) / pixels, quantize=".0001")
+            for count in unique_counts.tolist()
+        ]
+    )
+    return rates[inverse]
+
+
+def calculate_impacts_for_treatment_plan(
+    treatment_plan: TreatmentPlan,
+    variables: Optional[Collection[ImpactVariable]] = None,
+    years: Collection[int] = AVAILABLE_YEARS,
+) -> Tuple[int, int]:
+    """Calculates and persists the impacts of every variable, action and
+    year of a treatment plan, for treated and untreated stands, at once.
+
+    Equivalent to running `calculate_impacts` for every item of
+    `get_calculation_matrix` plus `calculate_impacts_for_untreated_stands`
+    for every item of `get_calculation_matrix_wo_action`, but prescriptions
+    and project area stands are loaded once, the metrics of each layer are
+    fetched once into arrays indexed by stand, deltas are calculated with
+    NumPy and results are bulk upserted.
+
+    Returns the number of treatment results and project area results written.
+    """
+    variables = list(variables or ImpactVariable)
+    stand_size = treatment_plan.get_stand_size()
+    attribute = ImpactVariableAggregation.get_metric_attribute(
+        ImpactVariableAggregation.MEAN
+    )
+
+    prescriptions = list(
+        treatment_plan.tx_prescriptions.values_list("stand_id", "action")
+    )
+    treated_stand_ids = [stand_id for stand_id, _action in prescriptions]
+    untreated_stand_ids = list(
+        treatment_plan.get_project_areas_stands()
+        .exclude(id__in=treated_stand_ids)
+        .values_list("id", flat=True)
+    )
+    stand_ids = np.unique(
+        np.array(treated_stand_ids + untreated_stand_ids, dtype=np.int64)
+    )
+    actions = sorted(
+        {TreatmentPrescriptionAction(action) for _, action in prescriptions}
+    )
+
+    # index of the prescription action of each stand, -1 for untreated stands
+    action_index = np.full(len(stand_ids), -1, dtype=np.int64)
+    if prescriptions:
+        positions = np.searchsorted(stand_ids, np.array(treated_stand_ids))
+        action_index[positions] = [
+            actions.index(TreatmentPrescriptionAction(action))
+            for _, action in prescriptions
+        ]
+    untreated = action_index < 0
+    action_masks = [action_index == i for i in range(len(actions))]
+    result_actions = np.array([None, *actions], dtype=object)[action_index + 1]
+
+    project_area_masks = [
+        (
+            project_area.pk,
+            np.isin(
+                stand_ids,
+                np.fromiter(
+                    project_area.get_stands(stand_size=stand_size).values_list(
+                        "id", flat=True
+                    ),
+                    dtype=np.int64,
+                ),
+            ),
+        )
+        for project_area in treatment_plan.scenario.project_areas.all()
+    ]
+
+    treatment_results_count = 0
+    project_area_results_count = 0
+    for variable, year in itertools.product(variables, years):
+        if year not in AVAILABLE_YEARS:
+            raise ValueError(f"Year {year} not supported")
+
+        baseline_layer = ImpactVariable.get_datalayer(
+            impact_variable=variable,
+            action=None,
+            year=year,
+        )
+        calculate_missing_stand_metrics(
+            stand_ids=stand_ids.tolist(), datalayer=baseline_layer
+        )
+        baseline_exists, baselines, baseline_counts = get_stand_metric_arrays(
+            baseline_layer, stand_ids, attribute
+        )
+
+        # untreated stands use the baseline as action metric
+        action_exists = np.where(untreated, baseline_exists, False)
+        action_values = np.where(untreated, baselines, np.nan)
+        action_counts = np.where(untreated, baseline_counts, 0)
+        for action, action_mask in zip(actions, action_masks):
+            action_layer = ImpactVariable.get_datalayer(
+                impact_variable=variable,
+                action=action,
+                year=year,
+            )
+            action_stand_ids = stand_ids[action_mask]
+            calculate_missing_stand_metrics(
+                stand_ids=action_stand_ids.tolist(), datalayer=action_layer
+            )
+            exists, values, counts = get_stand_metric_arrays(
+                action_layer, action_stand_ids, attribute
+            )
+            action_exists[action_mask] = exists
+            action_values[action_mask] = values
+            action_counts[action_mask] = counts
+
+        # same as `metric.avg or baseline`
+        use_action = action_exists & ~np.isnan(action_values) & (action_values != 0)
+        values = np.where(use_action, action_values, baselines)
+        deltas = calculate_deltas(values, baselines)
+        forested_rates = get_forested_rates(action_counts, stand_size)
+        stand_actions = np.where(action_exists & ~untreated, result_actions, None)
+
+        rows = np.flatnonzero(baseline_exists)
+        treatment_results_count += bulk_upsert_treatment_results(
+            TreatmentResult(
+                treatment_plan=treatment_plan,
+                stand_id=stand_id,
+                variable=variable,
+                aggregation=ImpactVariableAggregation.MEAN,
+                year=year,
+                value=value,
+                baseline=baseline,
+                delta=delta,
+                action=stand_action,
+                forested_rate=forested_rate,
+            )
+            for stand_id, value, baseline, delta, stand_action, forested_rate in zip(
+                stand_ids[rows].tolist(),
+                _to_optional(values[rows]),
+                _to_optional(baselines[rows]),
+                _to_optional(deltas[rows]),
+                stand_actions[rows].tolist(),
+                forested_rates[rows].tolist(),
+            )
+        )
+
+        baseline_sums = np.where(baseline_exists, np.nan_to_num(baselines), 0)
+        action_sums = np.where(action_exists, np.nan_to_num(action_values), 0)
+        project_area_results = []
+        for project_area_id, project_area_mask in project_area_masks:
+            for action, action_mask in zip(actions, action_masks):
+                mask = project_area_mask & action_mask
+                baseline_sum = float(baseline_sums[mask].sum())
+                action_sum = float(action_sums[mask].sum())
+                project_area_results.append(
+                    ProjectAreaTreatmentResult(
+                        treatment_plan=treatment_plan,
+                        project_area_id=project_area_id,
+                        variable=variable,
+                        year=year,
+                        aggregation=ImpactVariableAggregation.MEAN,
+                        action=action,
+                        value=action_sum,
+                        baseline=baseline_sum,
+                        delta=calculate_delta(action_sum, baseline_sum),
+                        type=TreatmentResultType.DIRECT,
+                        stand_count=int((mask & action_exists).sum()),
+                    )
+                )
+        project_area_results_count += bulk_upsert_project_area_results(
+            project_area_results
+        )
+
+    log.info(
+        f"Calculated {treatment_results_count} treatment results and "
+        f"{project_area_results_count} project area results for {treatment_plan}."
+    )
+    return treatment_results_count, project_area_results_count
+
+
 def get_calculation_matrix(
     treatment_plan: TreatmentPlan,
     years: Optional[Collection[int]] = AVAILABLE_YEARS,
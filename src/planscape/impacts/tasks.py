@@ -4,6 +4,7 @@ from typing import Optional, Tuple
 from urllib.parse import urljoin
 
 from celery import chain, chord
+from core.flags import feature_enabled
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
@@ -21,6 +22,7 @@ from impacts.models import (
 )
 from impacts.services import (
     calculate_impacts,
+    calculate_impacts_for_treatment_plan,
     calculate_impacts_for_untreated_stands,
     get_calculation_matrix,
     get_calculation_matrix_wo_action,
@@ -130,6 +132,45 @@ def async_calculate_impacts_for_non_treated_stands_action_year(
         raise exc
 
 
+@app.task(
+    bind=True, autoretry_for=(OSError, RasterioIOError), retry_kwargs={"max_retries": 5}
+)
+def async_calculate_impacts_for_treatment_plan(
+    self,
+    treatment_plan_pk: int,
+) -> None:
+    """Calculates impacts for all variables, actions and years of a
+    treatment plan in a single task.
+
+    :param treatment_plan_pk: TreatmentPlan primary key
+    :type treatment_plan_pk: int
+    :return: None
+    """
+    log.info(f"Calculating all impacts for treatment plan {treatment_plan_pk}")
+    try:
+        treatment_plan = TreatmentPlan.objects.select_related("scenario").get(
+            pk=treatment_plan_pk
+        )
+        calculate_impacts_for_treatment_plan(treatment_plan=treatment_plan)
+    except TreatmentPlan.DoesNotExist:
+        log.warning(
+            "TreatmentPlan with pk %s does not exist or was deleted. Cannot calculate impacts.",
+            treatment_plan_pk,
+        )
+        return
+    except (OSError, RasterioIOError) as exc:
+        if self.request.retries >= self.max_retries:
+            log.exception("Task failed on all retries.")
+        else:
+            log.warning("Task failed. Retrying.")
+        raise exc
+    except Exception as exc:
+        log.exception(
+            "Task failed due to an unhandled exception. Not retrying execution."
+        )
+        raise exc
+
+
 @app.task()
 def async_set_status(
     treatment_plan_pk: int,
@@ -185,14 +226,7 @@ def async_calculate_persist_impacts_treatment_plan(
     user = User.objects.filter(pk=user_id).first()
     treatment_plan = TreatmentPlan.objects.get(pk=treatment_plan_pk)
 
-    calculation_matrix = get_calculation_matrix(
-        treatment_plan=treatment_plan,
-        years=AVAILABLE_YEARS,
-    )
-    untreated_stands_matrix = get_calculation_matrix_wo_action(
-        years=AVAILABLE_YEARS,
-    )
-    callback = chain(
+    on_success = chain(
         async_set_status.si(
             treatment_plan_pk=treatment_plan_pk,
             status=TreatmentPlanStatus.SUCCESS,
@@ -200,33 +234,48 @@ def async_calculate_persist_impacts_treatment_plan(
             user_id=user_id,
         ),
         async_send_email_process_finished.si(treatment_plan_pk=treatment_plan_pk),
-    ).on_error(
-        async_set_status.si(
-            treatment_plan_pk=treatment_plan_pk,
-            status=TreatmentPlanStatus.FAILURE,
-            start=False,
-            user_id=user_id,
-        )
     )
-    tasks = [
-        async_calculate_impacts_for_variable_action_year.si(
-            treatment_plan_pk=treatment_plan_pk,
-            variable=variable,
-            action=action,
-            year=year,
+    on_failure = async_set_status.si(
+        treatment_plan_pk=treatment_plan_pk,
+        status=TreatmentPlanStatus.FAILURE,
+        start=False,
+        user_id=user_id,
+    )
+    if feature_enabled("FUSED_IMPACTS"):
+        log.info("Firing a single task to calculate impacts!")
+        chain(
+            async_calculate_impacts_for_treatment_plan.si(
+                treatment_plan_pk=treatment_plan_pk
+            ),
+            on_success,
+        ).on_error(on_failure).apply_async()
+    else:
+        calculation_matrix = get_calculation_matrix(
+            treatment_plan=treatment_plan,
+            years=AVAILABLE_YEARS,
         )
-        for variable, action, year in calculation_matrix
-    ]
-    tasks += [
-        async_calculate_impacts_for_non_treated_stands_action_year.si(
-            treatment_plan_pk=treatment_plan_pk,
-            variable=variable,
-            year=year,
+        untreated_stands_matrix = get_calculation_matrix_wo_action(
+            years=AVAILABLE_YEARS,
         )
-        for variable, year in untreated_stands_matrix
-    ]
-    log.info(f"Firing {len(tasks)} tasks to calculate impacts!")
-    chord(tasks)(callback)
+        tasks = [
+            async_calculate_impacts_for_variable_action_year.si(
+                treatment_plan_pk=treatment_plan_pk,
+                variable=variable,
+                action=action,
+                year=year,
+            )
+            for variable, action, year in calculation_matrix
+        ]
+        tasks += [
+            async_calculate_impacts_for_non_treated_stands_action_year.si(
+                treatment_plan_pk=treatment_plan_pk,
+                variable=variable,
+                year=year,
+            )
+            for variable, year in untreated_stands_matrix
+        ]
+        log.info(f"Firing {len(tasks)} tasks to calculate impacts!")
+        chord(tasks)(on_success.on_error(on_failure))
     track_event(
         name="impacts.treatment_plan.run",
         properties={
@@ -3,10 +3,15 @@ from django.test import TestCase
 from datasets.models import DataLayerType
 from organizations.tests.factories import OrganizationFactory
 from datasets.tests.factories import DataLayerFactory
+from planning.tests.helpers import ListByUserQueryPlanMixin
+from planscape.tests.factories import UserFactory
+
 from impacts.models import (
     ImpactVariable,
+    TreatmentPlan,
     TreatmentPrescriptionAction,
 )
+from impacts.tests.factories import TreatmentPlanFactory
 
 
 class TestImpactVariable(TestCase):
@@ -74,3 +79,35 @@ class TestImpactVariable(TestCase):
             s3_path,
             "s3://planscape-control-dev/datalayers/1/Baseline_2024_cbh_3857_COG.tif",
         )
+
+
+class TreatmentPlanListByUserTest(ListByUserQueryPlanMixin, TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        shared = self.share_planning_area(self.user)
+        self.tx_plans = [
+            TreatmentPlanFactory(scenario__planning_area__user=self.user),
+            TreatmentPlanFactory(scenario__planning_area=shared),
+        ]
+        for _ in range(20):
+            TreatmentPlanFactory()
+        TreatmentPlanFactory(scenario__planning_area=shared).scenario.delete()
+
+        self.prepare_query_plan(
+            "planning_planningarea",
+            "planning_scenario",
+            "impacts_treatmentplan",
+            "collaboration_userobjectrole",
+        )
+
+    def test_list_by_user(self):
+        queryset = TreatmentPlan.objects.list_by_user(self.user)
+
+        self.assertCountEqual(queryset, self.tx_plans)
+        self.assertOnlyIndexScans(
+            queryset,
+            "planning_planningarea",
+            "planning_scenario",
+            "impacts_treatmentplan",
+            "collaboration_userobjectrole",
+        )
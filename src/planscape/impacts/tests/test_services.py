@@ -15,12 +15,13 @@ from planning.tests.factories import (
 )
 from stands.models import STAND_AREA_ACRES, Stand, StandSizeChoices
 from stands.calculator import calculate_delta
-from stands.tests.factories import StandFactory
+from stands.tests.factories import StandFactory, StandMetricFactory
 
 from impacts.models import (
     AVAILABLE_YEARS,
     ImpactVariable,
     ImpactVariableAggregation,
+    ProjectAreaTreatmentResult,
     TreatmentPlan,
     TreatmentPrescription,
     TreatmentPrescriptionAction,
@@ -29,6 +30,7 @@ from impacts.models import (
 )
 from impacts.services import (
     calculate_impacts,
+    calculate_impacts_for_treatment_plan,
     calculate_impacts_for_untreated_stands,
     classify_flame_length,
     classify_rate_of_spread,
@@ -619,6 +621,160 @@ class CalculateImpactsForUntreatedStandsTest(TestCase):
             self.assertEqual(treatment_result.delta, 0)
             self.assertIsNotNone(treatment_result.forested_rate)
 
+    def test_calculate_impacts_for_untreated_stands_upserts(self):
+        calculate_impacts_for_untreated_stands(
+            self.plan, ImpactVariable.CANOPY_BASE_HEIGHT, year=AVAILABLE_YEARS[0]
+        )
+        TreatmentResult.objects.update(value=-1, baseline=-1, delta=-1)
+
+        treatment_results = calculate_impacts_for_untreated_stands(
+            self.plan, ImpactVariable.CANOPY_BASE_HEIGHT, year=AVAILABLE_YEARS[0]
+        )
+
+        self.assertEqual(TreatmentResult.objects.count(), len(treatment_results))
+        self.assertTrue(all(result.pk for result in treatment_results))
+        self.assertFalse(TreatmentResult.objects.filter(delta=-1).exists())
+
+
+class CalculateImpactsForTreatmentPlanTest(TestCase):
+    def load_stands(self):
+        with open("impacts/tests/test_data/stands.geojson") as fp:
+            geojson = json.loads(fp.read())
+
+        features = geojson.get("features")
+        return list(
+            [
+                Stand.objects.create(
+                    geometry=GEOSGeometry(json.dumps(f.get("geometry")), srid=4326),
+                    size="LARGE",
+                    area_m2=1,
+                )
+                for f in features
+            ]
+        )
+
+    def create_layer(self, action=None):
+        return DataLayerFactory.create(
+            url="impacts/tests/test_data/test_raster.tif",
+            metadata={
+                "modules": {
+                    "impacts": {
+                        "year": self.year,
+                        "variable": str(self.variable).upper(),
+                        "action": (
+                            TreatmentPrescriptionAction.get_file_mapping(action)
+                            if action
+                            else None
+                        ),
+                        "baseline": action is None,
+                    }
+                }
+            },
+            type=DataLayerType.RASTER,
+        )
+
+    def setUp(self):
+        self.variable = ImpactVariable.CANOPY_BASE_HEIGHT
+        self.year = AVAILABLE_YEARS[0]
+        self.stands = self.load_stands()
+        self.plan = TreatmentPlanFactory.create()
+        stand_ids = [s.id for s in self.stands]
+        self.project_area = ProjectAreaFactory.create(
+            scenario=self.plan.scenario,
+            geometry=MultiPolygon(
+                [
+                    Stand.objects.filter(id__in=stand_ids).aggregate(
+                        geometry=Union("geometry")
+                    )["geometry"]
+                ]
+            ),
+        )
+        self.actions = [
+            TreatmentPrescriptionAction.HEAVY_MASTICATION,
+            TreatmentPrescriptionAction.MODERATE_THINNING_BIOMASS,
+        ]
+        for i, stand in enumerate(self.stands[:6]):
+            TreatmentPrescriptionFactory.create(
+                treatment_plan=self.plan,
+                project_area=self.project_area,
+                stand=stand,
+                action=self.actions[i % 2],
+                geometry=stand.geometry,
+            )
+
+        baseline_layer = self.create_layer()
+        action_layers = [self.create_layer(action) for action in self.actions]
+        # the last stand has no baseline metric, it is calculated from the raster
+        for stand in self.stands[:-1]:
+            StandMetricFactory.create(stand=stand, datalayer=baseline_layer)
+        # action metrics: one forced to zero (falls back to the baseline),
+        # one missing (calculated from the raster) and the rest random.
+        for i, stand in enumerate(self.stands[1:6], start=1):
+            StandMetricFactory.create(
+                stand=stand,
+                datalayer=action_layers[i % 2],
+                avg=0 if i == 2 else random.uniform(1, 100),
+            )
+
+    def snapshot(self):
+        results = {
+            r.pop("stand_id"): r
+            for r in TreatmentResult.objects.values(
+                "stand_id", "value", "baseline", "delta", "action", "forested_rate"
+            )
+        }
+        project_area_results = {
+            r.pop("action"): r
+            for r in ProjectAreaTreatmentResult.objects.values(
+                "action", "value", "baseline", "delta", "stand_count"
+            )
+        }
+        TreatmentResult.objects.all().delete()
+        ProjectAreaTreatmentResult.objects.all().delete()
+        return results, project_area_results
+
+    def test_same_results_as_calculate_impacts(self):
+        for action in self.actions:
+            calculate_impacts(self.plan, self.variable, action, self.year)
+        calculate_impacts_for_untreated_stands(self.plan, self.variable, self.year)
+        expected, expected_project_areas = self.snapshot()
+
+        treatment_results, project_area_results = calculate_impacts_for_treatment_plan(
+            self.plan, variables=[self.variable], years=[self.year]
+        )
+        actual, actual_project_areas = self.snapshot()
+
+        self.assertEqual(len(self.stands), treatment_results)
+        self.assertEqual(len(self.actions), project_area_results)
+        self.assertEqual(expected.keys(), actual.keys())
+        for stand_id, result in expected.items():
+            for field, value in result.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(value, actual[stand_id][field])
+                else:
+                    self.assertEqual(value, actual[stand_id][field])
+        self.assertEqual(expected_project_areas.keys(), actual_project_areas.keys())
+        for action, result in expected_project_areas.items():
+            for field, value in result.items():
+                self.assertAlmostEqual(value, actual_project_areas[action][field])
+
+    def test_updates_existing_results(self):
+        calculate_impacts_for_treatment_plan(
+            self.plan, variables=[self.variable], years=[self.year]
+        )
+        calculate_impacts_for_treatment_plan(
+            self.plan, variables=[self.variable], years=[self.year]
+        )
+
+        self.assertEqual(len(self.stands), TreatmentResult.objects.count())
+        self.assertEqual(len(self.actions), ProjectAreaTreatmentResult.objects.count())
+
+    def test_bad_year_throws(self):
+        with self.assertRaises(ValueError):
+            calculate_impacts_for_treatment_plan(
+                self.plan, variables=[self.variable], years=[1]
+            )
+
 
 class ImpactResultsDataPlotTest(TestCase):
     def setUp(self):
@@ -16,5 +16,42 @@ class PlanningConfig(AppConfig):
         for model_name in self.actstream_models:
             registry.register(self.get_model(model_name))
 
+    def register_stand_masks_invalidation(self):
+        from django.db.models.signals import post_delete, post_save
+        from stands.signals import stand_metrics_changed
+
+        from planning.stand_masks import (
+            handle_stand_metric_changed,
+            handle_stand_metrics_changed,
+        )
+
+        post_save.connect(
+            handle_stand_metric_changed,
+            sender="stands.StandMetric",
+            dispatch_uid="planning.stand_masks.post_save",
+        )
+        post_delete.connect(
+            handle_stand_metric_changed,
+            sender="stands.StandMetric",
+            dispatch_uid="planning.stand_masks.post_delete",
+        )
+        stand_metrics_changed.connect(
+            handle_stand_metrics_changed,
+            dispatch_uid="planning.stand_masks.stand_metrics_changed",
+        )
+
+    def register_materialization_invalidation(self):
+        from django.db.models.signals import post_save
+
+        from planning.services import handle_planning_area_saved
+
+        post_save.connect(
+            handle_planning_area_saved,
+            sender="planning.PlanningArea",
+            dispatch_uid="planning.services.handle_planning_area_saved",
+        )
+
     def ready(self):
         self.register_actstream()
+        self.register_stand_masks_invalidation()
+        self.register_materialization_invalidation()
@@ -1,11 +1,7 @@
 from typing import Optional
 
-from django.conf import settings
-from django.contrib.gis.db.models.functions import Area, Transform
 from django.db.models import (
-    ExpressionWrapper,
     F,
-    FloatField,
     Func,
     Q,
     QuerySet,
@@ -39,16 +35,6 @@ class PlanningAreaOrderingFilter(OrderingFilter):
                         )
                     ).order_by(f"{direction}creator")
 
-                if field_name == "area_acres":
-                    direction = "-" if reverse else ""
-                    queryset = queryset.annotate(
-                        area_acres=ExpressionWrapper(
-                            Area(Transform(F("geometry"), settings.AREA_SRID)),
-                            output_field=FloatField(),
-                        )
-                        * settings.CONVERSION_SQM_ACRES
-                    ).order_by(f"{direction}area_acres")
-
                 if field_name == "latest_updated":
                     direction = "-" if reverse else ""
                     queryset = queryset.order_by(f"{direction}updated_at")
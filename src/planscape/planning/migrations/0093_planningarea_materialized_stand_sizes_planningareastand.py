@@ -0,0 +1,92 @@
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stands", "0013_alter_stand_grid_key"),
+        ("planning", "0092_scenario_parent_alter_scenario_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planningarea",
+            name="materialized_stand_sizes",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(
+                    choices=[
+                        ("SMALL", "Small"),
+                        ("MEDIUM", "Medium"),
+                        ("LARGE", "Large"),
+                    ],
+                    max_length=16,
+                ),
+                blank=True,
+                default=list,
+                help_text="Stand sizes whose membership is stored in PlanningAreaStand.",
+                size=None,
+            ),
+        ),
+        migrations.CreateModel(
+            name="PlanningAreaStand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stand_size",
+                    models.CharField(
+                        choices=[
+                            ("SMALL", "Small"),
+                            ("MEDIUM", "Medium"),
+                            ("LARGE", "Large"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "area_m2",
+                    models.FloatField(
+                        help_text="Area of the stand in square meters, calculated in settings.AREA_SRID."
+                    ),
+                ),
+                (
+                    "planning_area",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stand_memberships",
+                        to="planning.planningarea",
+                    ),
+                ),
+                (
+                    "stand",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="planning_area_memberships",
+                        to="stands.stand",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["planning_area", "stand_size"],
+                        name="pa_stand_size_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("planning_area", "stand"),
+                        name="unique_planning_area_stand",
+                    )
+                ],
+            },
+        ),
+    ]
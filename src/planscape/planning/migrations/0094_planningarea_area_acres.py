@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import migrations, models
+from pyproj import Geod
+from shapely import wkt
+
+
+def backfill_planning_area_acres(apps, schema_editor):
+    PlanningArea = apps.get_model("planning", "PlanningArea")
+    geod = Geod(ellps="WGS84")
+
+    planning_areas = []
+    for planning_area in (
+        PlanningArea.objects.filter(geometry__isnull=False)
+        .only("id", "geometry")
+        .iterator(chunk_size=500)
+    ):
+        area_sq_meters, _ = geod.geometry_area_perimeter(
+            wkt.loads(planning_area.geometry.wkt)
+        )
+        planning_area.area_acres = abs(area_sq_meters) / settings.CONVERSION_SQM_ACRES
+        planning_areas.append(planning_area)
+
+    PlanningArea.objects.bulk_update(planning_areas, ["area_acres"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planning", "0093_planningarea_materialized_stand_sizes_planningareastand"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="planningarea",
+            name="area_acres",
+            field=models.FloatField(
+                help_text="Area of the Planning Area represented in Acres, updated when the geometry is saved.",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(
+            backfill_planning_area_acres,
+            migrations.RunPython.noop,
+        ),
+    ]
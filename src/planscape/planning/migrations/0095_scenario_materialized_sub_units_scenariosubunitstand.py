@@ -0,0 +1,90 @@
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("datasets", "0028_dataset_style_datalayer_workspace"),
+        ("stands", "0013_alter_stand_grid_key"),
+        ("planning", "0094_planningarea_area_acres"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="scenario",
+            name="materialized_sub_units",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.CharField(max_length=64),
+                blank=True,
+                default=list,
+                help_text="`<sub units layer id>:<stand size>` whose stands are stored in ScenarioSubUnitStand.",
+                size=None,
+            ),
+        ),
+        migrations.CreateModel(
+            name="ScenarioSubUnitStand",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stand_size",
+                    models.CharField(
+                        choices=[
+                            ("SMALL", "Small"),
+                            ("MEDIUM", "Medium"),
+                            ("LARGE", "Large"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                (
+                    "sub_unit_id",
+                    models.BigIntegerField(
+                        help_text="ID of the sub unit in the sub units layer table."
+                    ),
+                ),
+                (
+                    "datalayer",
+                    models.ForeignKey(
+                        help_text="Sub units layer.",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scenario_sub_unit_stands",
+                        to="datasets.datalayer",
+                    ),
+                ),
+                (
+                    "scenario",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sub_unit_stands",
+                        to="planning.scenario",
+                    ),
+                ),
+                (
+                    "stand",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scenario_sub_units",
+                        to="stands.stand",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["scenario", "datalayer", "stand_size"],
+                        name="scenario_sub_unit_stand_idx",
+                    )
+                ],
+            },
+        ),
+    ]
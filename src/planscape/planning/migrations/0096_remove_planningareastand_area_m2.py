@@ -0,0 +1,14 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("planning", "0095_scenario_materialized_sub_units_scenariosubunitstand"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="planningareastand",
+            name="area_m2",
+        ),
+    ]
@@ -26,6 +26,7 @@ from django.core.validators import MinValueValidator
 from django.db.models import F, Q, QuerySet
 from django.utils.functional import cached_property
 from django_stubs_ext.db.models import TypedModelMeta
+from planscape.exceptions import InvalidGeometry
 from stands.models import Stand, StandSizeChoices
 from utils.uuid_utils import generate_short_uuid
 
@@ -41,24 +42,29 @@ class ScenarioCapability(models.TextChoices):
 
 
 class PlanningAreaManager(AliveObjectsManager):
-    def list_by_user(self, user: User) -> QuerySet:
-        content_type_pk = ContentType.objects.get(model="planningarea").pk
-        qs = super().get_queryset()
+    def ids_by_user(self, user: User) -> QuerySet:
+        """
+        Ids of the planning areas `user` owns, plus the ones shared with them.
 
-        ids = (
-            qs.filter(
-                Q(user=user)
-                | Q(
-                    pk__in=UserObjectRole.objects.filter(
-                        collaborator_id=user, content_type_id=content_type_pk
-                    ).values_list("object_pk", flat=True)
-                )
+        Each branch of the `UNION ALL` is answered from an index (the user
+        index of planning areas, and `uor_collaborator_object_idx` of
+        `UserObjectRole`), so it scales with the user's own data instead of
+        the table size. Ids can repeat and deleted planning areas are not
+        excluded from the shared branch, so use it as an `__in` filter.
+        """
+        content_type = ContentType.objects.get_for_model(self.model)
+        owned = self.get_queryset().filter(user=user).order_by().values_list("id")
+        shared = (
+            UserObjectRole.objects.filter(
+                collaborator_id=user, content_type_id=content_type.pk
             )
-            .values_list("id", flat=True)
-            .distinct("id")
-            .order_by("id")
+            .order_by()
+            .values_list("object_pk")
         )
-        return super().get_queryset().filter(id__in=ids)
+        return owned.union(shared, all=True)
+
+    def list_by_user(self, user: User) -> QuerySet:
+        return self.get_queryset().filter(id__in=self.ids_by_user(user))
 
     def list_for_api(self, user: User) -> QuerySet:
         queryset = PlanningArea.objects.list_by_user(user).annotate(
@@ -127,14 +133,89 @@ class PlanningArea(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model)
     stands_ready_at = models.DateTimeField(null=True)
     metrics_ready_at = models.DateTimeField(null=True)
 
+    materialized_stand_sizes = ArrayField(
+        base_field=models.CharField(max_length=16, choices=StandSizeChoices.choices),
+        default=list,
+        blank=True,
+        help_text="Stand sizes whose membership is stored in PlanningAreaStand.",
+    )
+
+    area_acres = models.FloatField(
+        null=True,
+        help_text="Area of the Planning Area represented in Acres, updated when the geometry is saved.",
+    )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_geometry = instance.__dict__.get("geometry")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        geometry_saved = (
+            update_fields is None or "geometry" in update_fields
+        ) and "geometry" in self.__dict__
+        geometry_changed = (
+            self.pk is not None
+            and geometry_saved
+            and hasattr(self, "_loaded_geometry")
+            and self.geometry != self._loaded_geometry
+        )
+        changed_fields = set()
+        if geometry_changed and self.materialized_stand_sizes:
+            self.materialized_stand_sizes = []
+            changed_fields.add("materialized_stand_sizes")
+        if geometry_saved and (
+            self.pk is None or geometry_changed or self.area_acres is None
+        ):
+            self.area_acres = self.calculate_area_acres()
+            changed_fields.add("area_acres")
+        if update_fields is not None and changed_fields:
+            kwargs["update_fields"] = {*update_fields, *changed_fields}
+        # read by the post_save handler that drops the stored stands
+        self._geometry_changed = geometry_changed
+        super().save(*args, **kwargs)
+        self._loaded_geometry = self.__dict__.get("geometry")
+
+    def calculate_area_acres(self) -> Optional[float]:
+        """Geodesic area of the geometry in acres, None if it can't be computed."""
+        if not self.geometry:
+            return None
+        from planning.services import get_acreage
+
+        try:
+            return get_acreage(self.geometry)
+        except InvalidGeometry:
+            logger.warning("Could not calculate the area of planning area %s.", self.pk)
+            return None
+
     def creator_name(self) -> str:
         return self.user.get_full_name()
 
+    def has_materialized_stands(self, stand_size) -> bool:
+        return stand_size in (self.materialized_stand_sizes or [])
+
     def get_stands(self, stand_size) -> QuerySet[Stand]:
         """
-        Returns the list of stands inside that planning area."""
+        Returns the list of stands inside that planning area.
+        Uses the stored membership when it is available for the stand size."""
+        if self.has_materialized_stands(stand_size):
+            return Stand.objects.filter(
+                planning_area_memberships__planning_area_id=self.pk,
+                size=stand_size,
+            )
         return Stand.objects.within_polygon(self.geometry, stand_size)
 
+    def get_stands_within(self, geometry, stand_size) -> QuerySet[Stand]:
+        """
+        Returns the stands of the planning area inside `geometry`, a part of
+        the planning area (project areas, treatable area). The spatial filter
+        only runs on the stored membership when it is available."""
+        if self.has_materialized_stands(stand_size):
+            return self.get_stands(stand_size).within_polygon(geometry, stand_size)
+        return Stand.objects.within_polygon(geometry, stand_size)
+
     objects: PlanningAreaManager = PlanningAreaManager()
 
     class Meta(TypedModelMeta):
@@ -159,6 +240,48 @@ class PlanningArea(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model)
         ordering = ["user", "-created_at"]
 
 
+class PlanningAreaStand(models.Model):
+    """Stores which stands belong to a planning area (stand centroid within
+    the planning area geometry), so lookups don't need a spatial query.
+    Populated by `planning.services.materialize_planning_area_stands` and
+    cleared when the planning area geometry changes.
+    """
+
+    id: int
+    planning_area_id: int
+    planning_area = models.ForeignKey(
+        PlanningArea,
+        related_name="stand_memberships",
+        on_delete=models.CASCADE,
+    )
+
+    stand_id: int
+    stand = models.ForeignKey(
+        Stand,
+        related_name="planning_area_memberships",
+        on_delete=models.CASCADE,
+    )
+
+    stand_size = models.CharField(
+        choices=StandSizeChoices.choices,
+        max_length=16,
+    )
+
+    class Meta(TypedModelMeta):
+        indexes = [
+            models.Index(
+                fields=["planning_area", "stand_size"],
+                name="pa_stand_size_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["planning_area", "stand"],
+                name="unique_planning_area_stand",
+            )
+        ]
+
+
 class PlanningAreaNote(CreatedAtMixin, UpdatedAtMixin, models.Model):
     id: int
     planning_area_id: int
@@ -213,11 +336,10 @@ class ScenarioManager(AliveObjectsManager):
     def list_by_user(self, user: Optional[User]):
         if not user:
             return self.get_queryset().none()
-        # this will become super slow when the database gets bigger
-        planning_areas = PlanningArea.objects.list_by_user(user).values_list(
-            "id", flat=True
+        return self.get_queryset().filter(
+            planning_area_id__in=PlanningArea.objects.ids_by_user(user),
+            planning_area__deleted_at__isnull=True,
         )
-        return self.get_queryset().filter(planning_area__id__in=planning_areas)
 
 
 class ScenarioPlanningApproach(models.TextChoices):
@@ -557,6 +679,13 @@ class Scenario(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model):
         help_text="Geometry of Scenario's treatable area represented by polygons.",
     )
 
+    materialized_sub_units = ArrayField(
+        base_field=models.CharField(max_length=64),
+        default=list,
+        blank=True,
+        help_text="`<sub units layer id>:<stand size>` whose stands are stored in ScenarioSubUnitStand.",
+    )
+
     @cached_property
     def version(self):
         cfg = self.configuration or {}
@@ -578,6 +707,15 @@ class Scenario(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model):
     def get_stand_size(self) -> StandSizeChoices:
         return self.configuration.get("stand_size", {}) or StandSizeChoices.LARGE
 
+    @staticmethod
+    def sub_units_key(datalayer_id: int, stand_size) -> str:
+        return ":".join((str(datalayer_id), str(stand_size)))
+
+    def has_materialized_sub_units(self, datalayer_id: int, stand_size) -> bool:
+        return self.sub_units_key(datalayer_id, stand_size) in (
+            self.materialized_sub_units or []
+        )
+
     def get_geojson_result(self):
         features = [
             {
@@ -598,14 +736,14 @@ class Scenario(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model):
         size = stand_size or self.get_stand_size()
         if not project_areas_geometry:
             return Stand.objects.none()
-        return Stand.objects.within_polygon(project_areas_geometry, size)
+        return self.planning_area.get_stands_within(project_areas_geometry, size)
 
     def get_treatable_area_stands(self, stand_size=None) -> QuerySet[Stand]:
         if not self.treatable_area:
             return Stand.objects.none()
 
         size = stand_size or self.get_stand_size()
-        return Stand.objects.within_polygon(self.treatable_area, size)
+        return self.planning_area.get_stands_within(self.treatable_area, size)
 
     def get_geopackage_url(self) -> Optional[str]:
         if not self.geopackage_url:
@@ -655,6 +793,57 @@ class Scenario(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model):
         ordering = ["planning_area", "-created_at"]
 
 
+class ScenarioSubUnitStand(models.Model):
+    """Stores which stands of the scenario's planning area are in each sub
+    unit of a sub units layer (stand centroid within the sub unit), so the
+    sub units statistics don't need a spatial query per sub unit. Sub units
+    intersecting the planning area without any stand are stored without a
+    stand. Populated by `planning.services.materialize_scenario_sub_unit_stands`
+    and cleared when the planning area geometry changes.
+    """
+
+    id: int
+    scenario_id: int
+    scenario = models.ForeignKey(
+        Scenario,
+        related_name="sub_unit_stands",
+        on_delete=models.CASCADE,
+    )
+
+    datalayer_id: int
+    datalayer = models.ForeignKey(
+        DataLayer,
+        related_name="scenario_sub_unit_stands",
+        on_delete=models.CASCADE,
+        help_text="Sub units layer.",
+    )
+
+    stand_size = models.CharField(
+        choices=StandSizeChoices.choices,
+        max_length=16,
+    )
+
+    sub_unit_id = models.BigIntegerField(
+        help_text="ID of the sub unit in the sub units layer table."
+    )
+
+    stand_id: Optional[int]
+    stand = models.ForeignKey(
+        Stand,
+        related_name="scenario_sub_units",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+
+    class Meta(TypedModelMeta):
+        indexes = [
+            models.Index(
+                fields=["scenario", "datalayer", "stand_size"],
+                name="scenario_sub_unit_stand_idx",
+            ),
+        ]
+
+
 class ScenarioResult(CreatedAtMixin, UpdatedAtMixin, DeletedAtMixin, models.Model):
     id: int
     scenario_id: int
@@ -757,7 +946,7 @@ class ProjectArea(
 
     def get_stands(self, stand_size=None) -> QuerySet[Stand]:
         size = stand_size or self.scenario.get_stand_size()
-        return Stand.objects.within_polygon(self.geometry, size)
+        return self.scenario.planning_area.get_stands_within(self.geometry, size)
 
     class Meta(TypedModelMeta):
         verbose_name = "Project Area"
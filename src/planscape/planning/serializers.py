@@ -3,14 +3,16 @@ from typing import List, Optional
 
 import markdown
 from collaboration.services import get_permissions, get_role
+from collaboration.utils import get_permission_resolver
 from datasets.models import DataLayer, DataLayerStatus, DataLayerType, GeometryType
 from django.conf import settings
-from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
+from django.contrib.gis.geos import GEOSGeometry
 from django.utils import timezone
+from gis.database import ExtentGeometry
 from planscape.exceptions import InvalidGeometry
 from rest_framework import serializers
 from rest_framework_gis import serializers as gis_serializers
-from stands.models import Stand, StandSizeChoices
+from stands.models import StandSizeChoices
 
 from planning.geometry import coerce_geojson, coerce_geometry
 from planning.models import (
@@ -72,17 +74,28 @@ class ListPlanningAreaSerializer(serializers.ModelSerializer):
         return instance.get_region_name_display()
 
     def get_area_acres(self, instance):
+        if instance.area_acres is not None:
+            return instance.area_acres
         return get_acreage(instance.geometry)
 
     def get_latest_updated(self, instance):
         return instance.updated_at
 
+    # the request's `PermissionResolver`, when the view attached one, answers
+    # for a whole page with the roles it loaded up front
+
     def get_role(self, instance):
         user = self.context["request"].user or self.request.user
+        resolver = get_permission_resolver(user)
+        if resolver is not None:
+            return resolver.get_role(instance)
         return get_role(user, instance)
 
     def get_permissions(self, instance):
         user = self.context["request"].user or self.request.user
+        resolver = get_permission_resolver(user)
+        if resolver is not None:
+            return resolver.get_permissions(instance)
         return list(get_permissions(user, instance))
 
     class Meta:
@@ -767,7 +780,9 @@ class UpsertConfigurationV3Serializer(ConfigurationV3Serializer):
                 )
             stand_size = attrs.get("stand_size") or scenario.get_stand_size()
 
-            if not Stand.objects.within_polygon(treatable_area, stand_size).exists():
+            if not scenario.planning_area.get_stands_within(
+                treatable_area, stand_size
+            ).exists():
                 raise serializers.ValidationError(
                     "There are no stands with the selected ownership in your planning area.  "
                     "Please 'View' ownership options to see what area is available in your planning area."
@@ -893,28 +908,21 @@ class ListScenarioSerializer(serializers.ModelSerializer):
         return cfg.get("max_treatment_area_ratio")
 
     def get_bbox(self, instance) -> Optional[List[float]]:
-        geometries = list(
-            [
-                Polygon.from_bbox(pa.extent)
-                for pa in instance.project_areas.all().values_list(
-                    "geometry", flat=True
-                )
+        # annotated by ScenarioViewSet.get_queryset
+        if hasattr(instance, "bbox"):
+            bbox = instance.bbox
+        else:
+            bbox = instance.project_areas.aggregate(bbox=ExtentGeometry("geometry"))[
+                "bbox"
             ]
-        )
-        try:
-            polygons = MultiPolygon(*geometries, srid=geometries[0].srid)
-            if polygons.empty:
-                return None
-            geometry = polygons.unary_union
-        except IndexError:
-            return None
-        if not geometry:
-            return None
-        if geometry.empty:
+        if not bbox or bbox.empty:
             return None
-        return geometry.extent
+        return bbox.extent
 
-    def get_tx_plan_count(self, obj):
+    def get_tx_plan_count(self, obj) -> int:
+        # annotated by ScenarioViewSet.get_queryset
+        if hasattr(obj, "tx_plan_count"):
+            return obj.tx_plan_count
         return obj.tx_plans.count()
 
     class Meta:
@@ -21,7 +21,6 @@ from typing import (  # noqa: F401
 
 import fiona
 from actstream import action
-from cacheops import cached
 from celery import chord, group
 from collaboration.permissions import PlanningAreaPermission, ScenarioPermission
 from core.flags import feature_enabled
@@ -31,12 +30,11 @@ from datasets.models import DataLayer, DataLayerType
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.gis.db.models import Union as UnionOp
-from django.contrib.gis.db.models.functions import Area, Centroid, Transform
+from django.contrib.gis.db.models.functions import Centroid
 from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
 from django.contrib.gis.measure import A
-from django.db import transaction
-from django.db.models import QuerySet
-from django.db.models.aggregates import Sum
+from django.db import connection, transaction
+from django.db.models import Count, QuerySet
 from django.db.models.functions import Substr
 from django.utils.text import slugify
 from django.utils.timezone import now
@@ -53,7 +51,11 @@ from planscape.exceptions import InvalidGeometry
 from pyproj import Geod
 from shapely import wkt
 from stands.models import Stand, StandMetric, StandSizeChoices, area_from_size
-from stands.services import get_datalayer_metric, get_stand_grid_key_search_precision
+from stands.services import (
+    MODEL_AGGREGATION_MAP,
+    get_datalayer_metric,
+    get_stand_grid_key_search_precision,
+)
 from utils.geometry import to_multi
 
 from planning.geometry import coerce_geojson, coerce_geometry, to_multipolygon
@@ -68,10 +70,18 @@ from planning.models import (
     ScenarioResult,
     ScenarioResultStatus,
     ScenarioStatus,
+    ScenarioSubUnitStand,
     ScenarioType,
     TreatmentGoal,
     TreatmentGoalUsageType,
 )
+from planning.stand_masks import (
+    EXCLUSION_PREDICATE,
+    any_mask,
+    get_stand_index,
+    get_stand_mask,
+    invalidate_planning_area_stand_masks,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +106,104 @@ def create_metrics_task(
             )
 
 
+def materialize_planning_area_stands(
+    planning_area: PlanningArea,
+    stand_size: StandSizeChoices,
+) -> int:
+    """Stores the stands of `stand_size` whose centroid is within the
+    planning area in PlanningAreaStand and flags the stand size as
+    materialized. Returns the number of stands stored.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM planning_planningareastand
+            WHERE planning_area_id = %s AND stand_size = %s;
+            """,
+            [planning_area.pk, stand_size],
+        )
+        cursor.execute(
+            """
+            INSERT INTO planning_planningareastand
+                (planning_area_id, stand_id, stand_size)
+            SELECT
+                pa.id,
+                s.id,
+                s.size
+            FROM planning_planningarea pa
+            JOIN stands_stand s ON
+                s.size = %s AND
+                s.geometry && pa.geometry AND
+                ST_Within(ST_Centroid(s.geometry), pa.geometry)
+            WHERE pa.id = %s;
+            """,
+            [stand_size, planning_area.pk],
+        )
+        inserted = cursor.rowcount
+        # array_append is atomic, stand sizes are materialized concurrently
+        cursor.execute(
+            """
+            UPDATE planning_planningarea
+            SET materialized_stand_sizes = array_append(
+                array_remove(materialized_stand_sizes, %s::varchar), %s::varchar
+            )
+            WHERE id = %s;
+            """,
+            [stand_size, stand_size, planning_area.pk],
+        )
+    planning_area.refresh_from_db(fields=["materialized_stand_sizes"])
+    invalidate_planning_area_stand_masks(planning_area.pk)
+    logger.info(
+        f"Materialized {inserted} {stand_size} stands for planning area {planning_area.pk}."
+    )
+    return inserted
+
+
+def clear_planning_area_materializations(planning_area_id: int) -> None:
+    """Deletes the stored stands of a planning area and of its scenarios'
+    sub units whose materialized flags were cleared by a geometry change,
+    and drops the planning area's cached stand masks. Stand sizes and sub
+    units materialized again since then are kept.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM planning_planningareastand pas
+            USING planning_planningarea pa
+            WHERE
+                pas.planning_area_id = pa.id AND
+                pa.id = %s AND
+                pas.stand_size <> ALL(pa.materialized_stand_sizes);
+            """,
+            [planning_area_id],
+        )
+        cursor.execute(
+            """
+            DELETE FROM planning_scenariosubunitstand sus
+            USING planning_scenario s
+            WHERE
+                sus.scenario_id = s.id AND
+                s.planning_area_id = %s AND
+                sus.datalayer_id || ':' || sus.stand_size
+                    <> ALL(s.materialized_sub_units);
+            """,
+            [planning_area_id],
+        )
+    invalidate_planning_area_stand_masks(planning_area_id)
+
+
+def handle_planning_area_saved(sender, instance, created, **kwargs) -> None:
+    if created or not getattr(instance, "_geometry_changed", False):
+        return
+    # the flags are cleared with the geometry, so readers stop using the
+    # stored stands as soon as it commits; the rows and cached masks only go
+    # once it has committed, so a rollback doesn't throw them away
+    Scenario.dead_or_alive.filter(planning_area_id=instance.pk).update(
+        materialized_sub_units=[]
+    )
+    transaction.on_commit(partial(clear_planning_area_materializations, instance.pk))
+
+
 def get_truncated_stands_grid_keys(
     planning_area: PlanningArea,
     stand_size: StandSizeChoices,
@@ -402,7 +510,7 @@ def feature_to_project_area(
         _bbox = geometry_dict.pop("bbox", None)
         geometry = coerce_geometry(geometry_dict)
 
-        stand_count = Stand.objects.within_polygon(
+        stand_count = scenario.planning_area.get_stands_within(
             geometry,
             stand_size,
         ).count()
@@ -582,7 +690,7 @@ def get_project_areas_child_stands(
 
         geometry = to_multipolygon(geometry)
 
-    return Stand.objects.within_polygon(
+    return scenario.planning_area.get_stands_within(
         geometry,
         stand_size,
     )
@@ -1870,10 +1978,9 @@ def planning_area_covers(
         logger.info("Planning Area covers geometry using DE9IM matrix.")
         return True
 
-    all_stands = Stand.objects.within_polygon(
-        planning_area.geometry,
-        stand_size,
-    ).aggregate(geometry=UnionOp("geometry"))["geometry"]
+    all_stands = planning_area.get_stands(stand_size).aggregate(
+        geometry=UnionOp("geometry")
+    )["geometry"]
 
     if all_stands is None:
         return False
@@ -1909,11 +2016,7 @@ def get_constrained_stands(
     usage_type: TreatmentGoalUsageType = TreatmentGoalUsageType.THRESHOLD,
 ):
     if not metric_column:
-        metric_column = (
-            datalayer.metadata.get("modules", {})
-            .get("forsys", {})
-            .get("metric_column", "avg")
-        )
+        metric_column = get_constraint_metric_column(datalayer)
     if not operator:
         metric_filter = f"{metric_column}"
     else:
@@ -1935,32 +2038,35 @@ def get_constrained_stands(
     return stands_qs.values_list("id", flat=True)
 
 
-@cached(timeout=settings.SUB_UNITS_DETAILS_TTL)
 def get_stands_from_sub_units(
     stands: QuerySet[Stand],
-    planning_area: PlanningArea,
+    scenario: Scenario,
     stand_size: str,
     datalayer: DataLayer,
 ) -> QuerySet[Stand]:
-    geometry = planning_area.geometry
-    DynamicModel = model_from_fiona(datalayer)
-
-    queryset = DynamicModel.objects.filter(geometry__bboverlaps=geometry).filter(
-        geometry__intersects=geometry
+    """Filters `stands` to the ones within any sub unit of `datalayer`."""
+    sub_unit_stands = get_sub_unit_stands(scenario, datalayer, stand_size)
+    return stands.filter(
+        id__in=sub_unit_stands.filter(stand_id__isnull=False).values("stand_id")
     )
 
-    merged_geometry = None
-    for sub_unit in queryset.all():
-        if merged_geometry is None:
-            merged_geometry = sub_unit.geometry
-        else:
-            merged_geometry = merged_geometry.union(sub_unit.geometry)
 
-    if merged_geometry is not None:
-        intersection = geometry.intersection(merged_geometry)
-        return stands.within_polygon(intersection, stand_size)
+CONSTRAINT_SQL_OPERATORS = {
+    None: "=",
+    "eq": "=",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+
 
-    return stands.none()
+def get_constraint_metric_column(datalayer: DataLayer) -> str:
+    return (
+        datalayer.metadata.get("modules", {})
+        .get("forsys", {})
+        .get("metric_column", "avg")
+    )
 
 
 def get_available_stands(
@@ -1973,77 +2079,206 @@ def get_available_stands(
     sub_unit: DataLayer | None = None,
     **kwargs,
 ):
-    if not includes:
-        includes = list()
+    """Calculates the stands unavailable by exclusions and thresholds and
+    the resulting areas in a single query. Each stand is joined once with
+    the metrics of every exclude and constraint layer, flagged, and the
+    areas and counts are computed with FILTER aggregates.
+    """
     if not excludes:
         excludes = list()
     if not constraints:
         constraints = list()
     planning_area = scenario.planning_area
-    area_transform = Area(Transform("geometry", settings.AREA_SRID))
-    if feature_enabled("ADD_INCLUDES") and scenario.treatable_area is not None:
+    use_treatable_area = (
+        feature_enabled("ADD_INCLUDES") and scenario.treatable_area is not None
+    )
+    use_sub_units = (
+        scenario.planning_approach == ScenarioPlanningApproach.PRIORITIZE_SUB_UNITS
+        and sub_unit
+    )
+    if (
+        feature_enabled("STAND_MASKS_CACHE")
+        and not use_treatable_area
+        and not use_sub_units
+    ):
+        return get_available_stands_from_masks(
+            planning_area, stand_size, excludes, constraints
+        )
+
+    if use_treatable_area:
         stands = scenario.get_treatable_area_stands(stand_size=stand_size)
     else:
         stands = planning_area.get_stands(stand_size)
 
-    stands = stands.annotate(area=area_transform)
-    total_area = stands.all().aggregate(total_area_m2=Sum("area"))["total_area_m2"]
+    stands_sql, stands_params = stands.values("id").query.sql_with_params()
+    ctes = [f"base AS ({stands_sql})"]
+    params: list[Any] = [*stands_params]
 
-    excluded_ids = []
-    constrained_ids = []
+    excluded_predicates = ["false"]
+    excluded_params: list[Any] = []
     for exclude in excludes:
-        stands_queryset = stands.all()
-        excluded_stands = get_excluded_stands(stands_queryset, exclude)
-        excluded_ids.extend(list(excluded_stands.values_list("id", flat=True)))
+        excluded_predicates.append(
+            "COALESCE(bool_or(m.datalayer_id = %s AND m.majority = 1), false)"
+        )
+        excluded_params.append(exclude.pk)
 
-    if (
-        scenario.planning_approach == ScenarioPlanningApproach.PRIORITIZE_SUB_UNITS
-        and sub_unit
-    ):
+    if use_sub_units:
         # Exclude stands that is not included to any sub-unit
-        stands_queryset = stands.all()
         sub_units_stands = get_stands_from_sub_units(
-            stands_queryset, planning_area, scenario.get_stand_size(), sub_unit
+            stands.all(), scenario, scenario.get_stand_size(), sub_unit
         )
-        sub_units_stands_ids = set(sub_units_stands.values_list("id", flat=True))
-        stand_ids = stands_queryset.exclude(id__in=sub_units_stands_ids).values_list(
-            "id", flat=True
+        sub_units_sql, sub_units_params = (
+            sub_units_stands.values("id").query.sql_with_params()
         )
+        ctes.append(f"sub_units_stands AS ({sub_units_sql})")
+        params.extend(sub_units_params)
+        excluded_predicates.append("s.id NOT IN (SELECT id FROM sub_units_stands)")
 
-        excluded_ids.extend(list(stand_ids))
-
+    constrained_predicates = ["false"]
+    constrained_params: list[Any] = []
     for constraint in constraints:
-        stands_queryset = stands.all()
-        constrained_stands = get_constrained_stands(
-            stands_queryset,
-            constraint.get("datalayer"),
-            constraint.get("operator"),
-            constraint.get("value"),
-            usage_type=TreatmentGoalUsageType.THRESHOLD,
+        datalayer = constraint.get("datalayer")
+        operator = constraint.get("operator")
+        metric_column = get_constraint_metric_column(datalayer)
+        if metric_column not in MODEL_AGGREGATION_MAP:
+            raise ValueError(f"Invalid metric column {metric_column}.")
+        if operator not in CONSTRAINT_SQL_OPERATORS:
+            raise ValueError(f"Invalid operator {operator}.")
+        # a stand is constrained when none of its metrics meet the threshold
+        constrained_predicates.append(
+            "NOT COALESCE(bool_or(m.datalayer_id = %s AND "
+            f'm."{metric_column}" {CONSTRAINT_SQL_OPERATORS[operator]} '
+            "%s::double precision), false)"
         )
-        constrained_ids.extend(list(constrained_stands))
-    excluded_ids = set(excluded_ids)
-    constrained_ids = set(constrained_ids)
-    only_constrained_ids = constrained_ids - excluded_ids
-    treatable_stand_count = (
-        stands.count() - len(excluded_ids) - len(only_constrained_ids)
+        constrained_params.extend([datalayer.pk, constraint.get("value")])
+
+    metric_datalayer_ids = [exclude.pk for exclude in excludes] + [
+        constraint.get("datalayer").pk for constraint in constraints
+    ]
+    ctes.append(
+        f"""
+        flags AS (
+            SELECT
+                s.id,
+                ST_Area(ST_Transform(s.geometry, %s)) AS area_m2,
+                ({" OR ".join(excluded_predicates)}) AS excluded,
+                ({" OR ".join(constrained_predicates)}) AS constrained
+            FROM base
+            JOIN stands_stand s ON s.id = base.id
+            LEFT JOIN stands_standmetric m ON
+                m.stand_id = s.id AND
+                m.datalayer_id = ANY(%s::bigint[])
+            GROUP BY s.id
+        )
+        """
     )
-    total_excluded_area = (
-        Stand.objects.filter(id__in=excluded_ids)
-        .annotate(area=area_transform)
-        .aggregate(total_area_m2=Sum("area"))["total_area_m2"]
+    params.extend(
+        [
+            settings.AREA_SRID,
+            *excluded_params,
+            *constrained_params,
+            metric_datalayer_ids,
+        ]
     )
-    total_constrained_area = (
-        Stand.objects.filter(id__in=only_constrained_ids)
-        .annotate(area=area_transform)
-        .aggregate(total_area_m2=Sum("area"))["total_area_m2"]
+    query = f"""
+        WITH {", ".join(ctes)}
+        SELECT
+            count(*),
+            COALESCE(sum(area_m2), 0),
+            COALESCE(sum(area_m2) FILTER (WHERE excluded), 0),
+            COALESCE(sum(area_m2) FILTER (WHERE constrained AND NOT excluded), 0),
+            count(*) FILTER (WHERE excluded),
+            count(*) FILTER (WHERE constrained AND NOT excluded),
+            COALESCE(array_agg(id ORDER BY id) FILTER (WHERE excluded), '{{}}'),
+            COALESCE(array_agg(id ORDER BY id) FILTER (WHERE constrained), '{{}}')
+        FROM flags;
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        (
+            stand_count,
+            total_area_m2,
+            excluded_area_m2,
+            constrained_area_m2,
+            excluded_count,
+            constrained_count,
+            excluded_ids,
+            constrained_ids,
+        ) = cursor.fetchone()
+
+    return build_available_stands_result(
+        stand_count=stand_count,
+        total_area_m2=total_area_m2,
+        excluded_area_m2=excluded_area_m2,
+        constrained_area_m2=constrained_area_m2,
+        excluded_count=excluded_count,
+        constrained_count=constrained_count,
+        excluded_ids=excluded_ids,
+        constrained_ids=constrained_ids,
     )
-    if not total_area:
-        total_area = A(sq_m=0)
-    if not total_excluded_area:
-        total_excluded_area = A(sq_m=0)
-    if not total_constrained_area:
-        total_constrained_area = A(sq_m=0)
+
+
+def get_available_stands_from_masks(
+    planning_area: PlanningArea,
+    stand_size: str,
+    excludes: list[DataLayer],
+    constraints: list[dict[str, Any]],
+):
+    """Same as `get_available_stands`, combining the cached stand masks
+    of the planning area instead of querying the database.
+    """
+    index = get_stand_index(planning_area, stand_size)
+    excluded = any_mask(
+        index,
+        (
+            get_stand_mask(planning_area, stand_size, exclude.pk, EXCLUSION_PREDICATE)
+            for exclude in excludes
+        ),
+    )
+    constrained = any_mask(
+        index,
+        (
+            ~get_stand_mask(
+                planning_area,
+                stand_size,
+                constraint["datalayer"].pk,
+                (
+                    get_constraint_metric_column(constraint["datalayer"]),
+                    constraint.get("operator") or "eq",
+                    float(constraint.get("value")),
+                ),
+            )
+            for constraint in constraints
+        ),
+    )
+    only_constrained = constrained & ~excluded
+    return build_available_stands_result(
+        stand_count=len(index),
+        total_area_m2=float(index.areas_m2.sum()),
+        excluded_area_m2=float(index.areas_m2[excluded].sum()),
+        constrained_area_m2=float(index.areas_m2[only_constrained].sum()),
+        excluded_count=int(excluded.sum()),
+        constrained_count=int(only_constrained.sum()),
+        excluded_ids=index.to_stand_ids(excluded),
+        constrained_ids=index.to_stand_ids(constrained),
+    )
+
+
+def build_available_stands_result(
+    *,
+    stand_count: int,
+    total_area_m2: float,
+    excluded_area_m2: float,
+    constrained_area_m2: float,
+    excluded_count: int,
+    constrained_count: int,
+    excluded_ids: list[int],
+    constrained_ids: list[int],
+) -> dict[str, Any]:
+    total_area = A(sq_m=total_area_m2)
+    total_excluded_area = A(sq_m=excluded_area_m2)
+    total_constrained_area = A(sq_m=constrained_area_m2)
+    treatable_stand_count = stand_count - excluded_count - constrained_count
 
     available_area = total_area - total_excluded_area
     treatable_area = available_area - total_constrained_area
@@ -2072,6 +2307,28 @@ def get_available_stand_ids(
     excludes: QuerySet[DataLayer] | None = None,
 ) -> list[int]:
     planning_area = scenario.planning_area
+    use_sub_units = (
+        scenario.planning_approach == ScenarioPlanningApproach.PRIORITIZE_SUB_UNITS
+        and scenario.configuration.get("sub_units_layer")
+    )
+
+    if (
+        feature_enabled("STAND_MASKS_CACHE")
+        and not is_project_areas_child(scenario)
+        and not feature_enabled("ADD_INCLUDES")
+        and not use_sub_units
+    ):
+        index = get_stand_index(planning_area, stand_size)
+        excluded = any_mask(
+            index,
+            (
+                get_stand_mask(
+                    planning_area, stand_size, exclude.pk, EXCLUSION_PREDICATE
+                )
+                for exclude in excludes or []
+            ),
+        )
+        return index.to_stand_ids(~excluded)
 
     if is_project_areas_child(scenario):
         stands = Stand.objects.filter(
@@ -2085,17 +2342,13 @@ def get_available_stand_ids(
     else:
         stands = planning_area.get_stands(stand_size=stand_size)
 
-    if (
-        not is_project_areas_child(scenario)
-        and scenario.planning_approach == ScenarioPlanningApproach.PRIORITIZE_SUB_UNITS
-        and scenario.configuration.get("sub_units_layer")
-    ):
+    if not is_project_areas_child(scenario) and use_sub_units:
         stands_queryset = stands.all()
         datalayer = DataLayer.objects.get(
             pk=scenario.configuration.get("sub_units_layer")
         )
         stands = get_stands_from_sub_units(
-            stands_queryset, planning_area, stand_size, datalayer
+            stands_queryset, scenario, stand_size, datalayer
         )
 
     excluded_ids = []
@@ -2155,32 +2408,121 @@ def get_min_project_area(scenario: Scenario) -> float:
             return settings.MIN_AREA_PROJECT_LARGE
 
 
-@cached(timeout=settings.SUB_UNITS_DETAILS_TTL)
-def get_sub_units_areas(
-    scenario: Scenario, stand_size: StandSizeChoices, datalayer: DataLayer
-) -> list[int] | None:
+def materialize_scenario_sub_unit_stands(
+    scenario: Scenario,
+    datalayer: DataLayer,
+    stand_size: StandSizeChoices,
+) -> int:
+    """Stores which stands of the planning area are in each sub unit of
+    `datalayer` in ScenarioSubUnitStand, with a single spatial join of the
+    stand centroids against the sub units table (GiST indexed when imported
+    by ogr2ogr), and flags the layer and stand size as materialized. Returns
+    the number of rows stored. Callers must hold a lock on the scenario row,
+    see `get_sub_unit_stands`.
+    """
     planning_area = scenario.planning_area
-    geometry = planning_area.geometry
-    DynamicModel = model_from_fiona(datalayer)
-    stands = planning_area.get_stands(stand_size).annotate(
-        centroid=Centroid("geometry")
+    sub_units_table = model_from_fiona(datalayer)._meta.db_table
+    stands = (
+        planning_area.get_stands(stand_size)
+        .annotate(stand_centroid=Centroid("geometry"))
+        .values("id", "stand_centroid")
     )
-    stand_area = get_min_project_area(scenario=scenario)
+    stands_sql, stands_params = stands.query.sql_with_params()
+    key = Scenario.sub_units_key(datalayer.pk, stand_size)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM planning_scenariosubunitstand
+            WHERE scenario_id = %s AND datalayer_id = %s AND stand_size = %s;
+            """,
+            [scenario.pk, datalayer.pk, stand_size],
+        )
+        cursor.execute(
+            f"""
+            WITH stands AS ({stands_sql}),
+            assigned AS (
+                SELECT su.id AS sub_unit_id, s.id AS stand_id
+                FROM stands s
+                JOIN {sub_units_table} su ON
+                    ST_Within(s.stand_centroid, su.geometry)
+            )
+            INSERT INTO planning_scenariosubunitstand
+                (scenario_id, datalayer_id, stand_size, sub_unit_id, stand_id)
+            SELECT %s, %s, %s, sub_unit_id, stand_id
+            FROM assigned
+            UNION ALL
+            SELECT %s, %s, %s, su.id, NULL
+            FROM {sub_units_table} su
+            JOIN planning_planningarea pa ON
+                su.geometry && pa.geometry AND
+                ST_Intersects(su.geometry, pa.geometry)
+            WHERE
+                pa.id = %s AND
+                su.id NOT IN (SELECT sub_unit_id FROM assigned);
+            """,
+            [
+                *stands_params,
+                *[scenario.pk, datalayer.pk, stand_size] * 2,
+                planning_area.pk,
+            ],
+        )
+        inserted = cursor.rowcount
+        cursor.execute(
+            """
+            UPDATE planning_scenario
+            SET materialized_sub_units = array_append(
+                array_remove(materialized_sub_units, %s::varchar), %s::varchar
+            )
+            WHERE id = %s;
+            """,
+            [key, key, scenario.pk],
+        )
+    scenario.refresh_from_db(fields=["materialized_sub_units"])
+    logger.info(
+        f"Materialized {inserted} {stand_size} sub unit stands of datalayer "
+        f"{datalayer.pk} for scenario {scenario.pk}."
+    )
+    return inserted
+
 
-    queryset = DynamicModel.objects.filter(geometry__bboverlaps=geometry).filter(
-        geometry__intersects=geometry
+def get_sub_unit_stands(
+    scenario: Scenario,
+    datalayer: DataLayer,
+    stand_size: StandSizeChoices,
+) -> QuerySet[ScenarioSubUnitStand]:
+    """Stand to sub unit assignments of `scenario`, materialized on the
+    first call for each sub units layer and stand size.
+    """
+    if not scenario.has_materialized_sub_units(datalayer.pk, stand_size):
+        with transaction.atomic():
+            # concurrent first calls wait on the lock and find the rows stored
+            locked = Scenario.objects.select_for_update().get(pk=scenario.pk)
+            if locked.has_materialized_sub_units(datalayer.pk, stand_size):
+                scenario.materialized_sub_units = locked.materialized_sub_units
+            else:
+                materialize_scenario_sub_unit_stands(scenario, datalayer, stand_size)
+    return ScenarioSubUnitStand.objects.filter(
+        scenario_id=scenario.pk,
+        datalayer_id=datalayer.pk,
+        stand_size=stand_size,
     )
 
-    areas = []
-    for sub_unit in queryset.all():
-        geo_intersection = geometry.intersection(sub_unit.geometry)
-        sub_unit_stands_count = stands.within_polygon(
-            geo_intersection, stand_size
-        ).count()
-        if sub_unit_stands_count > 0:
-            acreage = sub_unit_stands_count * stand_area
-            areas.append(acreage)
 
+def get_sub_units_areas(
+    scenario: Scenario, stand_size: StandSizeChoices, datalayer: DataLayer
+) -> list[int] | None:
+    stand_area = get_min_project_area(scenario=scenario)
+    stand_counts = (
+        get_sub_unit_stands(scenario, datalayer, stand_size)
+        .filter(stand_id__isnull=False)
+        .values("sub_unit_id")
+        .annotate(stand_count=Count("stand_id"))
+        .order_by("sub_unit_id")
+        .values_list("stand_count", flat=True)
+    )
+
+    areas = [stand_count * stand_area for stand_count in stand_counts]
     if len(areas) == 0:
         return None
 
@@ -2218,7 +2560,6 @@ def get_sub_units_details(
     fixed_target: bool | None = None,
     target_value: float | None = None,
 ) -> dict[str, float | None] | None:
-
     if is_project_areas_child(scenario):
         areas = get_project_areas_child_areas(
             scenario=scenario,
@@ -2260,27 +2601,18 @@ def get_sub_units_details(
 
 def get_sub_units_stands_lookup_table(
     scenario: Scenario, datalayer: DataLayer
-) -> dict[int, list[int]]:
-    stand_size = scenario.get_stand_size()
-    planning_area = scenario.planning_area
-    geometry = planning_area.geometry
-    stands = planning_area.get_stands(stand_size).annotate(
-        centroid=Centroid("geometry")
-    )
-
-    DynamicModel = model_from_fiona(datalayer)
-    queryset = DynamicModel.objects.filter(geometry__bboverlaps=geometry).filter(
-        geometry__intersects=geometry
+) -> dict[str, list[int]]:
+    sub_unit_stands = (
+        get_sub_unit_stands(scenario, datalayer, scenario.get_stand_size())
+        .order_by("sub_unit_id", "stand_id")
+        .values_list("sub_unit_id", "stand_id")
     )
 
     lookup_table = {}
-    for sub_unit in queryset.all():
-        sub_unit_id = sub_unit.pk
-        geo_intersection = geometry.intersection(sub_unit.geometry)
-        stand_ids = stands.within_polygon(
-            geo_intersection, scenario.get_stand_size()
-        ).values_list("id", flat=True)
-        lookup_table.update({str(sub_unit_id): list(stand_ids)})
+    for sub_unit_id, stand_id in sub_unit_stands:
+        stand_ids = lookup_table.setdefault(str(sub_unit_id), [])
+        if stand_id is not None:
+            stand_ids.append(stand_id)
 
     return lookup_table
 
@@ -0,0 +1,181 @@
+"""Cache of stand-level masks for exclusion and threshold predicates.
+
+The stands of a planning area and stand size get a dense index (their ids,
+sorted) and every (datalayer, predicate) pair is cached as a bool array over
+that index, so masks are combined with NumPy `&`, `|` and `& ~` instead of
+querying the database again. Masks are stored packed with `np.packbits`.
+
+Cache keys carry a version number per datalayer and per planning area;
+bumping it (see `invalidate_datalayer_stand_masks` and
+`invalidate_planning_area_stand_masks`) invalidates every mask built from
+them.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import partial
+from typing import Iterable, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Area, Transform
+from django.core.cache import cache
+from django.db import transaction
+from stands.models import StandMetric
+from stands.services import MODEL_AGGREGATION_MAP
+
+from planning.models import PlanningArea
+
+log = logging.getLogger(__name__)
+
+# (metric column, operator, value)
+StandPredicate = Tuple[str, str, float]
+
+EXCLUSION_PREDICATE: StandPredicate = ("majority", "eq", 1.0)
+
+PREDICATE_LOOKUPS = {
+    "eq": "exact",
+    "lt": "lt",
+    "lte": "lte",
+    "gt": "gt",
+    "gte": "gte",
+}
+
+
+@dataclass
+class StandIndex:
+    stand_ids: np.ndarray
+    areas_m2: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.stand_ids)
+
+    def empty_mask(self) -> np.ndarray:
+        return np.zeros(len(self), dtype=bool)
+
+    def to_stand_ids(self, mask: np.ndarray) -> list[int]:
+        return self.stand_ids[mask].tolist()
+
+
+def _version_key(kind: str, pk: int) -> str:
+    return f"stand_masks:{kind}:{pk}:version"
+
+
+def _get_version(kind: str, pk: int) -> int:
+    return cache.get_or_set(_version_key(kind, pk), 0, timeout=None)
+
+
+def _bump_version(kind: str, pk: int) -> None:
+    key = _version_key(kind, pk)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_datalayer_stand_masks(datalayer_id: int) -> None:
+    _bump_version("datalayer", datalayer_id)
+
+
+def invalidate_planning_area_stand_masks(planning_area_id: int) -> None:
+    _bump_version("planning_area", planning_area_id)
+
+
+def _index_key(planning_area: PlanningArea, stand_size: str) -> str:
+    version = _get_version("planning_area", planning_area.pk)
+    return f"stand_masks:index:{planning_area.pk}:{stand_size}:{version}"
+
+
+def _mask_key(
+    planning_area: PlanningArea,
+    stand_size: str,
+    datalayer_id: int,
+    predicate: StandPredicate,
+) -> str:
+    column, operator, value = predicate
+    pa_version = _get_version("planning_area", planning_area.pk)
+    dl_version = _get_version("datalayer", datalayer_id)
+    return (
+        f"stand_masks:mask:{planning_area.pk}:{stand_size}:{pa_version}:"
+        f"{datalayer_id}:{dl_version}:{column}:{operator}:{value!r}"
+    )
+
+
+def get_stand_index(planning_area: PlanningArea, stand_size: str) -> StandIndex:
+    """Returns the sorted ids of the planning area stands and their areas."""
+    key = _index_key(planning_area, stand_size)
+    index = cache.get(key)
+    if index is not None:
+        return index
+
+    # get_stands reads the stored membership when there is one, the area is
+    # projected the same way on both paths so the summaries don't change
+    # once the stands are materialized
+    rows = (
+        planning_area.get_stands(stand_size)
+        .annotate(area=Area(Transform("geometry", settings.AREA_SRID)))
+        .order_by("id")
+        .values_list("id", "area")
+    )
+    pairs = [(stand_id, area.sq_m) for stand_id, area in rows]
+
+    index = StandIndex(
+        stand_ids=np.array([pair[0] for pair in pairs], dtype=np.int64),
+        areas_m2=np.array([pair[1] for pair in pairs], dtype=np.float64),
+    )
+    cache.set(key, index, timeout=settings.STAND_MASKS_TTL)
+    return index
+
+
+def get_stand_mask(
+    planning_area: PlanningArea,
+    stand_size: str,
+    datalayer_id: int,
+    predicate: StandPredicate,
+) -> np.ndarray:
+    """Returns a bool array over `get_stand_index` that is True for the
+    stands with a metric for `datalayer_id` that meets `predicate`.
+    """
+    index = get_stand_index(planning_area, stand_size)
+    key = _mask_key(planning_area, stand_size, datalayer_id, predicate)
+    packed = cache.get(key)
+    if packed is not None:
+        return np.unpackbits(packed, count=len(index)).astype(bool)
+
+    column, operator, value = predicate
+    if operator not in PREDICATE_LOOKUPS:
+        raise ValueError(f"Invalid operator {operator}.")
+    if column not in MODEL_AGGREGATION_MAP:
+        raise ValueError(f"Invalid metric column {column}.")
+
+    stand_ids = StandMetric.objects.filter(
+        datalayer_id=datalayer_id,
+        stand_id__in=planning_area.get_stands(stand_size).values("id"),
+        **{f"{column}__{PREDICATE_LOOKUPS[operator]}": value},
+    ).values_list("stand_id", flat=True)
+    mask = np.isin(index.stand_ids, np.fromiter(stand_ids, dtype=np.int64))
+    cache.set(key, np.packbits(mask), timeout=settings.STAND_MASKS_TTL)
+    return mask
+
+
+def any_mask(index: StandIndex, masks: Iterable[np.ndarray]) -> np.ndarray:
+    result = index.empty_mask()
+    for mask in masks:
+        result |= mask
+    return result
+
+
+# Versions are bumped once the write commits: bumped any earlier, a
+# concurrent request could rebuild a mask from the old rows and cache it
+# under the new version.
+
+
+def handle_stand_metric_changed(sender, instance, **kwargs) -> None:
+    transaction.on_commit(
+        partial(invalidate_datalayer_stand_masks, instance.datalayer_id)
+    )
+
+
+def handle_stand_metrics_changed(sender, datalayer_ids, **kwargs) -> None:
+    for datalayer_id in datalayer_ids:
+        transaction.on_commit(partial(invalidate_datalayer_stand_masks, datalayer_id))
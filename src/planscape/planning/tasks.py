@@ -18,11 +18,12 @@ from planscape.celery import app
 from planscape.exceptions import ForsysException, ForsysTimeoutException
 from stands.models import Stand, StandSizeChoices
 from stands.services import (
+    backfill_stand_zonal_stats,
     calculate_stand_vector_stats_with_stand_list,
     calculate_stand_zonal_stats,
     calculate_stand_zonal_stats_api,
     create_stands_for_geometry,
-    get_missing_stand_ids_for_datalayer_within_geometry,
+    get_missing_stand_ids_for_datalayers_within_geometry,
 )
 from utils.cli_utils import call_forsys
 from utils.frontend import get_frontend_url
@@ -44,6 +45,7 @@ from planning.services import (
     export_to_geopackage,
     get_acreage,
     get_available_stand_ids,
+    materialize_planning_area_stands,
 )
 
 log = logging.getLogger(__name__)
@@ -70,6 +72,7 @@ def async_create_stands(planning_area_id: int, stand_size: StandSizeChoices) ->
 
         if actual_geometry.empty:
             log.info("No need to create stands, all good.")
+            materialize_planning_area_stands(planning_area, stand_size)
             return
 
         match actual_geometry.geom_type:
@@ -82,6 +85,7 @@ def async_create_stands(planning_area_id: int, stand_size: StandSizeChoices) ->
 
         for polygon in actual_geometry:
             create_stands_for_geometry(polygon, stand_size)
+        materialize_planning_area_stands(planning_area, stand_size)
     except PlanningArea.DoesNotExist:
         log.warning(f"Planning Area with {planning_area_id} does not exist.")
         raise
@@ -206,6 +210,24 @@ def async_calculate_stand_metrics_with_stand_list(
         return
 
 
+@app.task()
+def async_backfill_stand_metrics(
+    stand_ids: list,
+    datalayer_id: int,
+) -> None:
+    """
+    Calculates the stand metrics of a raster datalayer for all stands
+    in a single task, using a thread pool. See `backfill_stand_zonal_stats`.
+    """
+    try:
+        datalayer: DataLayer = DataLayer.objects.get(pk=datalayer_id)
+    except DataLayer.DoesNotExist:
+        log.warning(f"DataLayer with id {datalayer_id} does not exist.")
+        return
+
+    backfill_stand_zonal_stats(stand_ids, datalayer)
+
+
 @app.task()
 def prepare_planning_area(planning_area_id: int) -> int:
     planning_area = PlanningArea.objects.get(id=planning_area_id)
@@ -233,18 +255,31 @@ def prepare_planning_area(planning_area_id: int) -> int:
 
     create_stand_metrics_jobs = []
 
-    for datalayer in datalayers:
-        for stand_size in StandSizeChoices:
-            missing_stand_ids = get_missing_stand_ids_for_datalayer_within_geometry(
+    for stand_size in StandSizeChoices:
+        missing_stand_ids_by_datalayer = (
+            get_missing_stand_ids_for_datalayers_within_geometry(
                 geometry=planning_area.geometry,
                 stand_size=stand_size,
-                datalayer=datalayer,
+                datalayers=datalayers,
             )
+        )
+        for datalayer in datalayers:
+            missing_stand_ids = missing_stand_ids_by_datalayer[datalayer.pk]
             if not missing_stand_ids:
                 log.info(
                     f"No missing stand metrics for datalayer {datalayer.pk} and stand size {stand_size}"
                 )
                 continue
+            if (
+                feature_enabled("BULK_STAND_METRICS_BACKFILL")
+                and datalayer.type == DataLayerType.RASTER
+            ):
+                create_stand_metrics_jobs.append(
+                    async_backfill_stand_metrics.si(
+                        list(missing_stand_ids), datalayer.pk
+                    )
+                )
+                continue
             batch_size = settings.STAND_METRICS_PAGE_SIZE
             for i in range(0, len(missing_stand_ids), batch_size):
                 batch_stand_ids = list(missing_stand_ids)[i : i + batch_size]
@@ -346,12 +381,16 @@ def prepare_scenarios_for_forsys_and_run(scenario_id: int):
         return
 
     tasks = [async_pre_forsys_process.si(scenario_id=scenario.pk)]
-    for datalayer in datalayers:
-        missing_stand_ids = get_missing_stand_ids_for_datalayer_within_geometry(
+    datalayers = list(datalayers)
+    missing_stand_ids_by_datalayer = (
+        get_missing_stand_ids_for_datalayers_within_geometry(
             geometry=scenario.planning_area.geometry,
             stand_size=scenario.get_stand_size(),
-            datalayer=datalayer,
+            datalayers=datalayers,
         )
+    )
+    for datalayer in datalayers:
+        missing_stand_ids = missing_stand_ids_by_datalayer[datalayer.pk]
 
         if missing_stand_ids:
             log.info(
@@ -1,9 +1,47 @@
 import os
 import json
 
+from collaboration.tests.factories import UserObjectRoleFactory
+from django.db import connection
+
+from planning.tests.factories import PlanningAreaFactory
+
 
 def _load_geojson_fixture(filename):
     current_dir = os.path.dirname(os.path.abspath(__file__))
     fixture_path = os.path.join(current_dir, "../fixtures", filename)
     with open(fixture_path, "r") as file:
         return json.load(file)
+
+
+class ListByUserQueryPlanMixin:
+    """
+    Checks that the `list_by_user` queries only read the rows of the user
+    through indexes, so the lists don't get slower as the tables grow with
+    other users' data.
+    """
+
+    def share_planning_area(self, user):
+        """Planning area of another user, shared with `user`."""
+        planning_area = PlanningAreaFactory()
+        UserObjectRoleFactory(
+            inviter=planning_area.user,
+            collaborator=user,
+            email=user.email,
+            associated_model=planning_area,
+        )
+        return planning_area
+
+    def prepare_query_plan(self, *tables):
+        """To be called once every row of the test is created."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {', '.join(tables)}")
+            # the tables are tiny, so make the planner show which
+            # indexes it can use instead of reading them whole
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertOnlyIndexScans(self, queryset, *tables):
+        plan = queryset.explain()
+        self.assertIn("uor_collaborator_object_idx", plan)
+        for table in tables:
+            self.assertNotIn(f"Seq Scan on {table}", plan)
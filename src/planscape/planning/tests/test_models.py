@@ -1,18 +1,25 @@
+from unittest import mock
+
 from collaboration.models import Role, UserObjectRole
 from collaboration.services import get_content_type
+from collaboration.tests.factories import UserObjectRoleFactory
 from datasets.models import DataLayerType
 from datasets.tests.factories import DataLayerFactory
+from django.contrib.gis.geos import MultiPolygon
 from django.db.utils import IntegrityError
 from django.test import TestCase
+from planscape.exceptions import InvalidGeometry
 from planscape.tests.factories import UserFactory
 
-from planning.models import PlanningArea, RegionChoices, ScenarioType
+from planning.models import PlanningArea, RegionChoices, Scenario, ScenarioType
+from planning.services import get_acreage
 from planning.tests.factories import (
     PlanningAreaFactory,
     ScenarioFactory,
     TreatmentGoalFactory,
     TreatmentGoalUsesDataLayerFactory,
 )
+from planning.tests.helpers import ListByUserQueryPlanMixin
 
 
 class PlanningAreaModelTest(TestCase):
@@ -59,6 +66,79 @@ class PlanningAreaModelTest(TestCase):
         planning_areas = PlanningArea.objects.list_for_api(user1)
         self.assertEqual(planning_areas.count(), 2)
 
+    def test_area_acres_is_kept_up_to_date_with_the_geometry(self):
+        planning_area = PlanningAreaFactory()
+        self.assertAlmostEqual(
+            planning_area.area_acres, get_acreage(planning_area.geometry)
+        )
+
+        planning_area = PlanningArea.objects.get(pk=planning_area.pk)
+        planning_area.geometry = MultiPolygon(
+            [planning_area.geometry[0].buffer(-0.1)], srid=planning_area.geometry.srid
+        )
+        planning_area.save(update_fields=["geometry"])
+
+        planning_area.refresh_from_db()
+        self.assertAlmostEqual(
+            planning_area.area_acres, get_acreage(planning_area.geometry)
+        )
+
+    @mock.patch("planning.services.get_acreage", side_effect=InvalidGeometry)
+    def test_area_acres_is_none_when_the_area_cannot_be_calculated(self, _):
+        planning_area = PlanningAreaFactory()
+
+        planning_area.refresh_from_db()
+        self.assertIsNone(planning_area.area_acres)
+
+class ListByUserQueryPlanTest(ListByUserQueryPlanMixin, TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.owned = PlanningAreaFactory(user=self.user)
+        self.shared = self.share_planning_area(self.user)
+        self.scenarios = [
+            ScenarioFactory(planning_area=planning_area)
+            for planning_area in (self.owned, self.shared)
+        ]
+        for _ in range(20):
+            planning_area = PlanningAreaFactory()
+            ScenarioFactory(planning_area=planning_area)
+            UserObjectRoleFactory(associated_model=planning_area)
+
+        self.prepare_query_plan(
+            "planning_planningarea",
+            "planning_scenario",
+            "collaboration_userobjectrole",
+        )
+
+    def test_planning_areas(self):
+        queryset = PlanningArea.objects.list_by_user(self.user)
+
+        self.assertCountEqual(queryset, [self.owned, self.shared])
+        self.assertOnlyIndexScans(
+            queryset, "planning_planningarea", "collaboration_userobjectrole"
+        )
+
+    def test_scenarios(self):
+        queryset = Scenario.objects.list_by_user(self.user)
+
+        self.assertCountEqual(queryset, self.scenarios)
+        self.assertOnlyIndexScans(
+            queryset,
+            "planning_planningarea",
+            "planning_scenario",
+            "collaboration_userobjectrole",
+        )
+
+    def test_deleted_shared_planning_area_is_not_listed(self):
+        self.shared.delete()
+
+        self.assertCountEqual(
+            PlanningArea.objects.list_by_user(self.user), [self.owned]
+        )
+        self.assertCountEqual(
+            Scenario.objects.list_by_user(self.user), self.scenarios[:1]
+        )
+
 
 class TreatmentGoalUsesDataLayerTest(TestCase):
     def test_treatment_goal_with_datalayers(self):
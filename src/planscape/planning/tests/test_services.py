@@ -5,6 +5,7 @@ from datetime import date, datetime
 from pathlib import Path
 from types import SimpleNamespace
 from unittest import mock
+from uuid import uuid4
 
 import fiona
 import shapely
@@ -14,7 +15,7 @@ from datasets.models import DataLayerType, GeometryType
 from datasets.tasks import datalayer_uploaded
 from datasets.tests.factories import DataLayerFactory
 from django.conf import settings
-from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
 from django.db import connection
 from django.test import TestCase, override_settings
 from fiona.crs import to_string
@@ -25,8 +26,11 @@ from stands.tests.factories import StandFactory, StandMetricFactory
 from planning.models import (
     PlanningArea,
     PlanningAreaMapStatus,
+    PlanningAreaStand,
+    Scenario,
     ScenarioPlanningApproach,
     ScenarioResultStatus,
+    ScenarioSubUnitStand,
     ScenarioType,
     TreatmentGoalUsageType,
 )
@@ -42,6 +46,7 @@ from planning.services import (
     export_to_shapefile,
     get_acreage,
     get_available_stand_ids,
+    get_available_stands,
     get_constrained_stands,
     get_excluded_stands,
     get_flatten_geojson,
@@ -49,7 +54,11 @@ from planning.services import (
     get_max_treatable_area,
     get_max_treatable_stand_count,
     get_schema,
+    get_stands_from_sub_units,
+    get_sub_units_areas,
     get_sub_units_details,
+    get_sub_units_stands_lookup_table,
+    materialize_planning_area_stands,
     planning_area_covers,
     sanitize_shp_field_name,
     trigger_scenario_run,
@@ -1046,6 +1055,176 @@ class TestRemoveExcludes(TestCase):
         self.assertEquals(17, len(stands))
         self.assertEquals(len(stand_ids), len(stands))
 
+    def test_materialize_planning_area_stands(self):
+        stands = self.planning_area.get_stands(StandSizeChoices.LARGE)
+        spatial_ids = set(stands.values_list("id", flat=True))
+
+        inserted = materialize_planning_area_stands(
+            self.planning_area, StandSizeChoices.LARGE
+        )
+
+        self.assertEqual(17, inserted)
+        self.assertTrue(
+            self.planning_area.has_materialized_stands(StandSizeChoices.LARGE)
+        )
+        self.assertFalse(
+            self.planning_area.has_materialized_stands(StandSizeChoices.SMALL)
+        )
+        memberships = PlanningAreaStand.objects.filter(planning_area=self.planning_area)
+        self.assertEqual(
+            spatial_ids, set(memberships.values_list("stand_id", flat=True))
+        )
+
+    def test_materialize_planning_area_stands_is_idempotent(self):
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+
+        self.planning_area.refresh_from_db()
+        self.assertEqual(
+            [StandSizeChoices.LARGE], self.planning_area.materialized_stand_sizes
+        )
+        self.assertEqual(
+            17,
+            PlanningAreaStand.objects.filter(planning_area=self.planning_area).count(),
+        )
+
+    def test_get_stands_uses_materialized_stands(self):
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+        PlanningAreaStand.objects.filter(stand=self.stands[0]).delete()
+
+        stands = self.planning_area.get_stands(StandSizeChoices.LARGE)
+
+        self.assertEqual(16, stands.count())
+        self.assertNotIn(self.stands[0].pk, stands.values_list("id", flat=True))
+
+    def test_get_stands_within_uses_materialized_stands(self):
+        geometry = self.planning_area.geometry
+        expected = self.planning_area.get_stands_within(
+            geometry, StandSizeChoices.LARGE
+        )
+        self.assertEqual(17, expected.count())
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+        PlanningAreaStand.objects.filter(stand=self.stands[0]).delete()
+
+        stands = self.planning_area.get_stands_within(geometry, StandSizeChoices.LARGE)
+
+        self.assertEqual(16, stands.count())
+        self.assertNotIn(self.stands[0].pk, stands.values_list("id", flat=True))
+
+    def test_get_available_stands_ids_materialized(self):
+        expected = get_available_stand_ids(
+            self.scenario, StandSizeChoices.LARGE, [self.datalayer]
+        )
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+
+        stand_ids = get_available_stand_ids(
+            self.scenario, StandSizeChoices.LARGE, [self.datalayer]
+        )
+
+        self.assertEqual(sorted(expected), sorted(stand_ids))
+
+    def test_geometry_change_clears_materialized_stands(self):
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+        planning_area = PlanningArea.objects.get(pk=self.planning_area.pk)
+
+        planning_area.geometry = MultiPolygon(
+            [planning_area.geometry[0].buffer(-0.1)], srid=planning_area.geometry.srid
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            planning_area.save()
+
+        planning_area.refresh_from_db()
+        self.assertEqual([], planning_area.materialized_stand_sizes)
+        self.assertTrue(
+            PlanningAreaStand.objects.filter(planning_area=planning_area).exists()
+        )
+
+        for callback in callbacks:
+            callback()
+        self.assertFalse(
+            PlanningAreaStand.objects.filter(planning_area=planning_area).exists()
+        )
+
+    def test_stands_materialized_again_before_commit_are_kept(self):
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+        planning_area = PlanningArea.objects.get(pk=self.planning_area.pk)
+
+        planning_area.geometry = MultiPolygon(
+            [planning_area.geometry[0].buffer(-0.1)], srid=planning_area.geometry.srid
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            planning_area.save()
+            materialize_planning_area_stands(planning_area, StandSizeChoices.LARGE)
+
+        planning_area.refresh_from_db()
+        self.assertEqual(
+            [StandSizeChoices.LARGE], planning_area.materialized_stand_sizes
+        )
+        self.assertTrue(
+            PlanningAreaStand.objects.filter(planning_area=planning_area).exists()
+        )
+
+    def test_get_available_stands(self):
+        result = get_available_stands(self.scenario, stand_size=StandSizeChoices.LARGE)
+
+        self.assertEqual([], result["unavailable"]["by_exclusions"])
+        self.assertEqual([], result["unavailable"]["by_thresholds"])
+        summary = result["summary"]
+        self.assertEqual(17, summary["treatable_stand_count"])
+        self.assertGreater(summary["total_area"], 0)
+        self.assertAlmostEqual(summary["total_area"], summary["available_area"])
+        self.assertAlmostEqual(summary["total_area"], summary["treatable_area"])
+        self.assertAlmostEqual(0, summary["unavailable_area"])
+
+    def test_get_available_stands_with_excludes_and_constraints(self):
+        self.datalayer.metadata = {"modules": {"forsys": {"metric_column": "majority"}}}
+        self.datalayer.save()
+        stands = self.planning_area.get_stands(StandSizeChoices.LARGE)
+        excluded_ids = list(get_excluded_stands(stands, self.datalayer))
+        constrained_ids = list(
+            get_constrained_stands(
+                stands,
+                self.datalayer,
+                value=1,
+                usage_type=TreatmentGoalUsageType.THRESHOLD,
+            )
+        )
+
+        result = get_available_stands(
+            self.scenario,
+            stand_size=StandSizeChoices.LARGE,
+            excludes=[self.datalayer],
+            constraints=[{"datalayer": self.datalayer, "operator": "eq", "value": "1"}],
+        )
+
+        self.assertEqual(sorted(excluded_ids), result["unavailable"]["by_exclusions"])
+        self.assertEqual(
+            sorted(constrained_ids), result["unavailable"]["by_thresholds"]
+        )
+        summary = result["summary"]
+        self.assertEqual(0, summary["treatable_stand_count"])
+        self.assertAlmostEqual(0, summary["treatable_area"])
+        self.assertAlmostEqual(summary["total_area"], summary["unavailable_area"])
+        self.assertLess(summary["available_area"], summary["total_area"])
+
+    def test_get_available_stands_materialized(self):
+        expected = get_available_stands(
+            self.scenario,
+            stand_size=StandSizeChoices.LARGE,
+            excludes=[self.datalayer],
+        )
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+
+        result = get_available_stands(
+            self.scenario,
+            stand_size=StandSizeChoices.LARGE,
+            excludes=[self.datalayer],
+        )
+
+        self.assertEqual(expected["unavailable"], result["unavailable"])
+        for key, value in expected["summary"].items():
+            self.assertAlmostEqual(value, result["summary"][key], places=4)
+
     def test_get_available_stands_ids_with_excluded_area(self):
         stand_ids = get_available_stand_ids(
             self.scenario, StandSizeChoices.LARGE, [self.datalayer]
@@ -1576,7 +1755,6 @@ class SubUnitsDetailsTest(TestCase):
 
     @mock.patch("planning.services.get_sub_units_areas", return_value=None)
     def test_no_areas(self, mock_get_units_area):
-
         details = get_sub_units_details(
             self.scenario, self.scenario.get_stand_size(), self.datalayer
         )
@@ -1651,6 +1829,155 @@ class SubUnitsDetailsTest(TestCase):
         self.assertEqual(details.get("targeted_area"), 4250)
 
 
+class SubUnitStandsTest(TestCase):
+    def setUp(self):
+        self.planning_area = PlanningAreaFactory.create(with_stands=True)
+        self.scenario = ScenarioFactory.create(
+            planning_area=self.planning_area,
+            configuration={"stand_size": StandSizeChoices.LARGE},
+        )
+        xmin, ymin, xmax, ymax = self.planning_area.geometry.extent
+        xsplit = xmin + (xmax - xmin) * 0.4371
+        self.sub_units = [
+            Polygon.from_bbox((xmin, ymin, xsplit, ymax)),
+            Polygon.from_bbox((xsplit, ymin, xmax, ymax)),
+            # intersects the planning area, but holds no stand centroid
+            Polygon.from_bbox((xmax - 1e-9, ymax - 1e-9, xmax + 1, ymax + 1)),
+            # outside of the planning area
+            Polygon.from_bbox((xmax + 1, ymax + 1, xmax + 2, ymax + 2)),
+        ]
+        self.datalayer = DataLayerFactory.create(
+            type=DataLayerType.VECTOR,
+            geometry_type=GeometryType.POLYGON,
+            table=self.create_sub_units_table(self.sub_units),
+            info={"schema": {"geometry": "Polygon", "properties": {}}},
+        )
+
+    def create_sub_units_table(self, geometries):
+        table_name = f"test_sub_units_{uuid4().hex}"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                CREATE TABLE datastore.{table_name} (
+                    id serial PRIMARY KEY,
+                    geometry geometry(Polygon, 4269)
+                );
+                CREATE INDEX ON datastore.{table_name} USING GIST (geometry);
+                """
+            )
+            for geometry in geometries:
+                cursor.execute(
+                    f"""
+                    INSERT INTO datastore.{table_name} (geometry)
+                    VALUES (ST_GeomFromText(%s, 4269));
+                    """,
+                    [geometry.wkt],
+                )
+        self.addCleanup(self.drop_sub_units_table, table_name)
+        return f"datastore.{table_name}"
+
+    def drop_sub_units_table(self, table_name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS datastore.{table_name};")
+
+    def expected_lookup_table(self):
+        """The stands of each sub unit, one spatial query per sub unit."""
+        geometry = self.planning_area.geometry
+        stands = self.planning_area.get_stands(StandSizeChoices.LARGE)
+        return {
+            str(sub_unit_id): sorted(
+                stands.within_polygon(
+                    geometry.intersection(sub_unit), StandSizeChoices.LARGE
+                ).values_list("id", flat=True)
+            )
+            for sub_unit_id, sub_unit in enumerate(self.sub_units[:3], start=1)
+        }
+
+    def test_lookup_table_matches_per_sub_unit_queries(self):
+        lookup_table = get_sub_units_stands_lookup_table(self.scenario, self.datalayer)
+
+        expected = self.expected_lookup_table()
+        self.assertEqual(lookup_table, expected)
+        self.assertEqual([], lookup_table["3"])
+        self.assertEqual(17, sum(len(stand_ids) for stand_ids in lookup_table.values()))
+
+    def test_sub_units_areas(self):
+        areas = get_sub_units_areas(
+            self.scenario, StandSizeChoices.LARGE, self.datalayer
+        )
+
+        stand_area = settings.MIN_AREA_PROJECT_LARGE
+        self.assertEqual(
+            areas,
+            [
+                len(stand_ids) * stand_area
+                for stand_ids in self.expected_lookup_table().values()
+                if stand_ids
+            ],
+        )
+
+    def test_stands_from_sub_units(self):
+        stands = self.planning_area.get_stands(StandSizeChoices.LARGE)
+        excluded = stands.first()
+
+        sub_units_stands = get_stands_from_sub_units(
+            stands.exclude(pk=excluded.pk),
+            self.scenario,
+            StandSizeChoices.LARGE,
+            self.datalayer,
+        )
+
+        self.assertEqual(16, sub_units_stands.count())
+        self.assertNotIn(excluded, sub_units_stands)
+
+    def test_assignments_are_persisted(self):
+        get_sub_units_areas(self.scenario, StandSizeChoices.LARGE, self.datalayer)
+        self.assertTrue(
+            self.scenario.has_materialized_sub_units(
+                self.datalayer.pk, StandSizeChoices.LARGE
+            )
+        )
+
+        with self.assertNumQueries(1):
+            get_sub_units_stands_lookup_table(self.scenario, self.datalayer)
+
+    def test_stale_scenario_does_not_materialize_twice(self):
+        stale_scenario = Scenario.objects.get(pk=self.scenario.pk)
+        get_sub_units_areas(self.scenario, StandSizeChoices.LARGE, self.datalayer)
+        rows = ScenarioSubUnitStand.objects.filter(scenario=self.scenario).count()
+
+        with mock.patch(
+            "planning.services.materialize_scenario_sub_unit_stands"
+        ) as materialize:
+            get_sub_units_areas(stale_scenario, StandSizeChoices.LARGE, self.datalayer)
+
+        materialize.assert_not_called()
+        self.assertEqual(
+            rows, ScenarioSubUnitStand.objects.filter(scenario=self.scenario).count()
+        )
+        self.assertTrue(
+            stale_scenario.has_materialized_sub_units(
+                self.datalayer.pk, StandSizeChoices.LARGE
+            )
+        )
+
+    def test_planning_area_geometry_change_clears_assignments(self):
+        get_sub_units_areas(self.scenario, StandSizeChoices.LARGE, self.datalayer)
+
+        planning_area = PlanningArea.objects.get(pk=self.planning_area.pk)
+        planning_area.geometry = MultiPolygon(
+            [planning_area.geometry[0].buffer(-0.1)], srid=planning_area.geometry.srid
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            planning_area.save()
+
+        self.scenario.refresh_from_db()
+        self.assertEqual([], self.scenario.materialized_sub_units)
+        self.assertFalse(
+            ScenarioSubUnitStand.objects.filter(scenario=self.scenario).exists()
+        )
+
+
 class CalculateAndUpdateScenarioResult(TestCase):
     def setUp(self):
         self.datalayers = DataLayerFactory.create_batch(2, type=DataLayerType.RASTER)
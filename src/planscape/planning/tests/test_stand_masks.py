@@ -0,0 +1,244 @@
+import json
+
+import numpy as np
+from datasets.models import DataLayerType
+from datasets.tests.factories import DataLayerFactory
+from django.contrib.gis.db.models import Union
+from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from stands.models import Stand, StandMetric, StandSizeChoices
+from stands.services import copy_upsert_stand_metrics
+from stands.tests.factories import StandFactory, StandMetricFactory
+
+from planning.services import (
+    get_available_stand_ids,
+    get_available_stands,
+    materialize_planning_area_stands,
+)
+from planning.stand_masks import (
+    EXCLUSION_PREDICATE,
+    any_mask,
+    get_stand_index,
+    get_stand_mask,
+)
+from planning.tests.factories import PlanningAreaFactory, ScenarioFactory
+
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "stand-masks-tests",
+    }
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class StandMasksTest(TestCase):
+    def load_stands(self):
+        with open("impacts/tests/test_data/stands.geojson") as fp:
+            geojson = json.loads(fp.read())
+
+        return [
+            StandFactory.create(
+                geometry=GEOSGeometry(json.dumps(f.get("geometry")), srid=4326),
+                size="LARGE",
+                area_m2=1,
+            )
+            for f in geojson.get("features")
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.stands = sorted(self.load_stands(), key=lambda stand: stand.pk)
+        self.stand_ids = [stand.pk for stand in self.stands]
+        self.planning_area = PlanningAreaFactory.create(
+            geometry=MultiPolygon(
+                [
+                    Stand.objects.filter(id__in=self.stand_ids).aggregate(
+                        geometry=Union("geometry")
+                    )["geometry"]
+                ]
+            )
+        )
+        self.scenario = ScenarioFactory.create(
+            planning_area=self.planning_area,
+            configuration={"stand_size": StandSizeChoices.LARGE},
+        )
+        self.exclude = DataLayerFactory.create(type=DataLayerType.VECTOR)
+        self.threshold = DataLayerFactory.create(type=DataLayerType.RASTER)
+        for i, stand in enumerate(self.stands):
+            StandMetricFactory.create(
+                stand=stand,
+                datalayer=self.exclude,
+                majority=1 if i < 3 else 0,
+            )
+            StandMetricFactory.create(stand=stand, datalayer=self.threshold, avg=i)
+
+    def test_index_is_sorted_stand_ids(self):
+        index = get_stand_index(self.planning_area, StandSizeChoices.LARGE)
+
+        self.assertEqual(self.stand_ids, index.stand_ids.tolist())
+        self.assertEqual(len(self.stands), len(index.areas_m2))
+        self.assertTrue((index.areas_m2 > 0).all())
+
+    def test_masks_compose(self):
+        index = get_stand_index(self.planning_area, StandSizeChoices.LARGE)
+        excluded = get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        low = get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.threshold.pk,
+            ("avg", "lt", 5.0),
+        )
+
+        self.assertEqual(self.stand_ids[:3], index.to_stand_ids(excluded))
+        self.assertEqual(self.stand_ids[:5], index.to_stand_ids(low))
+        self.assertEqual(self.stand_ids[3:5], index.to_stand_ids(low & ~excluded))
+        self.assertEqual(self.stand_ids[:5], index.to_stand_ids(low | excluded))
+        self.assertEqual(
+            self.stand_ids[:5], index.to_stand_ids(any_mask(index, [low, excluded]))
+        )
+        self.assertFalse(any_mask(index, []).any())
+
+    def test_masks_are_cached(self):
+        get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+
+        with self.assertNumQueries(0):
+            mask = get_stand_mask(
+                self.planning_area,
+                StandSizeChoices.LARGE,
+                self.exclude.pk,
+                EXCLUSION_PREDICATE,
+            )
+        self.assertEqual(3, mask.sum())
+
+    def test_saving_a_metric_invalidates_masks(self):
+        get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        metric = StandMetric.objects.get(stand=self.stands[5], datalayer=self.exclude)
+        metric.majority = 1
+        with self.captureOnCommitCallbacks(execute=True):
+            metric.save()
+
+        mask = get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        self.assertEqual(4, mask.sum())
+
+    def test_bulk_writes_invalidate_masks(self):
+        get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            copy_upsert_stand_metrics(
+                [
+                    StandMetric(
+                        stand_id=self.stand_ids[0],
+                        datalayer_id=self.exclude.pk,
+                        majority=0,
+                    )
+                ]
+            )
+
+        mask = get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        self.assertEqual(self.stand_ids[1:3], np.array(self.stand_ids)[mask].tolist())
+
+    def test_masks_are_invalidated_after_commit(self):
+        get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                copy_upsert_stand_metrics(
+                    [
+                        StandMetric(
+                            stand_id=self.stand_ids[0],
+                            datalayer_id=self.exclude.pk,
+                            majority=0,
+                        )
+                    ]
+                )
+                # not committed yet, the cached mask is still used
+                with self.assertNumQueries(0):
+                    mask = get_stand_mask(
+                        self.planning_area,
+                        StandSizeChoices.LARGE,
+                        self.exclude.pk,
+                        EXCLUSION_PREDICATE,
+                    )
+                self.assertEqual(3, mask.sum())
+
+        self.assertEqual(1, len(callbacks))
+        callbacks[0]()
+        mask = get_stand_mask(
+            self.planning_area,
+            StandSizeChoices.LARGE,
+            self.exclude.pk,
+            EXCLUSION_PREDICATE,
+        )
+        self.assertEqual(self.stand_ids[1:3], np.array(self.stand_ids)[mask].tolist())
+
+    def test_materializing_stands_invalidates_index(self):
+        get_stand_index(self.planning_area, StandSizeChoices.LARGE)
+        materialize_planning_area_stands(self.planning_area, StandSizeChoices.LARGE)
+
+        with self.assertNumQueries(1):
+            index = get_stand_index(self.planning_area, StandSizeChoices.LARGE)
+        self.assertEqual(self.stand_ids, index.stand_ids.tolist())
+
+    def test_available_stands_match_query(self):
+        constraints = [{"datalayer": self.threshold, "operator": "gte", "value": "5"}]
+        expected = get_available_stands(
+            self.scenario,
+            stand_size=StandSizeChoices.LARGE,
+            excludes=[self.exclude],
+            constraints=constraints,
+        )
+        expected_ids = get_available_stand_ids(
+            self.scenario, StandSizeChoices.LARGE, [self.exclude]
+        )
+
+        with override_settings(FEATURE_FLAGS="STAND_MASKS_CACHE"):
+            result = get_available_stands(
+                self.scenario,
+                stand_size=StandSizeChoices.LARGE,
+                excludes=[self.exclude],
+                constraints=constraints,
+            )
+            stand_ids = get_available_stand_ids(
+                self.scenario, StandSizeChoices.LARGE, [self.exclude]
+            )
+
+        self.assertEqual(expected["unavailable"], result["unavailable"])
+        for key, value in expected["summary"].items():
+            self.assertAlmostEqual(value, result["summary"][key], places=4)
+        self.assertEqual(sorted(expected_ids), sorted(stand_ids))
@@ -1,4 +1,5 @@
 import json
+import multiprocessing
 from unittest import mock
 
 from datasets.models import DataLayerType
@@ -16,6 +17,7 @@ from planning.models import (
     ScenarioType,
 )
 from planning.tasks import (
+    async_backfill_stand_metrics,
     async_calculate_stand_metrics_with_stand_list,
     async_forsys_run,
     async_pre_forsys_process,
@@ -111,6 +113,25 @@ class AsyncCalculateStandMetricsTest(TestCase):
 
         self.assertEqual(StandMetric.objects.count(), 0)
 
+    def test_async_backfill_stand_metrics_in_daemonic_worker(self):
+        # celery prefork workers are daemonic and can't have children
+        with mock.patch.dict(
+            multiprocessing.current_process()._config, {"daemon": True}
+        ):
+            async_backfill_stand_metrics.apply(
+                args=(self.stand_ids, self.datalayer.pk)
+            ).get()
+
+        self.assertEqual(
+            StandMetric.objects.filter(datalayer=self.datalayer).count(),
+            len(self.stand_ids),
+        )
+
+    def test_async_backfill_stand_metrics_datalayer_does_not_exist(self):
+        async_backfill_stand_metrics(self.stand_ids, 9999)
+
+        self.assertEqual(StandMetric.objects.count(), 0)
+
 
 class AsyncPreForsysProcessTest(TestCase):
     def setUp(self):
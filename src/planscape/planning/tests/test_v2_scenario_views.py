@@ -5,8 +5,11 @@ from unittest import mock
 from datasets.models import DataLayerType, GeometryType
 from datasets.tests.factories import DataLayerFactory
 from django.contrib.gis.geos import GEOSGeometry, MultiPolygon, Polygon
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from impacts.tests.factories import TreatmentPlanFactory
 from modules.base import compute_scenario_capabilities
 from rest_framework import status
 from rest_framework.test import APITestCase, APITransactionTestCase
@@ -329,6 +332,54 @@ class ListScenariosForPlanningAreaTest(APITestCase):
         self.assertIsNotNone(scenarios[0]["created_at"])
         self.assertIsNotNone(scenarios[0]["updated_at"])
 
+    def test_list_scenario_bbox_and_tx_plan_count(self):
+        ProjectAreaFactory.create(
+            scenario=self.scenario,
+            geometry=MultiPolygon(Polygon(((2, 0), (2, 3), (4, 3), (2, 0)))),
+        )
+        ProjectAreaFactory.create(
+            scenario=self.scenario,
+            geometry=MultiPolygon(Polygon(((9, 9), (9, 10), (10, 10), (9, 9)))),
+        ).delete()
+        TreatmentPlanFactory.create_batch(size=2, scenario=self.scenario)
+        TreatmentPlanFactory.create(scenario=self.scenario).delete()
+
+        self.client.force_authenticate(self.owner_user)
+        response = self.client.get(
+            reverse(
+                "api:planning:scenarios-list",
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        scenarios = {scenario["id"]: scenario for scenario in response.json()}
+        self.assertEqual(scenarios[self.scenario.pk]["bbox"], [1, 0, 4, 3])
+        self.assertEqual(scenarios[self.scenario.pk]["tx_plan_count"], 2)
+        self.assertIsNone(scenarios[self.scenario2.pk]["bbox"])
+        self.assertEqual(scenarios[self.scenario2.pk]["tx_plan_count"], 0)
+
+    def test_list_scenario_query_count_does_not_depend_on_size(self):
+        self.client.force_authenticate(self.owner_user)
+        url = reverse("api:planning:scenarios-list")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, content_type="application/json")
+        self.assertEqual(len(response.json()), 3)
+
+        for _ in range(5):
+            scenario = ScenarioFactory.create(
+                planning_area=self.planning_area,
+                configuration=self.configuration,
+                user=self.owner_user,
+            )
+            ScenarioResultFactory(scenario=scenario)
+            ProjectAreaFactory.create_batch(size=3, scenario=scenario)
+            TreatmentPlanFactory.create(scenario=scenario)
+
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url, content_type="application/json")
+        self.assertEqual(len(response.json()), 8)
+
     def test_toggle_scenario_status(self):
         self.client.force_authenticate(self.owner_user)
         response = self.client.post(
@@ -5,6 +5,8 @@ from collaboration.models import Role
 from collaboration.tests.factories import UserObjectRoleFactory
 from datasets.tests.factories import DataLayerFactory
 from django.contrib.gis.geos import GEOSGeometry, MultiPolygon
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from impacts.permissions import (
     COLLABORATOR_PERMISSIONS,
@@ -792,6 +794,35 @@ class ListPlanningAreasWithPermissionsTest(APITestCase):
         self.assertEqual(the_area["role"], "Viewer")
         self.assertCountEqual(the_area["permissions"], VIEWER_PERMISSIONS)
 
+    def test_planningareas_list_query_count_does_not_depend_on_size(self):
+        self.client.force_authenticate(self.collab_user)
+        url = reverse("api:planning:planningareas-list")
+        # warms up the process wide role permissions
+        self.client.get(url, {}, content_type="application/json")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {}, content_type="application/json")
+        self.assertEqual(response.json()["count"], 1)
+
+        for role in (Role.COLLABORATOR, Role.VIEWER, Role.OWNER):
+            UserObjectRoleFactory(
+                inviter=self.creator_user,
+                collaborator=self.collab_user,
+                email=self.collab_user.email,
+                role=role,
+                associated_model=PlanningAreaFactory.create(user=self.creator_user),
+            )
+        PlanningAreaFactory.create(user=self.collab_user)
+
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get(url, {}, content_type="application/json")
+        planning_areas = response.json()["results"]
+        self.assertEqual(len(planning_areas), 5)
+        self.assertCountEqual(
+            [planning_area["role"] for planning_area in planning_areas],
+            ["Creator", "Collaborator", "Collaborator", "Viewer", "Owner"],
+        )
+
 
 class UpdatePlanningAreaTest(APITestCase):
     def setUp(self):
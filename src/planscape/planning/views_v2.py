@@ -1,11 +1,14 @@
 import logging
 
+from collaboration.permissions import PermissionResolverMixin
+from collaboration.utils import get_permission_resolver
 from core.serializers import MultiSerializerMixin
 from datasets.models import DataLayer
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
 from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
@@ -42,6 +45,8 @@ from funding_report.tasks import (
     run_funding_opportunity_report,
     send_funding_opportunity_report_shared_link,
 )
+from gis.database import ExtentGeometry
+from impacts.models import TreatmentPlan
 from modules.base import compute_scenario_capabilities
 from planscape.analytics import track_event
 from planscape.serializers import BaseErrorMessageSerializer
@@ -131,7 +136,7 @@ logger = logging.getLogger(__name__)
         responses={200: PlanningAreaSerializer, 404: BaseErrorMessageSerializer},
     ),
 )
-class PlanningAreaViewSet(viewsets.ModelViewSet):
+class PlanningAreaViewSet(PermissionResolverMixin, viewsets.ModelViewSet):
     # this member is configured for instrospection and swagger automcatic generation
     queryset = PlanningArea.objects.none()
     permission_classes = [PlanningAreaViewPermission]
@@ -171,8 +176,24 @@ class PlanningAreaViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         qs = PlanningArea.objects.list_for_api(user=user).select_related("user")
+        if self.action == "list":
+            # the list only needs the persisted area_acres, not the geometry
+            qs = qs.defer("geometry")
         return qs
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        planning_areas = list(page if page is not None else queryset)
+
+        # one query for the roles of the whole page, instead of two per row
+        get_permission_resolver(request.user).load(planning_areas)
+        serializer = self.get_serializer(planning_areas, many=True)
+
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     def perform_update(self, serializer):
         instance = self.get_object()
         instance.updated_at = timezone.now()
@@ -235,7 +256,9 @@ class PlanningAreaViewSet(viewsets.ModelViewSet):
         },
     ),
 )
-class ScenarioViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
+class ScenarioViewSet(
+    PermissionResolverMixin, MultiSerializerMixin, viewsets.ModelViewSet
+):
     queryset = Scenario.objects.none()
     permission_classes = [ScenarioViewPermission]
     ordering_fields = [
@@ -267,6 +290,16 @@ class ScenarioViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
             results__status=ScenarioResultStatus.DRAFT
         )
 
+        project_areas = (
+            ProjectArea.objects.filter(scenario_id=OuterRef("pk"))
+            .order_by()
+            .values("scenario_id")
+        )
+        tx_plans = (
+            TreatmentPlan.objects.filter(scenario_id=OuterRef("pk"))
+            .order_by()
+            .values("scenario_id")
+        )
         qs = (
             Scenario.objects.list_by_user(user=user)
             .filter(Q(user=user) | ~draft_status)
@@ -274,8 +307,22 @@ class ScenarioViewSet(MultiSerializerMixin, viewsets.ModelViewSet):
                 "planning_area",
                 "user",
                 "results",
+                "treatment_goal",
+            )
+            .annotate(
+                bbox=Subquery(
+                    project_areas.annotate(bbox=ExtentGeometry("geometry")).values(
+                        "bbox"
+                    )
+                ),
+                tx_plan_count=Coalesce(
+                    Subquery(
+                        tx_plans.annotate(count=Count("id")).values("count"),
+                        output_field=IntegerField(),
+                    ),
+                    0,
+                ),
             )
-            .prefetch_related("project_areas")
         )
         if self.action == "list":
             qs = qs.filter(parent__isnull=True)
@@ -419,7 +419,7 @@ GCS_DEFAULT_CACHE_DIRECTIVES = config(
     f"public, max-age={GCS_DEFAULT_CACHE_MAX_AGE}, immutable",
     cast=str,
 )
-SUB_UNITS_DETAILS_TTL = config("GCS_PUBLIC_URL_TTL", 86400, cast=int)  # 1 day
+STAND_MASKS_TTL = config("STAND_MASKS_TTL", 86400, cast=int)  # 1 day
 
 # CELERY
 CELERY_BROKER_URL = config("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -471,6 +471,9 @@ CELERY_TASK_ROUTES = {
     "planning.tasks.async_calculate_vector_metrics": {
         "queue": "planning-stand-metrics",
     },
+    "planning.tasks.async_backfill_stand_metrics": {
+        "queue": "planning-stand-metrics",
+    },
     "impacts.tasks.*": {
         "queue": "impacts",
     },
@@ -638,6 +641,9 @@ DEFAULT_ORGANIZATION_NAME = "Spatial Informatics Group"
 DEFAULT_ADMIN_EMAIL = "admin@planscape.org"
 DEFAULT_BASELAYERS_DATASET_ID = 999
 CLIMATE_FORESIGHT_DATASET_ID = 1050
+CLIMATE_FORESIGHT_GRID_TTL = config(
+    "CLIMATE_FORESIGHT_GRID_TTL", 86400, cast=int
+)  # 1 day
 
 
 FEATURE_FLAGS = config(
@@ -645,6 +651,9 @@ FEATURE_FLAGS = config(
 )
 
 STAND_METRICS_PAGE_SIZE = config("STAND_METRICS_PAGE_SIZE", default=5000, cast=int)
+STAND_METRICS_BACKFILL_WORKERS = config(
+    "STAND_METRICS_BACKFILL_WORKERS", default=4, cast=int
+)
 AVAILABLE_STANDS_SIMPLIFY_TOLERANCE = config(
     "AVAILABLE_STANDS_SIMPLIFY_TOLERANCE", default=100, cast=int
 )
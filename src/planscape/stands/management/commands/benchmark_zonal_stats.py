@@ -0,0 +1,145 @@
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import rasterio
+from django.core.management.base import BaseCommand, CommandParser
+from gis.rasters import cog
+from rasterio.transform import from_origin
+from rasterstats import zonal_stats
+from shapely.geometry import Polygon, mapping
+
+from stands.models import StandSizeChoices, length_from_size
+from stands.services import DEFAULT_AGGREGATIONS
+from stands.stats import windowed_zonal_stats
+
+# somewhere in the Sierra Nevada, EPSG:3857
+ORIGIN_X = -13300000.0
+ORIGIN_Y = 4700000.0
+PIXEL_SIZE = 30.0
+NODATA = -9999.0
+
+
+def write_synthetic_cog(path: Path, size: int) -> str:
+    rng = np.random.default_rng(42)
+    data = rng.integers(0, 100, size=(size, size)).astype("float32")
+    data[rng.random(size=(size, size)) < 0.05] = NODATA
+    profile = {
+        "driver": "GTiff",
+        "dtype": "float32",
+        "count": 1,
+        "width": size,
+        "height": size,
+        "crs": "EPSG:3857",
+        "transform": from_origin(ORIGIN_X, ORIGIN_Y, PIXEL_SIZE, PIXEL_SIZE),
+        "nodata": NODATA,
+        "tiled": True,
+        "blockxsize": 512,
+        "blockysize": 512,
+    }
+    raw = path / "raw.tif"
+    with rasterio.open(raw, "w", **profile) as dst:
+        dst.write(data, 1)
+    return cog(str(raw), str(path / "cog.tif"))
+
+
+def hexagon_grid(extent: float, side: float):
+    width = math.sqrt(3) * side
+    vertical_step = 1.5 * side
+    features = []
+    row = 0
+    y = ORIGIN_Y - side
+    while y - side > ORIGIN_Y - extent:
+        x = ORIGIN_X + width / 2 + (width / 2 if row % 2 else 0)
+        while x + width / 2 < ORIGIN_X + extent:
+            hexagon = Polygon(
+                [
+                    (
+                        x + side * math.cos(math.radians(30 + 60 * i)),
+                        y + side * math.sin(math.radians(30 + 60 * i)),
+                    )
+                    for i in range(6)
+                ]
+            )
+            features.append(
+                {
+                    "type": "Feature",
+                    "id": len(features) + 1,
+                    "properties": {"id": len(features) + 1},
+                    "geometry": mapping(hexagon),
+                }
+            )
+            x += width
+        y -= vertical_step
+        row += 1
+    return features
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks rasterstats zonal stats against the windowed zonal stats "
+        "engine on a synthetic COG and checks that both produce the same metrics."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=4096,
+            help="Width and height, in pixels, of the synthetic COG.",
+        )
+        parser.add_argument(
+            "--stand-size",
+            choices=StandSizeChoices.values,
+            default=StandSizeChoices.SMALL,
+            help="Stand size used to build the hexagon grid.",
+        )
+
+    def handle(self, *args, **options):
+        size = options["size"]
+        stand_size = options["stand_size"]
+        with tempfile.TemporaryDirectory() as tmp:
+            raster = write_synthetic_cog(Path(tmp), size)
+            stands = hexagon_grid(
+                extent=size * PIXEL_SIZE,
+                side=length_from_size(stand_size),
+            )
+            self.stdout.write(f"{len(stands)} {stand_size} stands, {size}x{size} COG")
+
+            start = time.perf_counter()
+            expected = zonal_stats(
+                raster=raster,
+                vectors=stands,
+                stats=DEFAULT_AGGREGATIONS,
+                nodata=NODATA,
+                geojson_out=True,
+                band=1,
+            )
+            rasterstats_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = windowed_zonal_stats(
+                raster=raster,
+                vectors=stands,
+                stats=DEFAULT_AGGREGATIONS,
+                nodata=NODATA,
+                band=1,
+            )
+            windowed_elapsed = time.perf_counter() - start
+
+        mismatches = 0
+        for old, new in zip(expected, actual):
+            for stat in DEFAULT_AGGREGATIONS:
+                old_value = old["properties"][stat]
+                new_value = new["properties"][stat]
+                if old_value is None or new_value is None:
+                    mismatches += old_value is not new_value
+                elif not math.isclose(old_value, new_value, rel_tol=1e-6):
+                    mismatches += 1
+
+        self.stdout.write(f"rasterstats: {rasterstats_elapsed:.2f}s")
+        self.stdout.write(f"windowed:    {windowed_elapsed:.2f}s")
+        self.stdout.write(f"speedup:     {rasterstats_elapsed / windowed_elapsed:.1f}x")
+        self.stdout.write(f"mismatched values: {mismatches}")
@@ -1,19 +1,29 @@
+import csv
+import io
+import itertools
 import json
 import logging
-from typing import Any, Collection, Dict
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Collection, Dict, Iterable, List, Optional
 
 import rasterio
+from core.flags import feature_enabled
 from core.requests import RequestSessionWrap
 from datasets.dynamic_models import qualify_for_django
 from datasets.models import DataLayer, DataLayerType
 from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
-from django.db import connection
+from django.db import connection, transaction
 from django.db.models import QuerySet
 from gis.info import get_gdal_env
+from rasterio.io import DatasetReader
 from rasterstats import zonal_stats
 
 from stands.models import Stand, StandMetric, StandSizeChoices
+from stands.signals import stand_metrics_changed
+from stands.stats import windowed_zonal_stats
 
 log = logging.getLogger(__name__)
 
@@ -153,6 +163,7 @@ def calculate_stand_vector_stats_with_stand_list(
             query,
             [tuple(stand_ids), datalayer.pk],
         )
+    stand_metrics_changed.send(sender=StandMetric, datalayer_ids=[datalayer.pk])
 
 
 def calculate_stand_zonal_stats_api(
@@ -203,15 +214,9 @@ def calculate_stand_zonal_stats_api(
             data,
         )
     )
-    StandMetric.objects.bulk_create(
-        results,
-        batch_size=100,
-        update_conflicts=True,
-        unique_fields=["stand_id", "datalayer_id"],
-        update_fields="min avg median max sum count majority minority".split(),
-    )
+    written = copy_upsert_stand_metrics(results)
 
-    log.info(f"Created/Updated {len(results)} stand metrics.")
+    log.info(f"Created/Updated {written} stand metrics.")
 
 
 def calculate_stand_zonal_stats(
@@ -235,14 +240,24 @@ def calculate_stand_zonal_stats(
     stand_geojson = list(map(to_geojson, missing_stands))
     nodata = datalayer.info.get("nodata", 0) or 0 if datalayer.info else 0
     with rasterio.Env(**get_gdal_env()):
-        stats = zonal_stats(
-            raster=datalayer.url,
-            vectors=stand_geojson,
-            stats=aggregations,
-            nodata=nodata,
-            geojson_out=True,
-            band=1,
-        )
+        if feature_enabled("WINDOWED_ZONAL_STATS"):
+            # one read per raster tile instead of one read per stand
+            stats = windowed_zonal_stats(
+                raster=datalayer.url,
+                vectors=stand_geojson,
+                stats=aggregations,
+                nodata=nodata,
+                band=1,
+            )
+        else:
+            stats = zonal_stats(
+                raster=datalayer.url,
+                vectors=stand_geojson,
+                stats=aggregations,
+                nodata=nodata,
+                geojson_out=True,
+                band=1,
+            )
 
     results = list(
         map(
@@ -254,15 +269,260 @@ def calculate_stand_zonal_stats(
             stats,
         )
     )
-    StandMetric.objects.bulk_create(
-        results,
-        batch_size=100,
-        update_conflicts=True,
-        unique_fields=["stand_id", "datalayer_id"],
-        update_fields="min avg median max sum count majority minority".split(),
+    written = copy_upsert_stand_metrics(results)
+
+    log.info(f"Created/Updated {written} stand metrics.")
+
+
+STAND_METRIC_COPY_COLUMNS = (
+    "stand_id",
+    "datalayer_id",
+    "min",
+    "avg",
+    "median",
+    "max",
+    "sum",
+    "count",
+    "majority",
+    "minority",
+)
+
+
+def _to_copy_rows(metrics: Iterable[StandMetric]) -> Iterable[List[Any]]:
+    for metric in metrics:
+        yield [
+            "" if value is None else value
+            for value in (
+                getattr(metric, column) for column in STAND_METRIC_COPY_COLUMNS
+            )
+        ]
+
+
+def copy_upsert_stand_metrics(
+    metrics: Iterable[StandMetric],
+    chunk_size: int = 50_000,
+) -> int:
+    """Upserts stand metrics streaming them with COPY into a temporary
+    staging table, then merging into stands_standmetric with a single
+    INSERT ... ON CONFLICT DO UPDATE.
+
+    `metrics` can be any iterable (e.g. a generator over zonal stats
+    results); it is consumed `chunk_size` rows at a time, so the whole
+    result set never has to be serialized in memory at once. If the same
+    stand/datalayer pair shows up more than once, only one of them is kept.
+
+    Returns the number of rows inserted or updated in stands_standmetric.
+    """
+    columns = ", ".join(f'"{column}"' for column in STAND_METRIC_COPY_COLUMNS)
+    updates = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"' for column in STAND_METRIC_COPY_COLUMNS[2:]
     )
+    rows = _to_copy_rows(metrics)
+    total = 0
+    upserted = 0
+    datalayer_ids = set()
+    with transaction.atomic(), connection.cursor() as cursor:
+        # temp tables are not WAL-logged and only visible to this session
+        cursor.execute(
+            """
+            DROP TABLE IF EXISTS pg_temp.stands_standmetric_staging;
+            CREATE TEMPORARY TABLE stands_standmetric_staging (
+                stand_id bigint NOT NULL,
+                datalayer_id bigint,
+                min double precision,
+                avg double precision,
+                median double precision,
+                max double precision,
+                sum double precision,
+                count integer,
+                majority double precision,
+                minority double precision
+            ) ON COMMIT DROP;
+            """
+        )
+        while True:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            written = 0
+            for row in itertools.islice(rows, chunk_size):
+                writer.writerow(row)
+                datalayer_ids.add(row[1])
+                written += 1
+            if written == 0:
+                break
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY stands_standmetric_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            total += written
+
+        if total > 0:
+            cursor.execute(
+                f"""
+                INSERT INTO stands_standmetric (created_at, {columns})
+                SELECT DISTINCT ON ("stand_id", "datalayer_id") now(), {columns}
+                FROM stands_standmetric_staging
+                ORDER BY "stand_id", "datalayer_id"
+                ON CONFLICT ("stand_id", "datalayer_id") DO UPDATE SET {updates};
+                """
+            )
+            upserted = cursor.rowcount
+        cursor.execute("DROP TABLE pg_temp.stands_standmetric_staging;")
+    if datalayer_ids:
+        stand_metrics_changed.send(sender=StandMetric, datalayer_ids=datalayer_ids)
+    return upserted
 
-    log.info(f"Created/Updated {len(results)} stand metrics.")
+
+class _BackfillRasters:
+    """Keeps one open dataset per pool thread, so batches handled by the
+    same thread reuse it. Datasets are not thread safe, so they can't be
+    shared between threads.
+    """
+
+    def __init__(self, url: str, gdal_env: Dict[str, Any]):
+        self.url = url
+        self.gdal_env = gdal_env
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._opened: List[DatasetReader] = []
+
+    def get(self) -> DatasetReader:
+        raster = getattr(self._local, "raster", None)
+        if raster is None:
+            raster = rasterio.open(self.url)
+            self._local.raster = raster
+            with self._lock:
+                self._opened.append(raster)
+        return raster
+
+    def close(self) -> None:
+        with self._lock:
+            for raster in self._opened:
+                raster.close()
+            self._opened.clear()
+
+
+def _backfill_batch(
+    vectors: List[Dict[str, Any]],
+    rasters: _BackfillRasters,
+    aggregations: Collection[str],
+    nodata: float,
+) -> List[Dict[str, Any]]:
+    # GDAL config options are thread local, so the env is entered here, in
+    # the pool thread, and exited once the batch is done.
+    with rasterio.Env(**rasters.gdal_env):
+        return windowed_zonal_stats(
+            vectors=vectors,
+            raster=rasters.get(),
+            stats=aggregations,
+            nodata=nodata,
+            band=1,
+        )
+
+
+def backfill_stand_zonal_stats(
+    stand_ids: Collection[int],
+    datalayer: DataLayer,
+    aggregations: Collection[str] = DEFAULT_AGGREGATIONS,
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """Calculates zonal stats for many stands of a single datalayer inside
+    one task, fanning the batches out to a pool of threads that keep the
+    raster open between batches. Results are upserted with COPY as each
+    batch finishes.
+
+    A thread pool is used because this runs inside Celery prefork workers,
+    which are daemonic and can't start child processes. Reads and
+    rasterization release the GIL.
+
+    Returns throughput numbers for the run, or an empty dict if there is
+    nothing to calculate.
+    """
+    if datalayer.type == DataLayerType.VECTOR:
+        raise ValueError("Cannot calculate zonal stats for vector layers.")
+
+    if datalayer.url is None:
+        raise ValueError("Cannot calculate zonal stats for empty urls.")
+
+    batch_size = batch_size or settings.STAND_METRICS_PAGE_SIZE
+    max_workers = max_workers or settings.STAND_METRICS_BACKFILL_WORKERS
+    nodata = datalayer.info.get("nodata", 0) or 0 if datalayer.info else 0
+    ordered_ids = list(
+        Stand.objects.filter(id__in=stand_ids)
+        .order_by("grid_key")
+        .values_list("id", flat=True)
+    )
+    if not ordered_ids:
+        log.info("There are no missing stands. Early return.")
+        return {}
+
+    batches = (
+        ordered_ids[i : i + batch_size] for i in range(0, len(ordered_ids), batch_size)
+    )
+
+    start = time.monotonic()
+    stands_count = 0
+    pixels_count = 0
+    rasters = _BackfillRasters(datalayer.url, get_gdal_env())
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def submit(batch: List[int]) -> Future:
+                # Only this thread touches the database: the stands of a
+                # batch are loaded right before it is submitted and handed
+                # to the pool as geojson.
+                vectors = list(
+                    map(
+                        to_geojson,
+                        Stand.objects.filter(id__in=batch).with_webmercator(),
+                    )
+                )
+                return executor.submit(
+                    _backfill_batch, vectors, rasters, aggregations, nodata
+                )
+
+            # a bounded window of batches in flight, so the stands of the
+            # whole run are never held in memory at once
+            pending = {
+                submit(batch) for batch in itertools.islice(batches, max_workers * 2)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats = future.result()
+                    stands_count += copy_upsert_stand_metrics(
+                        to_stand_metric(
+                            stats_result=r,
+                            datalayer=datalayer,
+                            aggregations=aggregations,
+                        )
+                        for r in stats
+                    )
+                    pixels_count += sum(
+                        (r.get("properties", {}) or {}).get("count") or 0 for r in stats
+                    )
+                    next_batch = next(batches, None)
+                    if next_batch is not None:
+                        pending.add(submit(next_batch))
+    finally:
+        rasters.close()
+
+    elapsed = max(time.monotonic() - start, 1e-9)
+    throughput = {
+        "stands": stands_count,
+        "pixels": pixels_count,
+        "seconds": elapsed,
+        "stands_per_second": stands_count / elapsed,
+        "pixels_per_second": pixels_count / elapsed,
+    }
+    log.info(
+        f"Backfilled {stands_count} stand metrics for datalayer {datalayer.pk} "
+        f"in {elapsed:.1f}s ({throughput['stands_per_second']:.0f} stands/s, "
+        f"{throughput['pixels_per_second']:.0f} pixels/s)."
+    )
+    return throughput
 
 
 def get_datalayer_metric(datalayer: DataLayer) -> str:
@@ -327,6 +587,57 @@ def get_missing_stand_ids_for_datalayer_within_geometry(
         return missing_stand_ids
 
 
+def get_missing_stand_ids_for_datalayers_within_geometry(
+    geometry: GEOSGeometry,
+    stand_size: StandSizeChoices,
+    datalayers: Collection[DataLayer],
+) -> Dict[int, set[int]]:
+    """
+    Batched version of `get_missing_stand_ids_for_datalayer_within_geometry`.
+    The spatial filter runs once for all datalayers, and the stands are
+    anti-joined against stands_standmetric for each datalayer.
+
+    Returns a map of datalayer ID to the set of stand IDs without a metric
+    for it. Every requested datalayer is present in the map.
+    """
+    datalayer_ids = [datalayer.pk for datalayer in datalayers]
+    missing_stand_ids: Dict[int, set[int]] = {pk: set() for pk in datalayer_ids}
+    if not datalayer_ids:
+        return missing_stand_ids
+
+    query = """
+    WITH stands AS MATERIALIZED (
+        SELECT s.id FROM stands_stand s
+        WHERE
+            s.size = %s AND
+            s.geometry && ST_GeomFromText(%s, %s) AND
+            ST_Within(ST_Centroid(s.geometry), ST_GeomFromText(%s, %s))
+    )
+    SELECT d.datalayer_id, s.id
+    FROM stands s
+    CROSS JOIN unnest(%s::integer[]) AS d(datalayer_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM stands_standmetric sm
+        WHERE sm.stand_id = s.id AND sm.datalayer_id = d.datalayer_id
+    );
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            query,
+            [
+                stand_size,
+                geometry.wkt,
+                settings.DEFAULT_CRS,
+                geometry.wkt,
+                settings.DEFAULT_CRS,
+                datalayer_ids,
+            ],
+        )
+        for datalayer_id, stand_id in cursor.fetchall():
+            missing_stand_ids[datalayer_id].add(stand_id)
+    return missing_stand_ids
+
+
 def get_missing_stand_ids_for_datalayer_from_stand_list(
     stand_ids: list[int],
     datalayer: DataLayer,
@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent with `datalayer_ids` after stand metrics are written in bulk. COPY and
+# raw SQL writes skip the model signals, so listeners that depend on
+# StandMetric rows (e.g. caches) should also listen to this one.
+stand_metrics_changed = Signal()
@@ -1,14 +1,26 @@
+import logging
 import sys
+from contextlib import nullcontext
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
 
 from rasterstats.io import parse_feature
 import numpy as np
-from shapely.geometry import shape
+import rasterio
+import shapely
+from rasterio.features import rasterize
+from rasterio.io import DatasetReader
+from rasterio.transform import Affine
+from rasterio.windows import Window
+from shapely.geometry import mapping, shape
+from shapely.geometry.base import BaseGeometry
 from rasterstats.main import Raster
 from rasterstats.utils import (
     key_assoc_val,
     rasterize_geom,
 )
 
+log = logging.getLogger(__name__)
+
 
 def get_zonal_stats(
     stand_geometry,
@@ -86,3 +98,300 @@ def get_zonal_stats(
             "majority": float(key_assoc_val(pixel_count, max)),
             "minority": float(key_assoc_val(pixel_count, min)),
         }
+
+
+ZONAL_STATS_KEYS = (
+    "min",
+    "mean",
+    "median",
+    "max",
+    "sum",
+    "count",
+    "majority",
+    "minority",
+)
+
+# Minimum edge, in pixels, of the tiles used to group stands when the
+# source raster is striped (or has very small internal blocks).
+MIN_TILE_SIZE = 256
+
+
+def zonal_stats_by_label(
+    labels: np.ndarray,
+    values: np.ndarray,
+    size: int,
+) -> Dict[str, np.ndarray]:
+    """Computes zonal statistics for every zone at once.
+
+    `labels` holds the zero-based zone index of each valid pixel and
+    `values` the matching pixel values (both 1D, nodata already removed).
+    Returns one array of length `size` per statistic; zones without pixels
+    get `count` 0 and NaN everywhere else.
+
+    Ties in majority/minority resolve to the smallest value, like
+    `rasterstats`.
+    """
+    labels = np.asarray(labels, dtype=np.int64)
+    values = np.asarray(values)
+    count = np.bincount(labels, minlength=size)
+    total = np.bincount(labels, weights=values.astype(np.float64), minlength=size)
+
+    result = {
+        key: np.full(size, np.nan, dtype=np.float64)
+        for key in ZONAL_STATS_KEYS
+        if key != "count"
+    }
+    result["count"] = count
+
+    if labels.size == 0:
+        return result
+
+    present = count > 0
+    result["sum"][present] = total[present]
+    result["mean"][present] = total[present] / count[present]
+
+    order = np.lexsort((values, labels))
+    sorted_labels = labels[order]
+    sorted_values = values[order].astype(np.float64)
+    n = sorted_labels.size
+
+    # every zone is a contiguous run of the sorted arrays
+    zone_starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+    zone_ends = np.r_[zone_starts[1:], n]
+    zones = sorted_labels[zone_starts]
+    zone_counts = zone_ends - zone_starts
+
+    result["min"][zones] = sorted_values[zone_starts]
+    result["max"][zones] = sorted_values[zone_ends - 1]
+    upper = zone_starts + zone_counts // 2
+    lower = zone_starts + (zone_counts - 1) // 2
+    result["median"][zones] = (sorted_values[lower] + sorted_values[upper]) / 2
+
+    # runs of identical (zone, value) pairs give the value histograms
+    new_zone = np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]
+    new_value = np.r_[True, sorted_values[1:] != sorted_values[:-1]]
+    run_starts = np.flatnonzero(new_zone | new_value)
+    run_counts = np.diff(np.r_[run_starts, n])
+    run_zones = sorted_labels[run_starts]
+    run_values = sorted_values[run_starts]
+    first_run = np.flatnonzero(np.r_[True, run_zones[1:] != run_zones[:-1]])
+    run_group = np.cumsum(np.r_[True, run_zones[1:] != run_zones[:-1]]) - 1
+
+    for key, reducer in (("majority", np.maximum), ("minority", np.minimum)):
+        target = reducer.reduceat(run_counts, first_run)
+        candidates = np.flatnonzero(run_counts == target[run_group])
+        candidate_zones = run_zones[candidates]
+        first = candidates[np.r_[True, candidate_zones[1:] != candidate_zones[:-1]]]
+        result[key][run_zones[first]] = run_values[first]
+
+    return result
+
+
+def label_pixels(
+    geometries: List[BaseGeometry],
+    data: np.ndarray,
+    affine: Affine,
+    nodata: Optional[float] = None,
+    all_touched: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Burns every geometry into a single label array aligned with `data`
+    and returns the zero-based geometry index and the value of every valid
+    (inside a geometry, not nodata, not NaN) pixel.
+
+    Geometries are expected not to overlap; where they do, the last one wins.
+    """
+    labels = rasterize(
+        ((mapping(geometry), index + 1) for index, geometry in enumerate(geometries)),
+        out_shape=data.shape,
+        transform=affine,
+        fill=0,
+        all_touched=all_touched,
+        dtype="int32",
+    )
+    valid = labels > 0
+    if nodata is not None:
+        valid &= data != nodata
+    if np.issubdtype(data.dtype, np.floating):
+        valid &= ~np.isnan(data)
+    return labels[valid] - 1, data[valid]
+
+
+def get_zonal_stats_batch(
+    stand_geometries: List[Any],
+    raster=None,
+    band: int = 1,
+    nodata: Optional[float] = None,
+    affine: Optional[Affine] = None,
+    all_touched: bool = False,
+    boundless: bool = True,
+    data: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Batched version of `get_zonal_stats`.
+
+    Computes the statistics of N stands from a single raster window: either
+    an already read `data` array (positioned by `affine`) or the window of
+    `raster` that covers all the stands. Returns one array of length N per
+    statistic (see `zonal_stats_by_label`).
+    """
+    geometries = [
+        geometry
+        if isinstance(geometry, BaseGeometry)
+        else shape(parse_feature(geometry)["geometry"])
+        for geometry in stand_geometries
+    ]
+    if not geometries:
+        return zonal_stats_by_label(np.array([]), np.array([]), 0)
+
+    if data is None:
+        with Raster(raster, affine, nodata, band) as rast:
+            bounds = shapely.total_bounds(np.array(geometries))
+            fsrc = rast.read(bounds=tuple(bounds), boundless=boundless)
+            data, affine, nodata = fsrc.array, fsrc.affine, fsrc.nodata
+
+    if affine is None:
+        raise ValueError("affine is required when passing a data array.")
+
+    labels, values = label_pixels(
+        geometries,
+        data=data,
+        affine=affine,
+        nodata=nodata,
+        all_touched=all_touched,
+    )
+    return zonal_stats_by_label(labels, values, len(geometries))
+
+
+def _empty_properties(stats: Collection[str]) -> Dict[str, Any]:
+    properties: Dict[str, Any] = {stat: None for stat in stats}
+    if "count" in properties:
+        properties["count"] = 0
+    return properties
+
+
+def _to_properties(
+    columns: Optional[Dict[str, np.ndarray]],
+    index: int,
+    stats: Collection[str],
+) -> Dict[str, Any]:
+    if columns is None or columns["count"][index] == 0:
+        return _empty_properties(stats)
+    return {
+        stat: int(columns[stat][index])
+        if stat == "count"
+        else float(columns[stat][index])
+        for stat in stats
+    }
+
+
+def _pixel_windows(bounds: np.ndarray, affine: Affine) -> np.ndarray:
+    """Vectorized version of `rasterstats.io.bounds_window`.
+
+    Returns an (N, 4) array of row_start, row_stop, col_start, col_stop.
+    """
+    west, south, east, north = bounds.T
+    row_start = np.floor((north - affine.f) / affine.e)
+    col_start = np.floor((west - affine.c) / affine.a)
+    row_stop = np.ceil((south - affine.f) / affine.e)
+    col_stop = np.ceil((east - affine.c) / affine.a)
+    return np.stack([row_start, row_stop, col_start, col_stop], axis=1).astype(np.int64)
+
+
+def _group_by_tile(
+    windows: np.ndarray,
+    tile_shape: Tuple[int, int],
+) -> Dict[Tuple[int, int], np.ndarray]:
+    tile_height, tile_width = tile_shape
+    center_rows = (windows[:, 0] + windows[:, 1]) // 2
+    center_cols = (windows[:, 2] + windows[:, 3]) // 2
+    tile_keys = np.stack(
+        [center_rows // tile_height, center_cols // tile_width], axis=1
+    )
+    unique_keys, inverse = np.unique(tile_keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    splits = np.flatnonzero(np.diff(inverse[order])) + 1
+    return {
+        (int(key[0]), int(key[1])): members
+        for key, members in zip(unique_keys, np.split(order, splits))
+    }
+
+
+def windowed_zonal_stats(
+    vectors: List[Dict[str, Any]],
+    raster: Union[str, DatasetReader],
+    stats: Collection[str] = ZONAL_STATS_KEYS,
+    nodata: Optional[float] = None,
+    band: int = 1,
+    all_touched: bool = False,
+) -> List[Dict[str, Any]]:
+    """Drop-in replacement for `rasterstats.zonal_stats(..., geojson_out=True)`
+    for large collections of non-overlapping features (e.g. stands).
+
+    Instead of one window read per feature, features are grouped by the
+    internal tile of the raster their window is centered on. Each tile group
+    is read once, all of its features are burned into a single label array
+    and the statistics are computed with `zonal_stats_by_label`.
+
+    `raster` can be a path/url or an already open dataset, which is left
+    open so callers can reuse it across calls.
+
+    Returns the features with the statistics added to their properties, in
+    the same order as `vectors`.
+    """
+    stats = list(stats)
+    if not vectors:
+        return []
+
+    geometries = [shape(feature["geometry"]) for feature in vectors]
+    results: List[Optional[Dict[str, Any]]] = [None] * len(vectors)
+
+    if isinstance(raster, DatasetReader):
+        opened = nullcontext(raster)
+    else:
+        opened = rasterio.open(raster)
+
+    with opened as src:
+        affine = src.transform
+        nodata = src.nodata if nodata is None else nodata
+        block_height, block_width = src.block_shapes[band - 1]
+        tile_shape = (
+            max(block_height, MIN_TILE_SIZE),
+            max(block_width, MIN_TILE_SIZE),
+        )
+        windows = _pixel_windows(shapely.bounds(np.array(geometries)), affine)
+        groups = _group_by_tile(windows, tile_shape)
+        log.info(
+            f"Reading {len(groups)} tiles for {len(vectors)} features from {src.name}"
+        )
+
+        for members in groups.values():
+            group_windows = windows[members]
+            row_start = max(int(group_windows[:, 0].min()), 0)
+            row_stop = min(int(group_windows[:, 1].max()), src.height)
+            col_start = max(int(group_windows[:, 2].min()), 0)
+            col_stop = min(int(group_windows[:, 3].max()), src.width)
+            columns = None
+            if row_stop > row_start and col_stop > col_start:
+                window = Window.from_slices(
+                    (row_start, row_stop), (col_start, col_stop)
+                )
+                columns = get_zonal_stats_batch(
+                    [geometries[member] for member in members],
+                    data=src.read(band, window=window),
+                    affine=src.window_transform(window),
+                    nodata=nodata,
+                    all_touched=all_touched,
+                )
+
+            for position, member in enumerate(members):
+                properties = _to_properties(columns, position, stats)
+                feature = vectors[member]
+                results[member] = {
+                    **feature,
+                    "properties": {
+                        **(feature.get("properties", {}) or {}),
+                        **properties,
+                    },
+                }
+
+    return results  # type: ignore
@@ -4,15 +4,18 @@ from unittest import mock
 from datasets.models import DataLayerType
 from datasets.tests.factories import DataLayerFactory
 from django.contrib.gis.geos import GEOSGeometry
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
 from stands.models import Stand, StandMetric, StandSizeChoices
 from stands.services import (
+    backfill_stand_zonal_stats,
     calculate_stand_zonal_stats,
+    copy_upsert_stand_metrics,
     get_missing_stand_ids_for_datalayer_within_geometry,
+    get_missing_stand_ids_for_datalayers_within_geometry,
     get_missing_stand_ids_for_datalayer_from_stand_list,
 )
-from stands.tests.factories import StandMetricFactory
+from stands.tests.factories import StandFactory, StandMetricFactory
 
 from planning.tests.factories import PlanningAreaFactory
 
@@ -58,6 +61,22 @@ class CalculateStandZonalStatsTestCase(TestCase):
             self.assertIsNotNone(m.majority)
             self.assertIsNotNone(m.minority)
 
+    @override_settings(FEATURE_FLAGS="WINDOWED_ZONAL_STATS")
+    @mock.patch("stands.services.zonal_stats")
+    def test_calculate_stand_zonal_stats_windowed_returns_stand_metrics(
+        self, zonal_stats
+    ):
+        stands = Stand.objects.filter(id__in=self.stand_ids)
+        calculate_stand_zonal_stats(stands, datalayer=self.datalayer)
+        zonal_stats.assert_not_called()
+        metrics = StandMetric.objects.filter(stand__in=stands, datalayer=self.datalayer)
+        self.assertEqual(metrics.count(), len(self.stand_ids))
+        for m in metrics:
+            self.assertIsNotNone(m.avg)
+            self.assertIsNotNone(m.median)
+            self.assertIsNotNone(m.majority)
+            self.assertGreater(m.count, 0)
+
     @mock.patch("stands.services.zonal_stats", return_value=[])
     def test_calculate_stand_zonal_stats_all_cached_does_not_call_get_zonal_stats(
         self, zonal_stats
@@ -130,6 +149,34 @@ class GetStandsWithoutMetricTestCase(TestCase):
 
         self.assertEqual(set(), missing_ids)
 
+    def test_get_missing_stand_ids_for_many_datalayers(self):
+        other_datalayer = DataLayerFactory.create(
+            url="impacts/tests/test_data/test_raster.tif",
+            type=DataLayerType.RASTER,
+        )
+        stands = list(self.planning_area.get_stands(stand_size=StandSizeChoices.LARGE))
+        StandMetricFactory.create(datalayer=other_datalayer, stand=stands[0])
+
+        missing_ids = get_missing_stand_ids_for_datalayers_within_geometry(
+            geometry=self.planning_area.geometry,
+            stand_size=StandSizeChoices.LARGE,
+            datalayers=[self.datalayer, other_datalayer],
+        )
+
+        self.assertEqual(set(self.stand_ids), missing_ids[self.datalayer.pk])
+        self.assertEqual(
+            set(self.stand_ids) - {stands[0].pk}, missing_ids[other_datalayer.pk]
+        )
+
+    def test_get_missing_stand_ids_for_many_datalayers__no_datalayers(self):
+        missing_ids = get_missing_stand_ids_for_datalayers_within_geometry(
+            geometry=self.planning_area.geometry,
+            stand_size=StandSizeChoices.LARGE,
+            datalayers=[],
+        )
+
+        self.assertEqual({}, missing_ids)
+
     def test_get_missing_stand_ids_with_id_list(self):
         missing_ids = get_missing_stand_ids_for_datalayer_from_stand_list(
             stand_ids=self.stand_ids,
@@ -165,3 +212,116 @@ class GetStandsWithoutMetricTestCase(TestCase):
         )
 
         self.assertEqual(set(), missing_ids)
+
+
+class CopyUpsertStandMetricsTestCase(TestCase):
+    def setUp(self):
+        self.metric = StandMetricFactory.create(avg=1, count=1, median=None)
+        self.datalayer = self.metric.datalayer
+
+    def test_inserts_and_updates_metrics(self):
+        new_stand = StandFactory.create()
+        written = copy_upsert_stand_metrics(
+            [
+                StandMetric(
+                    stand_id=self.metric.stand_id,
+                    datalayer_id=self.datalayer.pk,
+                    avg=2.5,
+                    count=4,
+                ),
+                StandMetric(
+                    stand_id=new_stand.pk,
+                    datalayer_id=self.datalayer.pk,
+                    avg=3,
+                    count=5,
+                ),
+            ]
+        )
+
+        self.assertEqual(written, 2)
+        self.assertEqual(StandMetric.objects.count(), 2)
+        self.metric.refresh_from_db()
+        self.assertEqual(self.metric.avg, 2.5)
+        self.assertEqual(self.metric.count, 4)
+        self.assertIsNone(self.metric.median)
+        created = StandMetric.objects.get(stand=new_stand)
+        self.assertEqual(created.avg, 3)
+        self.assertIsNotNone(created.created_at)
+
+    def test_empty_metrics(self):
+        self.assertEqual(copy_upsert_stand_metrics([]), 0)
+
+    def test_streams_generators_in_chunks(self):
+        stands = StandFactory.create_batch(5)
+        metrics = (
+            StandMetric(stand_id=stand.pk, datalayer_id=self.datalayer.pk, avg=i)
+            for i, stand in enumerate(stands)
+        )
+
+        written = copy_upsert_stand_metrics(metrics, chunk_size=2)
+
+        self.assertEqual(written, 5)
+        self.assertEqual(
+            StandMetric.objects.filter(stand__in=stands).count(),
+            5,
+        )
+
+    def test_can_be_called_twice_in_the_same_transaction(self):
+        metric = StandMetric(
+            stand_id=self.metric.stand_id,
+            datalayer_id=self.datalayer.pk,
+            avg=7,
+        )
+        copy_upsert_stand_metrics([metric])
+        copy_upsert_stand_metrics([metric])
+
+        self.metric.refresh_from_db()
+        self.assertEqual(self.metric.avg, 7)
+
+    def test_duplicated_rows_are_written_once(self):
+        metric = StandMetric(
+            stand_id=self.metric.stand_id,
+            datalayer_id=self.datalayer.pk,
+            avg=7,
+        )
+        written = copy_upsert_stand_metrics([metric, metric])
+
+        self.assertEqual(written, 1)
+        self.assertEqual(StandMetric.objects.count(), 1)
+
+
+class BackfillStandZonalStatsTestCase(TestCase):
+    def setUp(self):
+        with open("impacts/tests/test_data/stands.geojson") as fp:
+            features = json.loads(fp.read()).get("features")
+        self.stand_ids = [
+            Stand.objects.create(
+                geometry=GEOSGeometry(json.dumps(f.get("geometry")), srid=4326),
+                size="LARGE",
+                area_m2=1,
+            ).pk
+            for f in features
+        ]
+        self.datalayer = DataLayerFactory.create(
+            url="impacts/tests/test_data/test_raster.tif",
+            type=DataLayerType.RASTER,
+            info={"nodata": -999},
+        )
+
+    def test_backfill_creates_stand_metrics(self):
+        throughput = backfill_stand_zonal_stats(
+            self.stand_ids, self.datalayer, batch_size=5, max_workers=2
+        )
+
+        self.assertEqual(throughput["stands"], len(self.stand_ids))
+        self.assertGreater(throughput["pixels_per_second"], 0)
+        metrics = StandMetric.objects.filter(datalayer=self.datalayer)
+        self.assertEqual(metrics.count(), len(self.stand_ids))
+        for m in metrics:
+            self.assertIsNotNone(m.avg)
+            self.assertIsNotNone(m.majority)
+
+    def test_backfill_with_vector_fails(self):
+        datalayer = DataLayerFactory.create(type=DataLayerType.VECTOR)
+        with self.assertRaises(ValueError):
+            backfill_stand_zonal_stats(self.stand_ids, datalayer)
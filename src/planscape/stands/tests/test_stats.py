@@ -0,0 +1,140 @@
+import json
+import math
+
+import numpy as np
+from django.test import SimpleTestCase
+from rasterio.transform import Affine
+from rasterstats import zonal_stats
+
+from stands.services import DEFAULT_AGGREGATIONS
+from stands.stats import (
+    get_zonal_stats,
+    get_zonal_stats_batch,
+    windowed_zonal_stats,
+    zonal_stats_by_label,
+)
+
+
+class ZonalStatsByLabelTest(SimpleTestCase):
+    def test_computes_all_statistics_per_label(self):
+        labels = np.array([0, 0, 0, 0, 2, 2, 2])
+        values = np.array([4, 1, 1, 3, 5, 7, 7], dtype="float32")
+
+        result = zonal_stats_by_label(labels, values, 3)
+
+        self.assertEqual(result["count"].tolist(), [4, 0, 3])
+        self.assertEqual(result["min"][0], 1)
+        self.assertEqual(result["max"][0], 4)
+        self.assertEqual(result["sum"][0], 9)
+        self.assertEqual(result["mean"][0], 2.25)
+        self.assertEqual(result["median"][0], 2)
+        self.assertEqual(result["majority"][0], 1)
+        self.assertEqual(result["minority"][0], 3)
+        self.assertEqual(result["median"][2], 7)
+        self.assertEqual(result["majority"][2], 7)
+        self.assertEqual(result["minority"][2], 5)
+        self.assertTrue(np.isnan(result["mean"][1]))
+
+    def test_ties_resolve_to_smallest_value(self):
+        labels = np.array([0, 0, 0, 0])
+        values = np.array([9, 2, 9, 2])
+
+        result = zonal_stats_by_label(labels, values, 1)
+
+        self.assertEqual(result["majority"][0], 2)
+        self.assertEqual(result["minority"][0], 2)
+
+    def test_empty_input(self):
+        result = zonal_stats_by_label(np.array([]), np.array([]), 2)
+
+        self.assertEqual(result["count"].tolist(), [0, 0])
+        self.assertTrue(np.isnan(result["min"]).all())
+
+
+class GetZonalStatsBatchTest(SimpleTestCase):
+    def setUp(self):
+        with open("impacts/tests/test_data/stands_3857.geojson") as fp:
+            self.features = json.loads(fp.read())["features"]
+        self.raster = "impacts/tests/test_data/test_raster.tif"
+
+    def test_matches_get_zonal_stats(self):
+        result = get_zonal_stats_batch(self.features, self.raster, nodata=-999)
+
+        self.assertEqual(len(result["count"]), len(self.features))
+        for index, feature in enumerate(self.features):
+            expected = get_zonal_stats(feature, self.raster, nodata=-999)
+            for stat, value in expected.items():
+                if value is None:
+                    self.assertTrue(np.isnan(result[stat][index]))
+                else:
+                    self.assertTrue(
+                        math.isclose(value, result[stat][index], rel_tol=1e-6)
+                    )
+
+    def test_accepts_data_array(self):
+        geometry = {
+            "type": "Polygon",
+            "coordinates": [[(0, 0), (2, 0), (2, -2), (0, -2), (0, 0)]],
+        }
+        data = np.array([[1, 2, 9], [2, -1, 9], [9, 9, 9]], dtype="int16")
+
+        result = get_zonal_stats_batch(
+            [{"type": "Feature", "geometry": geometry, "properties": {}}],
+            data=data,
+            affine=Affine(1, 0, 0, 0, -1, 0),
+            nodata=-1,
+        )
+
+        self.assertEqual(result["count"].tolist(), [3])
+        self.assertEqual(result["sum"].tolist(), [5])
+        self.assertEqual(result["majority"].tolist(), [2])
+
+    def test_requires_affine_with_data_array(self):
+        with self.assertRaises(ValueError):
+            get_zonal_stats_batch(
+                [
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "Point", "coordinates": [0, 0]},
+                    }
+                ],
+                data=np.zeros((2, 2)),
+            )
+
+
+class WindowedZonalStatsTest(SimpleTestCase):
+    def setUp(self):
+        with open("impacts/tests/test_data/stands_3857.geojson") as fp:
+            self.features = json.loads(fp.read())["features"]
+        self.raster = "impacts/tests/test_data/test_raster.tif"
+
+    def test_matches_rasterstats(self):
+        expected = zonal_stats(
+            raster=self.raster,
+            vectors=self.features,
+            stats=DEFAULT_AGGREGATIONS,
+            nodata=-999,
+            geojson_out=True,
+            band=1,
+        )
+
+        actual = windowed_zonal_stats(
+            raster=self.raster,
+            vectors=self.features,
+            stats=DEFAULT_AGGREGATIONS,
+            nodata=-999,
+        )
+
+        self.assertEqual(len(expected), len(actual))
+        for old, new in zip(expected, actual):
+            self.assertEqual(old["properties"]["id"], new["properties"]["id"])
+            for stat in DEFAULT_AGGREGATIONS:
+                old_value = old["properties"][stat]
+                new_value = new["properties"][stat]
+                if old_value is None:
+                    self.assertIsNone(new_value)
+                else:
+                    self.assertTrue(math.isclose(old_value, new_value, rel_tol=1e-6))
+
+    def test_empty_vectors(self):
+        self.assertEqual(windowed_zonal_stats([], self.raster), [])